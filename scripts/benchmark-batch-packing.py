@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark token-aware batch packing against count-based chunking.
+
+Generates task sets with a skewed mix of tiers and prompt sizes (a few
+large opus prompts among many small haiku/sonnet ones), aggregates them
+with BatchAggregator in "count" and "tokens" packing modes and reports,
+per mode: batches, batches whose estimated tokens exceed the per-batch
+TPM capacity (each one would hit the rate limit mid-burst; in "tokens"
+mode only single tasks larger than the capacity), packing efficiency
+against that capacity (overflow not counted), the lower bound on
+batches and the time to pack.
+
+Usage:
+    python scripts/benchmark-batch-packing.py
+    python scripts/benchmark-batch-packing.py --sizes 100 1000 10000 --tpm 400000
+    python scripts/benchmark-batch-packing.py --opus-tpm 80000 --levels 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from specify_cli.agent_pool import AgentTask, ModelTier  # noqa: E402
+from specify_cli.batch_aggregator import BatchAggregator, BatchConfig  # noqa: E402
+from specify_cli.wave_scheduler import Wave  # noqa: E402
+
+# (tier, share of tasks, median prompt tokens, max_tokens)
+MIX = [
+    (ModelTier.OPUS.value, 0.05, 40_000, 16_000),
+    (ModelTier.SONNET.value, 0.35, 6_000, 8_192),
+    (ModelTier.HAIKU.value, 0.60, 1_500, 2_048),
+]
+
+
+def generate_tasks(size: int, levels: int, seed: int) -> List[AgentTask]:
+    """Tasks spread over ``levels`` dependency levels with lognormal prompt sizes."""
+    rng = random.Random(seed)
+    tiers = [m for m, *_ in MIX]
+    weights = [share for _, share, *_ in MIX]
+    params = {model: (median, max_tokens) for model, _, median, max_tokens in MIX}
+    tasks: List[AgentTask] = []
+    per_level = max(1, size // levels)
+    for i in range(size):
+        model = rng.choices(tiers, weights)[0]
+        median, max_tokens = params[model]
+        prompt_tokens = int(rng.lognormvariate(0, 0.8) * median)
+        level = min(i // per_level, levels - 1)
+        depends_on = [f"t{rng.randrange(0, level * per_level)}"] if level else []
+        tasks.append(AgentTask(
+            name=f"t{i}", prompt="x" * (prompt_tokens * 4), model=model,
+            max_tokens=max_tokens, depends_on=depends_on, priority=rng.randint(1, 9),
+        ))
+    return tasks
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="Task counts")
+    parser.add_argument("--levels", type=int, default=3, help="Dependency levels")
+    parser.add_argument("--max-batch-size", type=int, default=10)
+    parser.add_argument("--tpm", type=int, default=150_000, help="Pool tokens-per-minute limit")
+    parser.add_argument("--opus-tpm", type=int, default=0, help="Opus lane TPM limit (0: none)")
+    parser.add_argument("--headroom", type=float, default=0.9, help="Fraction of a TPM limit per batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tier_tpm = {"opus": args.opus_tpm} if args.opus_tpm else {}
+    print(f"{'Tasks':>6} {'Mode':>7} {'Batches':>8} {'Bound':>6} {'Over TPM':>9} "
+          f"{'Efficiency':>11} {'Peak tokens':>12} {'Pack':>9}")
+    print("-" * 76)
+    for size in args.sizes:
+        tasks = generate_tasks(size, args.levels, args.seed)
+        waves = [Wave(index=0, tasks=tasks)]
+        for packing in ("count", "tokens"):
+            aggregator = BatchAggregator(BatchConfig(
+                enabled=True, max_batch_size=args.max_batch_size, packing=packing,
+                tokens_per_minute=args.tpm, tier_tokens_per_minute=tier_tpm,
+                tpm_headroom=args.headroom,
+            ))
+            batches = aggregator.aggregate(waves)
+            pack_ms = timed(lambda: aggregator.aggregate(waves), args.repeat)
+
+            # Judge both modes against the same token capacity
+            capacity = int(args.tpm * args.headroom)
+            over = sum(1 for b in batches if b.estimated_tokens > capacity)
+            used = sum(min(b.estimated_tokens, capacity) for b in batches)
+            efficiency = used / (capacity * len(batches))
+            bound = BatchAggregator(BatchConfig(
+                enabled=True, max_batch_size=args.max_batch_size, packing="tokens",
+                tokens_per_minute=args.tpm, tpm_headroom=args.headroom,
+            )).get_aggregation_stats(waves, batches)["batch_lower_bound"]
+
+            print(f"{size:>6} {packing:>7} {len(batches):>8} {bound:>6} {over:>9} "
+                  f"{efficiency:>10.1%} {max(b.estimated_tokens for b in batches):>12,} "
+                  f"{pack_ms:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
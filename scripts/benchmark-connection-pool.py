@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Benchmark shared vs per-client HTTP connection pooling in DistributedAgentPool.
+
+Runs the agent pool against a local fake Messages API server and reports,
+for each connection mode, how many connections were opened (each one pays
+a simulated TLS handshake) and the p50/p99 request latency. The local
+server speaks HTTP/1.1 only, so HTTP/2 multiplexing (one connection for
+all slots) is not exercised here.
+
+Usage:
+    python scripts/benchmark-connection-pool.py
+    python scripts/benchmark-connection-pool.py --requests 400 --pool-size 16 --handshake-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from specify_cli.agent_pool import AgentTask, DistributedAgentPool, PoolConfig  # noqa: E402
+
+RESPONSE_BODY = json.dumps({
+    "id": "msg_bench",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-5-20250929",
+    "content": [{"type": "text", "text": "ok"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 10, "output_tokens": 5},
+}).encode("utf-8")
+
+
+class FakeMessagesServer:
+    """Minimal HTTP/1.1 keep-alive server answering every request with a Message."""
+
+    def __init__(self, handshake_ms: float, latency_ms: float):
+        self.handshake_s = handshake_ms / 1000
+        self.latency_s = latency_ms / 1000
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        # Stand-in for the TCP + TLS handshake a real connection pays once
+        await asyncio.sleep(self.handshake_s)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(self.latency_s)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Connection: keep-alive\r\n"
+                    + f"Content-Length: {len(RESPONSE_BODY)}\r\n\r\n".encode()
+                    + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_mode(shared: bool, args: argparse.Namespace) -> Dict[str, float]:
+    server = FakeMessagesServer(args.handshake_ms, args.latency_ms)
+    port = await server.start()
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+
+    pool = DistributedAgentPool(config=PoolConfig(
+        pool_size=args.pool_size,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        shared_connections=shared,
+        http2=False,  # The fake server speaks HTTP/1.1 only
+    ))
+    tasks = [
+        AgentTask(name=f"task-{i}", prompt="ping", max_tokens=16, temperature=None)
+        for i in range(args.requests)
+    ]
+
+    start = time.perf_counter()
+    latencies: List[float] = []
+    for offset in range(0, len(tasks), args.wave_size):
+        results = await pool.execute_wave(tasks[offset:offset + args.wave_size])
+        failed = [r.error for r in results.values() if not r.success]
+        if failed:
+            raise RuntimeError(f"Benchmark request failed: {failed[0]}")
+        latencies.extend(r.duration_ms for r in results.values())
+    wall_s = time.perf_counter() - start
+
+    await pool.close()
+    await server.stop()
+    return {
+        "clients": args.pool_size if not shared else 1,
+        "connections": server.connections,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.mean(latencies),
+        "throughput_rps": len(latencies) / wall_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Total requests per mode")
+    parser.add_argument("--pool-size", type=int, default=8, help="Concurrent slots")
+    parser.add_argument("--wave-size", type=int, default=20, help="Tasks per execute_wave call")
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Simulated connection setup cost")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated server latency")
+    args = parser.parse_args()
+
+    print(f"Requests: {args.requests} | Pool size: {args.pool_size} | "
+          f"Handshake: {args.handshake_ms}ms | Server latency: {args.latency_ms}ms")
+    print()
+    print(f"{'Mode':<12} {'Clients':>8} {'Conns':>6} {'p50 ms':>8} {'p99 ms':>8} {'Mean ms':>8} {'Req/s':>8}")
+    print("-" * 64)
+    for label, shared in (("per-client", False), ("shared", True)):
+        row = asyncio.run(run_mode(shared, args))
+        print(f"{label:<12} {row['clients']:>8} {row['connections']:>6} "
+              f"{row['p50_ms']:>8.0f} {row['p99_ms']:>8.0f} {row['mean_ms']:>8.1f} "
+              f"{row['throughput_rps']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark dependency-graph construction on large synthetic task graphs.
+
+Generates a tasks.md with N tasks in the template format
+(``- [ ] T0042 [P] [US3] [DEP:T0017,T0031] Description``), parses it into
+AgentTasks and times the three consumers of the shared DependencyGraph:
+WaveScheduler.build_waves, BatchAggregator levels and TemplateCompiler
+wave assignments. The previous rescan-every-iteration algorithm is timed
+alongside for reference (skipped above --legacy-limit tasks).
+
+Usage:
+    python scripts/benchmark-dag.py
+    python scripts/benchmark-dag.py --sizes 1000 10000 50000 --legacy-limit 10000
+    python scripts/benchmark-dag.py --write-tasks-md /tmp/tasks.md --sizes 10000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from specify_cli.agent_pool import AgentTask  # noqa: E402
+from specify_cli.batch_aggregator import BatchAggregator, BatchConfig  # noqa: E402
+from specify_cli.template_compiler import TemplateCompiler  # noqa: E402
+from specify_cli.wave_scheduler import Wave, WaveConfig, WaveScheduler  # noqa: E402
+
+TASK_LINE = re.compile(r"^- \[[ xX!]\] (T\d+)(.*)$")
+DEP_MARKER = re.compile(r"\[DEP:([^\]]+)\]")
+
+
+def generate_tasks_md(size: int, seed: int, window: int, max_deps: int) -> str:
+    """Phased tasks.md where each task depends on up to max_deps recent tasks."""
+    rng = random.Random(seed)
+    width = len(str(size))
+    lines = ["# Tasks", ""]
+    for i in range(size):
+        if i % 50 == 0:
+            lines += ["", f"## Phase {i // 50 + 1}", ""]
+        task_id = f"T{i:0{width}d}"
+        markers = [f"[US{rng.randint(1, 9)}]"]
+        if i and rng.random() < 0.8:
+            earlier = rng.sample(range(max(0, i - window), i), min(i, rng.randint(1, max_deps)))
+            markers.append("[DEP:" + ",".join(f"T{d:0{width}d}" for d in sorted(earlier)) + "]")
+        else:
+            markers.insert(0, "[P]")
+        lines.append(f"- [ ] {task_id} {' '.join(markers)} Implement component {i} in src/module_{i % 97}.py")
+    return "\n".join(lines) + "\n"
+
+
+def parse_tasks_md(content: str) -> List[AgentTask]:
+    tasks = []
+    for line in content.splitlines():
+        match = TASK_LINE.match(line)
+        if not match:
+            continue
+        deps = DEP_MARKER.search(match.group(2))
+        tasks.append(AgentTask(
+            name=match.group(1),
+            prompt=match.group(2).strip(),
+            depends_on=deps.group(1).split(",") if deps else [],
+        ))
+    return tasks
+
+
+def legacy_levels(deps_graph: Dict[str, Set[str]]) -> Dict[str, int]:
+    """The pre-DependencyGraph algorithm: rescan all remaining tasks per level."""
+    levels: Dict[str, int] = {}
+    remaining = set(deps_graph)
+    while remaining:
+        ready = [name for name in remaining if all(dep in levels for dep in deps_graph[name])]
+        if not ready:
+            break
+        for name in ready:
+            levels[name] = max((levels[d] for d in deps_graph[name]), default=-1) + 1
+            remaining.remove(name)
+    return levels
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Task counts")
+    parser.add_argument("--window", type=int, default=200, help="Dependencies point at most this far back")
+    parser.add_argument("--max-deps", type=int, default=3, help="Maximum dependencies per task")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--legacy-limit", type=int, default=10000, help="Largest size to time the legacy algorithm on")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--write-tasks-md", type=Path, help="Also write the generated tasks.md of the last size here")
+    args = parser.parse_args()
+
+    print(f"{'Tasks':>7} {'Edges':>7} {'Levels':>7} {'Waves':>7} "
+          f"{'build_waves':>12} {'aggregator':>11} {'compiler':>9} {'legacy':>9}")
+    print("-" * 78)
+    for size in args.sizes:
+        content = generate_tasks_md(size, args.seed, args.window, args.max_deps)
+        if args.write_tasks_md:
+            args.write_tasks_md.write_text(content, encoding="utf-8")
+        tasks = parse_tasks_md(content)
+        edges = sum(len(t.depends_on) for t in tasks)
+
+        scheduler = WaveScheduler(None, WaveConfig(max_parallel=8))
+        waves = scheduler.build_waves(tasks)
+        build_ms = timed(lambda: scheduler.build_waves(tasks), args.repeat)
+
+        aggregator = BatchAggregator(BatchConfig(enabled=True, max_batch_size=8))
+        all_tasks = [(t, 0) for t in tasks]
+        task_map = {t.name: (t, 0) for t in tasks}
+        deps_graph = aggregator._build_dependency_graph(all_tasks)
+        levels = aggregator._compute_topological_levels(task_map, deps_graph)
+        aggregate_ms = timed(lambda: aggregator.aggregate([Wave(index=0, tasks=tasks)]), args.repeat)
+
+        compiler = TemplateCompiler(Path("."), Path("."), Path("."))
+        subagents = [{"role": t.name, "depends_on": t.depends_on} for t in tasks]
+        compile_ms = timed(lambda: compiler._compute_wave_assignments(subagents), args.repeat)
+
+        if size <= args.legacy_limit:
+            assert legacy_levels(deps_graph) == levels
+            legacy = f"{timed(lambda: legacy_levels(deps_graph), 1):>7.0f}ms"
+        else:
+            legacy = f"{'skipped':>9}"
+
+        print(f"{size:>7} {edges:>7} {max(levels.values()) + 1:>7} {len(waves):>7} "
+              f"{build_ms:>10.1f}ms {aggregate_ms:>9.1f}ms {compile_ms:>7.1f}ms {legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark parallel template compilation against the serial path.
+
+Compiles every command template with ``compile_all(force=True)`` for each
+job count into its own temporary output directory and reports the best
+wall time and the speedup over ``--jobs 1``. Outputs (ignoring
+``compiled_at``) and results must be identical for every job count. The
+template set can be enlarged with ``--copies`` so per-template work
+outweighs the process pool's start-up cost; the time of an incremental
+no-op run is reported for comparison.
+
+Usage:
+    python scripts/benchmark-template-compile.py
+    python scripts/benchmark-template-compile.py --jobs 1 2 4 8 --copies 10
+    python scripts/benchmark-template-compile.py --templates-dir templates/commands --repeat 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from specify_cli.template_compiler import MANIFEST_FILE, TemplateCompiler  # noqa: E402
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def copy_templates(source: Path, target: Path, copies: int) -> None:
+    """``copies`` renamed copies of every template (and its COMPRESSED variant)."""
+    target.mkdir(parents=True)
+    for path in sorted(source.glob("*.md")):
+        command, rest = path.name.split(".", 1)
+        for i in range(copies):
+            shutil.copy2(path, target / (f"{command}-{i}.{rest}" if i else path.name))
+
+
+def outputs(output_dir: Path) -> Dict[str, dict]:
+    result = {}
+    for path in sorted(output_dir.glob("*.json")):
+        if path.name != MANIFEST_FILE:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            data["meta"].pop("compiled_at", None)
+            result[path.name] = data
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates-dir", type=Path, default=ROOT / "templates" / "commands")
+    parser.add_argument("--shared-dir", type=Path, default=ROOT / "templates" / "shared")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4], help="Job counts (0 = CPU count)")
+    parser.add_argument("--copies", type=int, default=1, help="Copies of each template to compile")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    jobs_list = sorted({j or os.cpu_count() or 1 for j in [1, *args.jobs]})
+    with tempfile.TemporaryDirectory() as tmp:
+        templates_dir = args.templates_dir
+        if args.copies > 1:
+            templates_dir = Path(tmp) / "commands"
+            copy_templates(args.templates_dir, templates_dir, args.copies)
+        count = len(list(templates_dir.glob("*.md")))
+        print(f"{count} template files, {os.cpu_count()} CPUs")
+
+        print(f"{'Jobs':>5} {'Wall':>10} {'Speedup':>8} {'Identical':>10}")
+        print("-" * 36)
+        serial_ms = None
+        expected: Dict[str, dict] = {}
+        expected_results: List[tuple] = []
+        for jobs in jobs_list:
+            compiler = TemplateCompiler(templates_dir, args.shared_dir, Path(tmp) / f"out-{jobs}")
+            results = compiler.compile_all(force=True, jobs=jobs)
+            wall_ms = timed(lambda: compiler.compile_all(force=True, jobs=jobs), args.repeat)
+
+            summary = [(r.command, r.success, r.source_hash, tuple(r.includes_resolved)) for r in results]
+            compiled = outputs(compiler.output_dir)
+            if serial_ms is None:
+                serial_ms, expected, expected_results = wall_ms, compiled, summary
+            identical = compiled == expected and summary == expected_results
+            print(f"{jobs:>5} {wall_ms:>8.1f}ms {serial_ms / wall_ms:>7.2f}x {'yes' if identical else 'NO':>10}")
+            if not identical:
+                sys.exit(f"Outputs with --jobs {jobs} differ from the serial build")
+
+        compiler = TemplateCompiler(templates_dir, args.shared_dir, Path(tmp) / "out-1")
+        noop_ms = timed(lambda: compiler.compile_all(jobs=max(jobs_list)), args.repeat)
+        print(f"\nIncremental no-op: {noop_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
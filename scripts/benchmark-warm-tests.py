@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark warm pytest workers against a new pytest process per test file.
+
+Builds a throwaway project with N red test files (each importing a small
+module from the project) and verifies all of them through
+VerificationExecutor twice: once with the cold command and once with warm
+workers. Memoisation is off so every verification really runs the tests.
+Both paths must agree on every red/green outcome.
+
+Usage:
+    python scripts/benchmark-warm-tests.py
+    python scripts/benchmark-warm-tests.py --tests 50 --workers 1 4
+    python scripts/benchmark-warm-tests.py --python .venv/bin/python
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from specify_cli.verification import TestFrameworkDetector, VerificationExecutor  # noqa: E402
+
+TEST_FILE = """from service import add
+
+
+def test_add_{i}():
+    assert add({i}, 1) == {i} + 2
+"""
+
+
+class PythonModuleDetector(TestFrameworkDetector):
+    """Cold path through ``python -m pytest`` so both paths use one interpreter."""
+
+    python = sys.executable
+
+    @classmethod
+    def get_test_command(cls, lang: str, test_file: str) -> List[str]:
+        command = super().get_test_command(lang, test_file)
+        if lang == "python":
+            return [cls.python, "-m", *command]
+        return command
+
+
+def make_project(root: Path, tests: int) -> List[str]:
+    (root / "pyproject.toml").write_text("[project]\nname = 'bench'\n")
+    (root / "service.py").write_text("def add(a, b):\n    return a + b\n")
+    names = []
+    for i in range(tests):
+        name = f"test_add_{i}.py"
+        (root / name).write_text(TEST_FILE.format(i=i))
+        names.append(name)
+    return names
+
+
+async def verify_all(
+    project: Path,
+    test_files: List[str],
+    workers: int,
+    warm: bool,
+    python: Optional[str],
+) -> Tuple[float, List[int], List[bool], dict]:
+    verifier = VerificationExecutor(
+        max_workers=workers, memoize=False, warm=warm, warm_python=python,
+        detector=PythonModuleDetector,
+    )
+    # Warm workers: start one per slot before timing, as a long run would have
+    if warm:
+        await asyncio.gather(*(verifier.verify(f, project) for f in test_files[:workers]))
+
+    latencies: List[int] = []
+
+    async def one(test_file: str) -> bool:
+        start = time.perf_counter()
+        result = await verifier.verify(test_file, project)
+        latencies.append(int((time.perf_counter() - start) * 1000))
+        return result.test_failed
+
+    try:
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(one(f) for f in test_files))
+        wall = time.perf_counter() - start
+    finally:
+        await verifier.close()
+    return wall, latencies, list(outcomes), verifier.get_statistics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=20, help="Test files to verify")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Concurrent verifications")
+    parser.add_argument("--python", help="Interpreter with pytest installed (default: this one)")
+    args = parser.parse_args()
+    PythonModuleDetector.python = args.python or sys.executable
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = Path(tmp)
+        test_files = make_project(project, args.tests)
+
+        print(f"{'Workers':>7} {'Mode':>5} {'Wall':>9} {'p50 lat':>9} {'p95 lat':>9} {'Speedup':>8}")
+        print("-" * 54)
+        for workers in args.workers:
+            cold_wall, cold_lat, cold_out, _ = asyncio.run(
+                verify_all(project, test_files, workers, False, args.python))
+            warm_wall, warm_lat, warm_out, stats = asyncio.run(
+                verify_all(project, test_files, workers, True, PythonModuleDetector.python))
+            assert cold_out == warm_out, "warm and cold outcomes differ"
+            if stats["warm_runs"] == 0:
+                sys.exit(f"Warm workers unavailable: {stats['warm_workers']['unavailable']}")
+
+            for mode, wall, lat in (("cold", cold_wall, cold_lat), ("warm", warm_wall, warm_lat)):
+                p95 = sorted(lat)[max(0, int(len(lat) * 0.95) - 1)]
+                speedup = f"{cold_wall / wall:>7.1f}x" if mode == "warm" else f"{'':>8}"
+                print(f"{workers:>7} {mode:>5} {wall * 1000:>7.0f}ms "
+                      f"{statistics.median(lat):>7.0f}ms {p95:>7.0f}ms {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2585,11 +2585,106 @@ def orchestrate(
         "--dry-run",
         help="Show execution plan without running agents"
     ),
+    plan: bool = typer.Option(
+        False,
+        "--plan",
+        help="Show the critical path and predicted makespan without running agents"
+    ),
+    simulate: bool = typer.Option(
+        False,
+        "--simulate",
+        help="Predict makespan, concurrency, cost and rate-limit pressure for every strategy and pool size without running agents"
+    ),
+    trace: bool = typer.Option(
+        False,
+        "--trace",
+        help="Record a Chrome trace (open in ui.perfetto.dev) and Prometheus metrics of the run in .specify/traces"
+    ),
     sequential: bool = typer.Option(
         False,
         "--sequential",
         help="Disable wave overlap (run waves one at a time)"
     ),
+    critical_path: bool = typer.Option(
+        False,
+        "--critical-path",
+        help="Dispatch agents on the longest remaining dependency chain first"
+    ),
+    aggressive: bool = typer.Option(
+        False,
+        "--aggressive",
+        help="Dataflow scheduling: start each agent as soon as its own dependencies finish, ignoring wave boundaries"
+    ),
+    adaptive: bool = typer.Option(
+        False,
+        "--adaptive",
+        help="Adapt concurrency to API feedback (AIMD), starting at --pool-size"
+    ),
+    max_pool_size: int = typer.Option(
+        32,
+        "--max-pool-size",
+        help="Upper concurrency bound in --adaptive mode",
+        min=1,
+        max=64,
+    ),
+    backend: str = typer.Option(
+        "pool",
+        "--backend",
+        help="Execution backend: 'pool' (per-request calls) or 'batch' (Message Batches API, 50% cheaper, slower)"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Stream responses: report time-to-first-token and allow early stop / partial-output handoff"
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Replay identical requests from the on-disk response cache (.specify/cache) instead of calling the API"
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="With --cache: ignore cached responses and overwrite them with fresh ones"
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None,
+        "--max-cost",
+        help="Spend limit for the run in USD; tasks are downgraded, queued or refused to stay under it",
+        min=0.0,
+    ),
+    max_tokens: Optional[int] = typer.Option(
+        None,
+        "--max-tokens",
+        help="Token limit for the run (input + output), enforced before dispatch",
+        min=1,
+    ),
+    hedge: bool = typer.Option(
+        False,
+        "--hedge",
+        help="Duplicate critical-path requests that run past their tier's p90 latency; first response wins"
+    ),
+    prompt_cache: bool = typer.Option(
+        False,
+        "--prompt-cache",
+        help="Mark system prompts and shared preambles for prompt caching (first use billed at 1.25x input)"
+    ),
+    deadline: Optional[float] = typer.Option(
+        None,
+        "--deadline",
+        help="Deadline for the whole run in seconds; unfinished agents are cancelled and reported as timed out",
+        min=1.0,
+    ),
+    resume: Optional[str] = typer.Option(
+        None,
+        "--resume",
+        help="Resume an interrupted run by its run id: agents that already succeeded are not run again",
+    ),
+    rates: Optional[Path] = typer.Option(
+        None,
+        "--rates",
+        help="JSON/YAML file with per-tier pricing (per 1M tokens) overriding the built-in rates",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose", "-v",
@@ -2614,9 +2709,33 @@ def orchestrate(
         specify orchestrate implement 001-user-auth --dry-run
 
         specify orchestrate plan 002-payments --sequential
+
+        specify orchestrate implement 001-user-auth --aggressive
+
+        specify orchestrate implement 001-user-auth --critical-path --plan
+
+        specify orchestrate implement 001-user-auth --simulate
+
+        specify orchestrate implement 001-user-auth --trace
+
+        specify orchestrate implement 001-user-auth --adaptive --max-pool-size 24
+
+        specify orchestrate implement 001-user-auth --backend batch
+
+        specify orchestrate plan 001-user-auth --cache --refresh
+
+        specify orchestrate implement 001-user-auth --max-cost 2.50
+
+        specify orchestrate implement 001-user-auth --resume 20250114-093012-1f2e3d
     """
     import asyncio
 
+    dry_run = dry_run or plan or simulate
+
+    if backend not in ("pool", "batch"):
+        console.print(f"[bold red]Error:[/bold red] Unknown backend '{backend}' (expected 'pool' or 'batch')")
+        raise typer.Exit(1)
+
     # Check for API key
     api_key = os.environ.get("ANTHROPIC_API_KEY")
     if not api_key and not dry_run:
@@ -2651,9 +2770,17 @@ def orchestrate(
 
     # Import orchestration modules
     try:
-        from .template_parser import parse_subagents_from_template, get_wave_config_from_template
-        from .agent_pool import DistributedAgentPool
+        from .template_parser import (
+            load_feature_artifacts,
+            parse_subagents_from_template,
+            parse_template_config,
+        )
+        from .agent_pool import DistributedAgentPool, PoolConfig, load_model_rates
         from .wave_scheduler import WaveScheduler, WaveConfig, ExecutionStrategy
+        from .duration_model import DEFAULT_HISTORY_PATH, DurationModel
+        from .run_journal import DEFAULT_RUNS_DIR, RunJournal
+        from .simulator import ExecutionSimulator
+        from .tracing import DEFAULT_TRACE_DIR, Tracer
     except ImportError as e:
         console.print(f"[bold red]Error:[/bold red] Failed to import orchestration modules: {e}")
         console.print("[dim]Ensure anthropic and tenacity are installed: pip install anthropic tenacity[/dim]")
@@ -2661,33 +2788,89 @@ def orchestrate(
 
     # Parse template
     try:
-        tasks = parse_subagents_from_template(template_path, feature)
-        wave_config = get_wave_config_from_template(template_path)
+        tasks = parse_subagents_from_template(
+            template_path,
+            feature,
+            artifacts=load_feature_artifacts(Path.cwd(), feature),
+            cache_shared_prefix=prompt_cache,
+        )
+        template_config = parse_template_config(template_path)
+        wave_config = template_config.wave_config
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] Failed to parse template: {e}")
         raise typer.Exit(1)
 
+    if rates is not None:
+        try:
+            load_model_rates(rates)
+        except (OSError, ValueError) as e:
+            console.print(f"[bold red]Error:[/bold red] Failed to load rates: {e}")
+            raise typer.Exit(1)
+
     if not tasks:
         console.print("[bold yellow]Warning:[/bold yellow] No parallel subagents found in template")
         console.print("[dim]This command template may not support parallel execution[/dim]")
         raise typer.Exit(0)
 
     # Override config with CLI options
-    wave_config.max_parallel = pool_size
+    wave_config.max_parallel = max(pool_size, max_pool_size) if adaptive else pool_size
     if sequential:
         wave_config.strategy = ExecutionStrategy.SEQUENTIAL
         wave_config.overlap_enabled = False
+    elif aggressive:
+        wave_config.strategy = ExecutionStrategy.AGGRESSIVE
+    if critical_path:
+        wave_config.critical_path_priority = True
+    if deadline is not None:
+        wave_config.timeout_total_ms = int(deadline * 1000)
+    if backend == "batch":
+        wave_config.strategy = ExecutionStrategy.BATCHED
+        wave_config.backend = "batch"
 
     # Show execution plan
     console.print(f"[bold cyan]Execution Plan[/bold cyan] ({len(tasks)} agents)")
     console.print()
 
     # Build waves for display
-    pool = DistributedAgentPool(pool_size=pool_size) if not dry_run else None
-    scheduler = WaveScheduler(pool, wave_config) if pool else WaveScheduler(None, wave_config)
+    pool_config = PoolConfig(
+        pool_size=pool_size,
+        adaptive_concurrency=adaptive,
+        max_pool_size=max(pool_size, max_pool_size),
+        streaming=stream,
+        response_cache=cache,
+        cache_dir=str(Path(".specify") / "cache"),
+        cache_refresh=refresh,
+        lanes=template_config.lanes,
+        role_group_weights=template_config.role_group_weights,
+        max_cost=max_cost,
+        max_tokens=max_tokens,
+        hedging=hedge,
+        prompt_caching=prompt_cache,
+    )
+    tracer = Tracer(enabled=trace and not dry_run)
+    pool = DistributedAgentPool(config=pool_config, tracer=tracer) if not dry_run else None
+    durations = DurationModel.load(DEFAULT_HISTORY_PATH)
+
+    journal = None
+    if resume:
+        try:
+            journal = RunJournal.open(resume, DEFAULT_RUNS_DIR)
+        except FileNotFoundError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            raise typer.Exit(1)
+        run_meta = journal.meta
+        if (run_meta.get("command"), run_meta.get("feature")) != (command, feature):
+            console.print(
+                f"[yellow]Warning:[/yellow] run {resume} was started for "
+                f"{run_meta.get('command')} {run_meta.get('feature')}"
+            )
+    elif not dry_run:
+        journal = RunJournal.create(DEFAULT_RUNS_DIR, meta={"command": command, "feature": feature})
+    scheduler = WaveScheduler(pool, wave_config, durations=durations, journal=journal, tracer=tracer)
 
     try:
-        waves = scheduler.build_waves(tasks)
+        pending = scheduler.restore(tasks)
+        waves = scheduler.build_waves(pending, satisfied=set(scheduler.restored))
     except ValueError as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         raise typer.Exit(1)
@@ -2706,11 +2889,93 @@ def orchestrate(
     console.print(wave_table)
     console.print()
 
+    if scheduler.restored:
+        console.print(
+            f"[bold]Resuming run {journal.run_id}:[/bold] {len(scheduler.restored)} of "
+            f"{len(tasks)} agents already succeeded, {len(pending)} remaining"
+        )
+        console.print()
+
+    if plan:
+        path_ms = scheduler.bottom_levels.get(scheduler.critical_path[0], 0.0) if scheduler.critical_path else 0.0
+        console.print(
+            f"[bold]Critical path[/bold] ({path_ms / 1000:.1f}s): "
+            + " → ".join(scheduler.critical_path)
+        )
+        console.print(
+            f"[bold]Predicted makespan:[/bold] {scheduler.predict_makespan_ms(waves) / 1000:.1f}s "
+            f"[dim]({wave_config.strategy.value}, {wave_config.max_parallel} slots, "
+            f"{'history' if durations.history else 'static estimates'})[/dim]"
+        )
+        console.print()
+
+    if simulate:
+        simulator = ExecutionSimulator(
+            wave_config,
+            durations,
+            requests_per_minute=pool_config.requests_per_minute,
+            tokens_per_minute=pool_config.tokens_per_minute,
+        )
+        try:
+            simulations = simulator.compare(tasks, pool_sizes=sorted({1, 2, 4, 8, pool_size}), runs=200)
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            raise typer.Exit(1)
+
+        sim_table = Table(show_header=True, header_style="bold cyan", box=None)
+        for column in ("Strategy", "Pool", "Makespan", "p90", "Peak", "Util", "RPM", "TPM", "Throttled", "Cost"):
+            sim_table.add_column(column, justify="left" if column == "Strategy" else "right")
+        best = ExecutionSimulator.best(simulations)
+        for sim in simulations:
+            style = "bold green" if sim is best else None
+            sim_table.add_row(
+                sim.strategy,
+                str(sim.pool_size),
+                f"{sim.makespan_ms / 1000:.1f}s",
+                f"{sim.makespan_p90_ms / 1000:.1f}s",
+                str(sim.peak_concurrency),
+                f"{sim.utilisation:.0%}",
+                f"{sim.peak_requests_per_minute}",
+                f"{sim.peak_tokens_per_minute:,}",
+                f"{sim.throttled_ms / 1000:.1f}s",
+                f"${sim.cost:.4f}",
+                style=style,
+            )
+        console.print(
+            f"[bold cyan]Simulation[/bold cyan] [dim](200 sampled runs, "
+            f"{'history' if durations.history else 'static estimates'}, "
+            f"limits {pool_config.requests_per_minute} RPM / {pool_config.tokens_per_minute:,} TPM)[/dim]"
+        )
+        console.print(sim_table)
+        console.print()
+        if best:
+            console.print(
+                f"[bold]Recommended:[/bold] {best.strategy} with --pool-size {best.pool_size} "
+                f"(p90 makespan {best.makespan_p90_ms / 1000:.1f}s)"
+            )
+            console.print()
+
     if dry_run:
         console.print("[bold yellow]Dry run mode[/bold yellow] - no agents executed")
         console.print()
         console.print("[dim]Strategy:[/dim]", wave_config.strategy.value)
+        console.print("[dim]Backend:[/dim]", wave_config.backend)
         console.print("[dim]Pool size:[/dim]", pool_size)
+        if adaptive:
+            console.print("[dim]Adaptive:[/dim]", f"AIMD up to {max(pool_size, max_pool_size)}")
+        if template_config.lanes:
+            lanes_desc = ", ".join(
+                f"{tier}={lane.max_parallel}" for tier, lane in template_config.lanes.items()
+            )
+            console.print("[dim]Lanes:[/dim]", lanes_desc)
+        if max_cost is not None or max_tokens is not None:
+            limits = []
+            if max_cost is not None:
+                limits.append(f"${max_cost:.2f}")
+            if max_tokens is not None:
+                limits.append(f"{max_tokens:,} tokens")
+            console.print("[dim]Budget:[/dim]", " / ".join(limits))
+        console.print("[dim]Response cache:[/dim]", ("refresh" if refresh else "enabled") if cache else "disabled")
         console.print("[dim]Overlap:[/dim]", "enabled" if wave_config.overlap_enabled else "disabled")
         if wave_config.overlap_enabled:
             console.print("[dim]Threshold:[/dim]", f"{wave_config.overlap_threshold:.0%}")
@@ -2718,7 +2983,9 @@ def orchestrate(
 
     # Execute
     console.print("[bold]Executing agents...[/bold]")
+    console.print(f"[dim]Run ID:[/dim] {journal.run_id}")
     console.print()
+    resume_hint = f"specify orchestrate {command} {feature} --resume {journal.run_id}"
 
     # Initialize task status updater
     tasks_md_path = None
@@ -2740,19 +3007,31 @@ def orchestrate(
         console.print("[yellow]Warning:[/yellow] tasks.md not found. Task status updates disabled.")
         console.print()
 
+    trace_files = []
+
     async def run_orchestration():
         # Set up progress tracking
-        completed_count = 0
+        completed_count = len(scheduler.restored)
         total_count = len(tasks)
 
         def on_task_complete(name: str, result):
             nonlocal completed_count
             completed_count += 1
-            status = "[green]OK[/green]" if result.success else "[red]FAIL[/red]"
+            if result.success:
+                status = "[green]OK[/green]"
+            elif getattr(result, 'status', None) in (None, "failed"):
+                status = "[red]FAIL[/red]"
+            else:
+                status = f"[red]{result.status.value.upper()}[/red]"
             duration = f"{result.duration_ms}ms"
             tokens = f"+{result.tokens_in:,} in / +{result.tokens_out:,} out"
             model = getattr(result, 'model_tier', 'sonnet')
             cost = getattr(result, 'cost', 0.0)
+            ttft = getattr(result, 'ttft_ms', None)
+            if ttft is not None:
+                duration += f", first token {ttft}ms"
+            if getattr(result, 'cached', False):
+                duration = "cached"
             console.print(f"  [{completed_count}/{total_count}] {name} [{model}]: {status} ({duration})")
             console.print(f"    [dim]📊 {tokens} | ${cost:.4f}[/dim]")
 
@@ -2797,8 +3076,13 @@ def orchestrate(
             if verbose:
                 console.print(f"  [dim]Wave {wave.index + 1} complete: {len(wave.completed)} succeeded, {len(wave.failed)} failed[/dim]")
 
+        def on_task_first_token(name: str, ttft_ms: int):
+            if verbose:
+                console.print(f"  [dim]{name}: streaming (first token after {ttft_ms}ms)[/dim]")
+
         scheduler.on_task_complete(on_task_complete)
         scheduler.on_wave_complete(on_wave_complete)
+        scheduler.on_task_first_token(on_task_first_token)
 
         try:
             results = await scheduler.execute_all(tasks)
@@ -2806,21 +3090,42 @@ def orchestrate(
         finally:
             if pool:
                 await pool.close()
+            try:
+                durations.save(DEFAULT_HISTORY_PATH)
+            except OSError as e:
+                console.print(f"[yellow]Warning:[/yellow] Could not save duration history: {e}")
+            if tracer.enabled:
+                try:
+                    trace_files.append(tracer.write_chrome_trace(DEFAULT_TRACE_DIR / f"{journal.run_id}.json"))
+                    trace_files.append(tracer.write_prometheus(DEFAULT_TRACE_DIR / f"{journal.run_id}.prom"))
+                except OSError as e:
+                    console.print(f"[yellow]Warning:[/yellow] Could not write trace: {e}")
 
     try:
         results = asyncio.run(run_orchestration())
+    except KeyboardInterrupt:
+        console.print()
+        console.print("[bold yellow]Interrupted.[/bold yellow] Finished agents are journaled; resume with:")
+        console.print(f"  {resume_hint}")
+        raise typer.Exit(130)
     except RuntimeError as e:
         console.print(f"[bold red]Execution failed:[/bold red] {e}")
+        console.print(f"[dim]Resume with: {resume_hint}[/dim]")
         raise typer.Exit(1)
     except Exception as e:
         console.print(f"[bold red]Unexpected error:[/bold red] {e}")
+        console.print(f"[dim]Resume with: {resume_hint}[/dim]")
         raise typer.Exit(1)
 
     # Summary
     console.print()
     success_count = sum(1 for r in results.values() if r.success)
     fail_count = len(results) - success_count
-    total_duration = sum(r.duration_ms for r in results.values())
+    # Wall time; task durations overlap and are summed as busy time below
+    total_duration = (
+        scheduler.metrics.makespan_ms if scheduler.metrics
+        else sum(r.duration_ms for r in results.values())
+    )
 
     # Build per-model statistics from results
     by_model = {"opus": {"requests": 0, "tokens_in": 0, "tokens_out": 0, "cost": 0.0},
@@ -2883,6 +3188,42 @@ def orchestrate(
     duration_sec = total_duration / 1000
     cost_per_min = (total_cost / duration_sec) * 60 if duration_sec > 0 else 0
     console.print(f"[dim]⏱️  Duration: {duration_sec:.1f}s | 💰 Cost/min: ${cost_per_min:.4f}[/dim]")
+    metrics = scheduler.metrics
+    if metrics:
+        console.print(
+            f"[dim]🧮 Makespan: {metrics.makespan_ms / 1000:.1f}s ({metrics.strategy}) | "
+            f"Utilisation: {metrics.utilisation:.0%} of {metrics.slots} slots | "
+            f"Idle: {metrics.idle_slot_seconds:.1f} slot-s[/dim]"
+        )
+    pool_stats = pool.get_statistics()
+    budget_stats = pool_stats["budget"]
+    if budget_stats["enabled"]:
+        console.print(
+            f"[dim]🧾 Budget: spent ${budget_stats['spent_cost']:.4f} / {budget_stats['spent_tokens']:,} tokens, "
+            f"{budget_stats['downgraded']} downgraded, {budget_stats['queued']} queued, "
+            f"{budget_stats['refused']} refused[/dim]"
+        )
+    hedge_stats = pool_stats["hedging"]
+    if hedge_stats["launched"]:
+        console.print(
+            f"[dim]🪞 Hedging: {hedge_stats['launched']} duplicates, {hedge_stats['won']} won, "
+            f"extra ${hedge_stats['extra_cost']:.4f}[/dim]"
+        )
+    cache_stats = pool_stats["response_cache"]
+    if cache_stats["enabled"] and cache_stats["cached_results"]:
+        console.print(
+            f"[dim]💾 Response cache: {cache_stats['cached_results']} hits, "
+            f"saved ${cache_stats['saved_cost']:.4f} ({cache_stats['saved_tokens']:,} tokens)[/dim]"
+        )
+    if trace_files:
+        spent = tracer.breakdown()
+        console.print(
+            f"[dim]🔎 Time in: API {spent.get('api_attempt', 0.0):.1f}s | "
+            f"slot wait {spent.get('slot_wait', 0.0):.1f}s | "
+            f"rate limit {spent.get('rate_limit_wait', 0.0):.1f}s | "
+            f"backoff {spent.get('backoff', 0.0):.1f}s (summed over tasks)[/dim]"
+        )
+        console.print(f"[dim]   Trace: {' | '.join(str(p) for p in trace_files)}[/dim]")
     console.print()
 
     if fail_count == 0:
@@ -2892,6 +3233,7 @@ def orchestrate(
         for name, result in results.items():
             if not result.success:
                 console.print(f"  [red]FAILED:[/red] {name}: {result.error}")
+        console.print(f"[dim]Retry the failed agents with: {resume_hint}[/dim]")
 
 
 def main():
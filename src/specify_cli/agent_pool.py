@@ -8,14 +8,23 @@ retries with exponential backoff.
 Architecture:
     ┌─────────────────────────────────────────────────────┐
     │            DistributedAgentPool                      │
-    │  ┌───────────┐ ┌───────────┐ ┌───────────┐ ┌─────┐ │
-    │  │ Client 1  │ │ Client 2  │ │ Client 3  │ │ ... │ │
-    │  └─────┬─────┘ └─────┬─────┘ └─────┬─────┘ └──┬──┘ │
-    │        └─────────────┴─────────────┴──────────┘    │
+    │  ┌──────────────────────────────────────────────┐  │
+    │  │ AsyncAnthropic ── shared AsyncClient         │  │
+    │  │ (HTTP/2 when available, keep-alive limits)   │  │
+    │  └──────────────────────┬───────────────────────┘  │
+    │       (per-client mode: N clients, least-busy)     │
     │                      │                              │
     │         ┌────────────┴────────────┐                │
-    │         │  Semaphore (pool_size)  │                │
+    │         │ Lane per model tier     │  (default lane │
+    │         │  priority / fair queue  │   when a tier  │
+    │         │  ConcurrencyLimiter ◀── AIMD controller │
+    │         │  RateLimiter (RPM + TPM)│   has no own)  │
     │         └─────────────────────────┘                │
+    │         ┌─────────────────────────┐                │
+    │ task ──▶│ ResponseCache (SQLite)  │── hit ──▶ result│
+    │         └─────────────────────────┘                │
+    │   Tracer: task / slot_wait / rate_limit_wait /     │
+    │           api_attempt / backoff spans + metrics    │
     └─────────────────────────────────────────────────────┘
 
 Usage:
@@ -27,12 +36,18 @@ Usage:
 from __future__ import annotations
 
 import asyncio
+import json
+import re
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple, Any, Union
 from enum import Enum
 
 import anthropic
+import yaml
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -40,6 +55,21 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from .connection_pool import (
+    ConnectionPoolConfig,
+    build_http_client,
+    describe_http_client,
+)
+from .concurrency import (
+    AdaptiveConcurrencyController,
+    ConcurrencyLimiter,
+    parse_retry_after,
+)
+from .lanes import DEFAULT_LANE, Lane, LaneConfig
+from .rate_limiter import RateLimiter
+from .response_cache import DEFAULT_CACHE_DIR, ResponseCache
+from .tracing import Span, Tracer
+
 
 class ModelTier(str, Enum):
     """Model tiers for agent execution."""
@@ -48,14 +78,89 @@ class ModelTier(str, Enum):
     HAIKU = "claude-3-5-haiku-20241022"
 
 
+class ResultStatus(str, Enum):
+    """Outcome of an agent task."""
+    SUCCESS = "success"        # Response received
+    FAILED = "failed"          # API or execution error
+    TIMEOUT = "timeout"        # Task or run deadline exceeded
+    CANCELLED = "cancelled"    # Stopped because another task failed (fail-fast)
+    SKIPPED = "skipped"        # Not run because a dependency failed
+
+
 # Pricing per 1M tokens (USD) - as of January 2025
+# cache_write = 1.25x input (5-minute ephemeral cache), cache_read = 0.1x input
 MODEL_RATES: Dict[str, Dict[str, float]] = {
-    "opus": {"input": 15.00, "output": 75.00},
-    "sonnet": {"input": 3.00, "output": 15.00},
-    "haiku": {"input": 0.25, "output": 1.25},
+    "opus": {"input": 15.00, "output": 75.00, "cache_write": 18.75, "cache_read": 1.50},
+    "sonnet": {"input": 3.00, "output": 15.00, "cache_write": 3.75, "cache_read": 0.30},
+    "haiku": {"input": 0.25, "output": 1.25, "cache_write": 0.30, "cache_read": 0.03},
 }
 
 
+# Errors signalling that the API is over capacity (429 / 500 / 529).
+# OverloadedError only exists in newer SDK releases.
+OVERLOAD_ERRORS: tuple = tuple(
+    getattr(anthropic, name)
+    for name in ("RateLimitError", "InternalServerError", "OverloadedError", "ServiceUnavailableError")
+    if hasattr(anthropic, name)
+)
+
+# Errors worth retrying
+TRANSIENT_ERRORS: tuple = OVERLOAD_ERRORS + (anthropic.APIConnectionError,)
+
+
+class wait_retry_after:
+    """
+    Tenacity wait strategy that honours the server's retry-after header.
+
+    Falls back to the wrapped strategy (typically exponential backoff)
+    when the failed attempt carried no retry-after hint.
+    """
+
+    def __init__(self, fallback: Any, max_wait: float = 60.0):
+        self.fallback = fallback
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state: Any) -> float:
+        outcome = retry_state.outcome
+        error = outcome.exception() if outcome is not None else None
+        delay = parse_retry_after(error) if error is not None else None
+        if delay is None:
+            return self.fallback(retry_state)
+        return min(delay, self.max_wait)
+
+
+def load_model_rates(path: Union[str, Path]) -> Dict[str, Dict[str, float]]:
+    """
+    Load per-tier pricing from a JSON or YAML file into ``MODEL_RATES``.
+
+    The file maps tiers to per-1M-token rates, e.g.
+    ``{"opus": {"input": 15.0, "output": 75.0}}``. Tiers and rate kinds not
+    mentioned keep their built-in values, so a partial file is enough to
+    follow a price change.
+
+    Returns:
+        The updated ``MODEL_RATES``
+
+    Raises:
+        ValueError: If the file is not a mapping of tiers to numeric rates
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    data = json.loads(text) if path.suffix == ".json" else yaml.safe_load(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Rates file must map tiers to rates: {path}")
+
+    for tier, rates in data.items():
+        if not isinstance(rates, dict):
+            raise ValueError(f"Rates for '{tier}' must be a mapping in: {path}")
+        try:
+            parsed = {kind: float(value) for kind, value in rates.items()}
+        except (TypeError, ValueError):
+            raise ValueError(f"Rates for '{tier}' must be numeric in: {path}")
+        MODEL_RATES.setdefault(model_id_to_tier(tier), {}).update(parsed)
+    return MODEL_RATES
+
+
 def model_id_to_tier(model_id: str) -> str:
     """Convert full model ID to tier name (opus/sonnet/haiku)."""
     if "opus" in model_id.lower():
@@ -67,10 +172,47 @@ def model_id_to_tier(model_id: str) -> str:
     return "sonnet"  # default
 
 
-def calculate_cost(model_tier: str, tokens_in: int, tokens_out: int) -> float:
-    """Calculate cost in USD for given token usage."""
+def calculate_cost(
+    model_tier: str,
+    tokens_in: int,
+    tokens_out: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> float:
+    """
+    Calculate cost in USD for given token usage.
+
+    ``tokens_in`` is the uncached input as reported by the API; cached input
+    is billed separately at the discounted read rate or the write premium.
+    """
     rates = MODEL_RATES.get(model_tier, MODEL_RATES["sonnet"])
-    return (tokens_in * rates["input"] + tokens_out * rates["output"]) / 1_000_000
+    cache_write_rate = rates.get("cache_write", rates["input"] * 1.25)
+    cache_read_rate = rates.get("cache_read", rates["input"] * 0.1)
+    return (
+        tokens_in * rates["input"]
+        + tokens_out * rates["output"]
+        + cache_write_tokens * cache_write_rate
+        + cache_read_tokens * cache_read_rate
+    ) / 1_000_000
+
+
+def usage_token_count(usage: Any) -> int:
+    """
+    Tokens from an API usage block that count against the TPM quota.
+
+    Cache reads are excluded; cache writes count like regular input.
+    """
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return usage.input_tokens + cache_write + usage.output_tokens
+
+
+# Rough characters-per-token ratio used for pre-flight estimates
+CHARS_PER_TOKEN = 4
+
+
+def estimate_input_tokens(text: str) -> int:
+    """Estimate input tokens for a piece of text (pre-flight, no API call)."""
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
 
 
 @dataclass
@@ -80,7 +222,7 @@ class AgentTask:
 
     Attributes:
         name: Unique identifier for the task (typically the agent role)
-        prompt: The prompt to send to the Claude API
+        prompt: The task-specific prompt to send to the Claude API
         model: Claude model to use (defaults to Sonnet for balance of speed/quality)
         depends_on: List of task names that must complete before this task
         priority: Execution priority (lower = higher priority, default 5)
@@ -89,6 +231,20 @@ class AgentTask:
         max_tokens: Maximum tokens for the response
         temperature: Sampling temperature (0.0-1.0)
         metadata: Additional metadata for tracking/logging
+        prompt_prefix: Optional shared preamble (feature header, artifacts,
+            constitution) sent before ``prompt`` as a cacheable content block
+        stop_pattern: Regex; in streaming mode, generation is cancelled as soon
+            as the accumulated output matches
+        partial_ready_pattern: Regex; in streaming mode, once the output matches
+            the partial output is announced as sufficient for dependents
+        timeout_ms: Deadline for the task's API calls, retries included
+            (None for no deadline); passed to each request as its timeout
+        context_from: Dependencies whose output is put in front of the
+            prompt at dispatch time: a list of names, or a mapping of name
+            to "full", "summary", "section:<heading>" or
+            ``{mode, section, max_tokens}`` (see dependency_context)
+        context_budget_tokens: Token limit for the injected outputs
+            (None: the scheduler's ``WaveConfig.context_budget_tokens``)
     """
     name: str
     prompt: str
@@ -100,6 +256,30 @@ class AgentTask:
     max_tokens: int = 8192
     temperature: float = 0.7
     metadata: Dict[str, Any] = field(default_factory=dict)
+    prompt_prefix: Optional[str] = None
+    stop_pattern: Optional[str] = None
+    partial_ready_pattern: Optional[str] = None
+    timeout_ms: Optional[int] = None
+    context_from: Union[List[str], Dict[str, Any]] = field(default_factory=dict)
+    context_budget_tokens: Optional[int] = None
+
+    @property
+    def full_prompt(self) -> str:
+        """Complete user prompt text (shared prefix followed by task prompt)."""
+        if self.prompt_prefix:
+            return f"{self.prompt_prefix}\n\n{self.prompt}"
+        return self.prompt
+
+    def estimate_tokens(self) -> int:
+        """
+        Pre-flight token estimate used for rate-limit admission.
+
+        Counts the prompt and system prompt plus the full ``max_tokens``
+        output allowance; the difference is refunded once real usage is known.
+        """
+        prompt_tokens = estimate_input_tokens(self.full_prompt)
+        prompt_tokens += estimate_input_tokens(self.system_prompt or "")
+        return prompt_tokens + self.max_tokens
 
 
 @dataclass
@@ -119,6 +299,14 @@ class AgentResult:
         cost: Cost in USD for this request
         error: Error message if success is False
         stop_reason: Reason the model stopped generating
+        cache_read_tokens: Input tokens served from the prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache
+        ttft_ms: Time to first token in streaming mode
+        cached: Whether the result was served from the response cache
+            (tokens and cost are then zero)
+        status: Outcome category; derived from ``success`` when not given
+        metadata: Additional details, e.g. ``dependency_context`` (injected
+            upstream output sizes per dependency)
     """
     name: str
     output: str
@@ -131,6 +319,16 @@ class AgentResult:
     cost: float
     error: Optional[str] = None
     stop_reason: Optional[str] = None
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    ttft_ms: Optional[int] = None
+    cached: bool = False
+    status: Optional[ResultStatus] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.status is None:
+            self.status = ResultStatus.SUCCESS if self.success else ResultStatus.FAILED
 
 
 @dataclass
@@ -141,14 +339,45 @@ class PoolConfig:
     Attributes:
         pool_size: Number of concurrent clients/tasks
         default_model: Default model for tasks without explicit model
-        requests_per_minute: Rate limit for API requests
-        tokens_per_minute: Rate limit for tokens
+        requests_per_minute: Rate limit for API requests (0 disables)
+        tokens_per_minute: Rate limit for input + output tokens (0 disables)
         max_retries: Maximum retry attempts for failed requests
         backoff_base: Base wait time for exponential backoff (seconds)
         backoff_max: Maximum wait time for backoff (seconds)
         batch_mode: Enable cross-wave batch aggregation for latency reduction
         max_batch_size: Maximum tasks per aggregated batch
         batch_timeout_ms: Time to wait for more requests before executing batch
+        adaptive_concurrency: Let an AIMD controller tune concurrency from 429/529 feedback
+        min_pool_size: Lower concurrency bound in adaptive mode
+        max_pool_size: Upper concurrency bound in adaptive mode
+        prompt_caching: Send cache_control breakpoints for system prompts and shared prefixes
+        streaming: Use messages.stream with per-chunk callbacks instead of messages.create
+        response_cache: Serve identical requests from the on-disk response cache
+        cache_dir: Directory of the response cache database
+        cache_ttl_s: Lifetime of cached responses in seconds
+        cache_max_entries: Maximum number of cached responses
+        cache_max_mb: Maximum total size of cached responses in megabytes
+        cache_refresh: Ignore cached responses but overwrite them with fresh ones
+        shared_connections: Share one tuned HTTP connection pool across all slots
+            instead of creating one client (and connection pool) per slot
+        http2: Multiplex requests over HTTP/2 when the ``h2`` package is installed
+        max_connections: Maximum open connections of the shared client
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry_s: Idle time before a kept-alive connection is closed
+        lanes: Per-tier lanes ("opus"/"sonnet"/"haiku") with their own
+            concurrency and RPM/TPM budgets; tiers without a lane share the
+            default lane sized by pool_size and the global rate limits
+        role_group_weights: Fair-queueing share per role group within a lane
+        max_cost: Spend limit for the run in USD, enforced before dispatch
+        max_tokens: Token limit for the run, enforced before dispatch
+        budget_downgrade_below: Fraction of the remaining budget below which
+            tasks are moved to a cheaper tier
+        hedging: Send a duplicate request for stragglers and keep the first
+            response to finish
+        hedge_percentile: Latency percentile of the task's tier after which a
+            straggler is hedged
+        hedge_min_samples: Completed requests per tier required before hedging
+        hedge_critical_only: Only hedge tasks marked ``critical_path`` in metadata
     """
     pool_size: int = 8
     default_model: str = ModelTier.SONNET.value
@@ -161,6 +390,40 @@ class PoolConfig:
     batch_mode: bool = True
     max_batch_size: int = 10
     batch_timeout_ms: int = 100
+    # Adaptive concurrency (AIMD)
+    adaptive_concurrency: bool = False
+    min_pool_size: int = 1
+    max_pool_size: int = 32
+    # Prompt caching for shared system/prefix content (opt-in: the first
+    # request per prefix is billed at the cache-write rate)
+    prompt_caching: bool = False
+    # Streaming responses (time-to-first-token, chunk callbacks, early stop)
+    streaming: bool = False
+    # On-disk response cache keyed by the exact request
+    response_cache: bool = False
+    cache_dir: str = str(DEFAULT_CACHE_DIR)
+    cache_ttl_s: float = 7 * 24 * 3600
+    cache_max_entries: int = 10_000
+    cache_max_mb: int = 256
+    cache_refresh: bool = False
+    # Connection pooling
+    shared_connections: bool = True
+    http2: bool = True
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry_s: float = 30.0
+    # Per-tier lanes and weighted fair queueing
+    lanes: Dict[str, LaneConfig] = field(default_factory=dict)
+    role_group_weights: Dict[str, float] = field(default_factory=dict)
+    # Budget governor
+    max_cost: Optional[float] = None
+    max_tokens: Optional[int] = None
+    budget_downgrade_below: float = 0.2
+    # Hedged requests for tail latency
+    hedging: bool = False
+    hedge_percentile: float = 0.90
+    hedge_min_samples: int = 5
+    hedge_critical_only: bool = True
 
 
 class DistributedAgentPool:
@@ -186,7 +449,8 @@ class DistributedAgentPool:
     def __init__(
         self,
         pool_size: int = 4,
-        config: Optional[PoolConfig] = None
+        config: Optional[PoolConfig] = None,
+        tracer: Optional[Tracer] = None,
     ):
         """
         Initialize the agent pool.
@@ -194,23 +458,133 @@ class DistributedAgentPool:
         Args:
             pool_size: Number of concurrent execution slots
             config: Optional configuration override
+            tracer: Span and metrics recorder (disabled if omitted)
         """
         self.config = config or PoolConfig(pool_size=pool_size)
+        self.tracer = tracer or Tracer(enabled=False)
         self.pool_size = self.config.pool_size
+        adaptive = self.config.adaptive_concurrency
 
-        # Create pool of async clients
-        # Each client maintains its own connection pool
-        self.clients: List[anthropic.AsyncAnthropic] = [
-            anthropic.AsyncAnthropic() for _ in range(self.pool_size)
-        ]
+        # Create async clients
+        # In shared mode one client wraps a single tuned connection pool used
+        # by every slot; otherwise each client maintains its own connection
+        # pool. In adaptive mode the pool may grow up to max_pool_size, and
+        # SDK-internal retries are disabled so that 429/529 responses reach
+        # the controller.
+        client_kwargs: Dict[str, Any] = {"max_retries": 0} if adaptive else {}
+        self.connection_config = ConnectionPoolConfig(
+            http2=self.config.http2,
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry_s=self.config.keepalive_expiry_s,
+        )
+        self._http_client: Optional[Any] = None
+        if self.config.shared_connections:
+            self._http_client = build_http_client(self.connection_config)
+            self.clients: List[anthropic.AsyncAnthropic] = [
+                anthropic.AsyncAnthropic(http_client=self._http_client, **client_kwargs)
+            ]
+        else:
+            client_count = max(self.pool_size, self.config.max_pool_size) if adaptive else self.pool_size
+            self.clients = [
+                anthropic.AsyncAnthropic(**client_kwargs) for _ in range(client_count)
+            ]
+
+        # In-flight requests per client, for least-busy assignment and draining
+        self._client_load: List[int] = [0] * len(self.clients)
+        self.in_flight = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+        # Limiter caps concurrent executions; its limit moves in adaptive mode
+        self.semaphore = ConcurrencyLimiter(self.pool_size)
+        self.concurrency_controller: Optional[AdaptiveConcurrencyController] = (
+            AdaptiveConcurrencyController(
+                self.semaphore,
+                min_limit=self.config.min_pool_size,
+                max_limit=self.config.max_pool_size,
+            )
+            if adaptive else None
+        )
+
+        # Token buckets admit requests before they hit the API
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=self.config.requests_per_minute,
+            tokens_per_minute=self.config.tokens_per_minute,
+        )
 
-        # Semaphore limits concurrent executions
-        self.semaphore = asyncio.Semaphore(self.pool_size)
+        # Lanes: the default lane wraps the pool-wide limiter and rate limiter;
+        # tiers configured in config.lanes get isolated budgets
+        self.default_lane = Lane(
+            DEFAULT_LANE,
+            self.semaphore,
+            self.rate_limiter,
+            self.concurrency_controller,
+            weights=self.config.role_group_weights,
+        )
+        self.lanes: Dict[str, Lane] = {
+            model_id_to_tier(tier): Lane.from_config(
+                model_id_to_tier(tier),
+                lane_config,
+                adaptive=adaptive,
+                max_parallel=self.config.max_pool_size,
+                weights=self.config.role_group_weights,
+            )
+            for tier, lane_config in self.config.lanes.items()
+        }
+
+        # Budget governor, only when a limit is configured
+        self.budget: Optional[Any] = None
+        if self.config.max_cost is not None or self.config.max_tokens is not None:
+            # Import here to avoid circular import (budget uses AgentTask)
+            from .budget import BudgetGovernor
+            self.budget = BudgetGovernor(
+                max_cost=self.config.max_cost,
+                max_tokens=self.config.max_tokens,
+                downgrade_below=self.config.budget_downgrade_below,
+                prompt_caching=self.config.prompt_caching,
+            )
+
+        # Hedging: recent successful latencies per tier and hedge accounting
+        self._latency_samples: Dict[str, deque] = {
+            tier: deque(maxlen=200) for tier in ("opus", "sonnet", "haiku")
+        }
+        self.hedges_launched = 0
+        self.hedges_won = 0
+        self.hedges_skipped = 0
+        self.hedge_cost = 0.0
+        self.hedge_tokens = 0
 
         # Track results and pending tasks
         self.results: Dict[str, AgentResult] = {}
         self.pending: Dict[str, AgentTask] = {}
 
+        # Persistent response cache (opt-in)
+        self.response_cache: Optional[ResponseCache] = (
+            ResponseCache(
+                self.config.cache_dir,
+                ttl_s=self.config.cache_ttl_s,
+                max_entries=self.config.cache_max_entries,
+                max_bytes=self.config.cache_max_mb * 1024 * 1024,
+                refresh=self.config.cache_refresh,
+            )
+            if self.config.response_cache else None
+        )
+        self.cached_results = 0
+        self.cache_saved_cost = 0.0
+        self.cache_saved_tokens = 0
+
+        # Message Batches backend, created on first use
+        self._batch_backend: Optional[Any] = None
+
+        # Streaming callbacks
+        self._on_chunk: Optional[Callable[[str, str], None]] = None
+        self._on_first_token: Optional[Callable[[str, int], None]] = None
+        self._on_partial_ready: Optional[Callable[[str, str], None]] = None
+        self.total_ttft_ms = 0
+        self.streamed_requests = 0
+        self.early_stops = 0
+
         # Statistics
         self.total_requests = 0
         self.total_tokens_in = 0
@@ -219,155 +593,738 @@ class DistributedAgentPool:
 
         # Per-model statistics
         self.by_model: Dict[str, Dict[str, Any]] = {
-            "opus": {"tokens_in": 0, "tokens_out": 0, "requests": 0, "cost": 0.0},
-            "sonnet": {"tokens_in": 0, "tokens_out": 0, "requests": 0, "cost": 0.0},
-            "haiku": {"tokens_in": 0, "tokens_out": 0, "requests": 0, "cost": 0.0},
+            tier: {
+                "tokens_in": 0, "tokens_out": 0, "requests": 0, "cost": 0.0,
+                "cache_read_tokens": 0, "cache_write_tokens": 0,
+            }
+            for tier in ("opus", "sonnet", "haiku")
         }
 
+    def on_chunk(
+        self,
+        callback: Callable[[str, str], None]
+    ) -> "DistributedAgentPool":
+        """Register callback for streamed text chunks (task name, text). Returns self for chaining."""
+        self._on_chunk = callback
+        return self
+
+    def on_first_token(
+        self,
+        callback: Callable[[str, int], None]
+    ) -> "DistributedAgentPool":
+        """Register callback for time-to-first-token (task name, ttft ms). Returns self for chaining."""
+        self._on_first_token = callback
+        return self
+
+    def on_partial_ready(
+        self,
+        callback: Callable[[str, str], None]
+    ) -> "DistributedAgentPool":
+        """
+        Register callback fired when a task's partial output matches its
+        ``partial_ready_pattern`` (task name, output so far). Returns self for chaining.
+        """
+        self._on_partial_ready = callback
+        return self
+
     async def execute_wave(
         self,
-        tasks: List[AgentTask]
+        tasks: List[AgentTask],
+        fail_fast: bool = False,
+        on_result: Optional[Callable[[str, AgentResult], None]] = None,
     ) -> Dict[str, AgentResult]:
         """
         Execute multiple agent tasks in parallel within concurrency limit.
 
+        If the wave itself is cancelled (e.g. by a run deadline), every
+        in-flight task is cancelled and awaited before the cancellation
+        propagates, so lane slots, clients and budget are released.
+
         Args:
             tasks: List of tasks to execute (should have no dependencies on each other)
+            fail_fast: Cancel the remaining tasks as soon as one fails; they
+                are returned with ``ResultStatus.CANCELLED``
+            on_result: Called with each task's result as soon as it is known
 
         Returns:
             Dictionary mapping task names to their results
         """
-        async def run_task(task: AgentTask, client_idx: int) -> AgentResult:
-            async with self.semaphore:
-                client = self.clients[client_idx % self.pool_size]
-                return await self._execute_single(task, client)
-
-        # Launch all tasks with round-robin client assignment
-        coroutines = [
-            run_task(task, i) for i, task in enumerate(tasks)
-        ]
+        # Launch all tasks; clients are assigned by availability
+        running = {asyncio.ensure_future(self.execute_task(task)): task for task in tasks}
+        wave_results: Dict[str, AgentResult] = {}
+        failed_task: Optional[str] = None
 
-        # Gather results, handling exceptions
-        results_list = await asyncio.gather(*coroutines, return_exceptions=True)
+        def finish(task: AgentTask, result: AgentResult) -> None:
+            wave_results[task.name] = result
+            # Update global results
+            self.results[task.name] = result
+            if on_result:
+                on_result(task.name, result)
 
-        # Process results
-        wave_results: Dict[str, AgentResult] = {}
-        for task, result in zip(tasks, results_list):
-            if isinstance(result, Exception):
-                # Convert exception to failed result
-                wave_results[task.name] = AgentResult(
-                    name=task.name,
-                    output="",
-                    success=False,
-                    duration_ms=0,
-                    model_used=task.model,
-                    model_tier=model_id_to_tier(task.model),
-                    tokens_in=0,
-                    tokens_out=0,
-                    cost=0.0,
-                    error=str(result),
-                )
+        try:
+            pending = set(running)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running[future]
+                    if future.cancelled():
+                        continue
+                    error = future.exception()
+                    if error is not None:
+                        # Convert exception to failed result
+                        finish(task, self._failed_result(task, str(error)))
+                    else:
+                        finish(task, future.result())
+                    if not wave_results[task.name].success:
+                        failed_task = failed_task or task.name
+                if fail_fast and failed_task and pending:
+                    for future in pending:
+                        future.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    break
+        finally:
+            unfinished = [future for future in running if not future.done()]
+            for future in unfinished:
+                future.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+        for task in tasks:
+            if task.name not in wave_results:
+                finish(task, self._failed_result(
+                    task, f"Cancelled: '{failed_task}' failed",
+                    status=ResultStatus.CANCELLED,
+                ))
+
+        # Results in submission order
+        return {task.name: wave_results[task.name] for task in tasks}
+
+    async def execute_task(self, task: AgentTask) -> AgentResult:
+        """
+        Execute one task within the concurrency limit.
+
+        Cached responses are returned immediately. Otherwise, with a
+        budget configured, worst-case cost is reserved first (possibly on a
+        cheaper tier); the task then waits in its model tier's lane, ordered
+        by priority and role-group fair share, and runs on the least busy
+        client. With hedging enabled, a straggler gets a duplicate request
+        (see ``_execute_hedged``). The result is not added to
+        ``self.results``; ``execute_wave`` does that for whole waves.
+
+        Args:
+            task: Task to execute
+
+        Returns:
+            Result of the task
+        """
+        with self.tracer.span("task", "task", task=task.name, role_group=task.role_group) as span:
+            result = await self._execute_task(task)
+            self._trace_result(span, result)
+            return result
+
+    async def _execute_task(self, task: AgentTask) -> AgentResult:
+        """Body of ``execute_task`` (inside its trace span)."""
+        if self.response_cache:
+            cached = self._cached_result(task, self.cache_key(task))
+            if cached:
+                return cached
+
+        reservation = None
+        if self.budget:
+            # Import here to avoid circular import (budget uses AgentTask)
+            from .budget import BudgetExceededError
+            try:
+                reservation = await self.budget.reserve(task)
+            except BudgetExceededError as e:
+                return self._failed_result(task, str(e))
+            task = reservation.task
+            if reservation.downgraded_from and self.response_cache:
+                # A downgraded request is cached under its own key
+                cached = self._cached_result(task, self.cache_key(task))
+                if cached:
+                    self.budget.settle(reservation, cached)
+                    return cached
+
+        result: Optional[AgentResult] = None
+        try:
+            lane = self.lane_for(task)
+            wait_start = self.tracer.now()
+            async with lane.slot(task):
+                self._trace_wait("slot_wait", "specify_slot_wait_seconds", wait_start, lane=lane.name)
+                if self._should_hedge(task):
+                    result = await self._execute_hedged(task, lane)
+                else:
+                    result = await self._run_on_client(task, lane)
+            return result
+        finally:
+            if reservation:
+                self.budget.settle(reservation, result)
+
+    async def _run_on_client(self, task: AgentTask, lane: Lane) -> AgentResult:
+        """Run a task on the least busy client (the caller holds a lane slot)."""
+        client_idx = self._acquire_client()
+        try:
+            return await self._execute_single(task, self.clients[client_idx], lane)
+        finally:
+            self._release_client(client_idx)
+
+    def _should_hedge(self, task: AgentTask) -> bool:
+        if not self.config.hedging:
+            return False
+        return not self.config.hedge_critical_only or bool(task.metadata.get("critical_path"))
+
+    def hedge_delay_ms(self, tier: str) -> Optional[float]:
+        """
+        Latency after which a request on ``tier`` is considered a straggler.
+
+        Returns the configured percentile of recent successful latencies, or
+        None until ``hedge_min_samples`` requests have completed.
+        """
+        samples = self._latency_samples.get(tier)
+        if not samples or len(samples) < self.config.hedge_min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.config.hedge_percentile * len(ordered)))
+        return float(ordered[index])
+
+    async def _execute_hedged(self, task: AgentTask, lane: Lane) -> AgentResult:
+        """
+        Execute a task, duplicating it if it runs past the tier's hedge delay.
+
+        The duplicate only launches if the lane has a free slot, so hedging
+        never queues behind (or delays) other work. The first successful
+        response wins and the other request is cancelled; if the loser also
+        completed, its cost is booked as hedging overhead.
+        """
+        delay_ms = self.hedge_delay_ms(model_id_to_tier(task.model))
+        primary = asyncio.ensure_future(self._run_on_client(task, lane))
+        if delay_ms is None:
+            return await primary
+
+        hedge: Optional[asyncio.Future] = None
+        try:
+            await asyncio.wait({primary}, timeout=delay_ms / 1000)
+            if primary.done():
+                return primary.result()
+
+            limiter = lane.limiter
+            if limiter.in_use >= limiter.limit or limiter.waiting:
+                self.hedges_skipped += 1
+                return await primary
+
+            await limiter.acquire()
+            self.hedges_launched += 1
+            hedge = asyncio.ensure_future(self._run_on_client(task, lane))
+            hedge.add_done_callback(lambda _: limiter.release())
+
+            pending = {primary, hedge}
+            finished: List[asyncio.Future] = []
+            winner: Optional[asyncio.Future] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    finished.append(fut)
+                    if winner is None and fut.result().success:
+                        winner = fut
+            winner = winner or primary
+
+            if winner is hedge:
+                self.hedges_won += 1
+            for fut in finished:
+                if fut is not winner:
+                    self._record_hedge_overhead(fut.result())
+            return winner.result()
+        finally:
+            for fut in (primary, hedge):
+                if fut is not None and not fut.done():
+                    fut.cancel()
+
+    def _record_hedge_overhead(self, result: AgentResult) -> None:
+        """Book the cost of a duplicate response that was not used."""
+        self.hedge_cost += result.cost
+        self.hedge_tokens += result.tokens_in + result.tokens_out
+        if self.budget:
+            self.budget.charge(result)
+
+    def lane_for(self, task: AgentTask) -> Lane:
+        """Return the lane a task executes in."""
+        return self.lanes.get(model_id_to_tier(task.model), self.default_lane)
+
+    def _acquire_client(self) -> int:
+        """Pick the client with the fewest in-flight requests."""
+        if len(self._client_load) != len(self.clients):
+            # Clients were replaced (e.g. in tests); start counting afresh
+            self._client_load = [0] * len(self.clients)
+        client_idx = min(range(len(self.clients)), key=self._client_load.__getitem__)
+        self._client_load[client_idx] += 1
+        self.in_flight += 1
+        self._drained.clear()
+        return client_idx
+
+    def _release_client(self, client_idx: int) -> None:
+        if client_idx < len(self._client_load):
+            self._client_load[client_idx] = max(0, self._client_load[client_idx] - 1)
+        self.in_flight = max(0, self.in_flight - 1)
+        if self.in_flight == 0:
+            self._drained.set()
+
+    def build_request_kwargs(self, task: AgentTask) -> Dict[str, Any]:
+        """
+        Build the ``messages.create`` keyword arguments for a task.
+
+        With prompt caching enabled, the system prompt and the task's shared
+        ``prompt_prefix`` are sent as content blocks carrying
+        ``cache_control`` breakpoints so that repeated preambles across
+        subagents are billed at the cache-read rate.
+        """
+        cache = self.config.prompt_caching
+
+        if task.prompt_prefix:
+            prefix_block: Dict[str, Any] = {"type": "text", "text": task.prompt_prefix}
+            if cache:
+                prefix_block["cache_control"] = {"type": "ephemeral"}
+            content: Any = [prefix_block, {"type": "text", "text": task.prompt}]
+        else:
+            content = task.prompt
+
+        kwargs: Dict[str, Any] = {
+            "model": task.model,
+            "max_tokens": task.max_tokens,
+            "messages": [{"role": "user", "content": content}],
+        }
+
+        if task.system_prompt:
+            if cache:
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": task.system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }]
             else:
-                wave_results[task.name] = result
+                kwargs["system"] = task.system_prompt
 
-            # Update global results
-            self.results[task.name] = wave_results[task.name]
+        if task.temperature is not None:
+            kwargs["temperature"] = task.temperature
+
+        return kwargs
+
+    async def execute_message_batch(
+        self,
+        tasks: List[AgentTask]
+    ) -> Dict[str, AgentResult]:
+        """
+        Execute independent tasks as one Message Batches job.
 
-        return wave_results
+        Trades latency for throughput and a 50% price discount; see
+        ``batch_backend.BatchBackend``.
+
+        Args:
+            tasks: List of tasks to execute (no dependencies on each other)
+
+        Returns:
+            Dictionary mapping task names to their results
+        """
+        # Import here to avoid circular import (batch_backend uses AgentTask)
+        from .batch_backend import BATCH_COST_MULTIPLIER, BatchBackend
+
+        if self._batch_backend is None:
+            self._batch_backend = BatchBackend(self)
+
+        results: Dict[str, AgentResult] = {}
+        reservations: Dict[str, Any] = {}
+        pending: List[AgentTask] = []
+        for task in tasks:
+            if self.response_cache:
+                cached = self._cached_result(task, self.cache_key(task))
+                if cached:
+                    results[task.name] = cached
+                    continue
+            if self.budget:
+                # Batch jobs cannot wait for each other; admit what fits now
+                reservation = self.budget.try_reserve(task, BATCH_COST_MULTIPLIER, count_refusal=True)
+                if reservation is None:
+                    results[task.name] = self._failed_result(
+                        task, f"Budget exceeded: task '{task.name}' does not fit the remaining budget"
+                    )
+                    continue
+                task = reservation.task
+                if reservation.downgraded_from and self.response_cache:
+                    cached = self._cached_result(task, self.cache_key(task))
+                    if cached:
+                        self.budget.settle(reservation, cached)
+                        results[task.name] = cached
+                        continue
+                reservations[task.name] = reservation
+            pending.append(task)
+
+        if pending:
+            with self.tracer.span("message_batch", "api", tasks=len(pending)):
+                fresh = await self._batch_backend.execute(pending)
+            for task in pending:
+                if self.response_cache:
+                    self._store_cached(self.cache_key(task), fresh[task.name])
+                if task.name in reservations:
+                    self.budget.settle(reservations[task.name], fresh[task.name])
+            results.update(fresh)
+
+        for result in results.values():
+            self._trace_result(None, result)
+        self.results.update(results)
+        return results
+
+    def cache_key(self, task: AgentTask) -> str:
+        """
+        Return the response-cache key for a task.
+
+        The key covers the exact request kwargs plus the streaming stop
+        pattern, since an early-stopped response differs from a full one.
+        """
+        request = self.build_request_kwargs(task)
+        if task.stop_pattern:
+            request["stop_pattern"] = task.stop_pattern
+        return ResponseCache.key_for(request)
+
+    def _cached_result(self, task: AgentTask, key: str) -> Optional[AgentResult]:
+        """Build a zero-cost AgentResult from the response cache, if present."""
+        payload = self.response_cache.get(key) if self.response_cache else None
+        if payload is None:
+            return None
+
+        self.cached_results += 1
+        self.cache_saved_cost += payload.get("cost", 0.0)
+        self.cache_saved_tokens += payload.get("tokens_in", 0) + payload.get("tokens_out", 0)
+        return AgentResult(
+            name=task.name,
+            output=payload["output"],
+            success=True,
+            duration_ms=0,
+            model_used=payload.get("model_used", task.model),
+            model_tier=model_id_to_tier(task.model),
+            tokens_in=0,
+            tokens_out=0,
+            cost=0.0,
+            stop_reason=payload.get("stop_reason"),
+            cached=True,
+        )
+
+    def _store_cached(self, key: Optional[str], result: AgentResult) -> None:
+        """Write a successful result to the response cache."""
+        if not (self.response_cache and key and result.success) or result.cached:
+            return
+        self.response_cache.put(key, {
+            "output": result.output,
+            "stop_reason": result.stop_reason,
+            "model_used": result.model_used,
+            "tokens_in": result.tokens_in,
+            "tokens_out": result.tokens_out,
+            "cost": result.cost,
+        })
 
     async def _execute_single(
         self,
         task: AgentTask,
-        client: anthropic.AsyncAnthropic
+        client: anthropic.AsyncAnthropic,
+        lane: Optional[Lane] = None,
     ) -> AgentResult:
         """
         Execute a single agent task with retry logic.
 
-        Uses tenacity for exponential backoff on transient failures.
+        Uses tenacity for exponential backoff on transient failures, or the
+        server's retry-after hint when one is provided. Overload responses
+        and healthy successes are fed to the adaptive controller, if any.
+        Every attempt is admitted through the lane's rate limiter first;
+        unused tokens from the pre-flight estimate are refunded afterwards.
+        Successful responses are written to the response cache, if enabled.
+
+        With ``task.timeout_ms`` set, all attempts share one deadline: each
+        request gets the remaining time as its HTTP timeout, and the whole
+        call is cancelled when the deadline passes (``ResultStatus.TIMEOUT``).
         """
+        cache_key = self.cache_key(task) if self.response_cache else None
+        lane = lane or self.lane_for(task)
+        rate_limiter = lane.rate_limiter
+        controller = lane.controller
         start_time = time.monotonic()
+        estimated_tokens = task.estimate_tokens()
+        ttft: Dict[str, Optional[int]] = {"ms": None}
+        deadline = start_time + task.timeout_ms / 1000 if task.timeout_ms else None
+        tier = model_id_to_tier(task.model)
+        attempts = 0
+
+        async def backoff(seconds: float) -> None:
+            with self.tracer.span("backoff", "wait", seconds=round(seconds, 3)):
+                await asyncio.sleep(seconds)
+            self.tracer.increment("specify_backoff_seconds_total", seconds, tier=tier)
 
         @retry(
+            sleep=backoff,
             stop=stop_after_attempt(self.config.max_retries),
-            wait=wait_exponential(
-                multiplier=self.config.backoff_base,
-                max=self.config.backoff_max
+            wait=wait_retry_after(
+                wait_exponential(
+                    multiplier=self.config.backoff_base,
+                    max=self.config.backoff_max
+                )
             ),
-            retry=retry_if_exception_type((
-                anthropic.RateLimitError,
-                anthropic.APIConnectionError,
-                anthropic.InternalServerError,
-            )),
+            retry=retry_if_exception_type(TRANSIENT_ERRORS),
             reraise=True,
         )
         async def make_request() -> anthropic.types.Message:
-            messages = [{"role": "user", "content": task.prompt}]
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self.tracer.increment("specify_retries_total", tier=tier)
+            kwargs = self.build_request_kwargs(task)
 
-            kwargs: Dict[str, Any] = {
-                "model": task.model,
-                "max_tokens": task.max_tokens,
-                "messages": messages,
-            }
+            wait_start = self.tracer.now()
+            reserved = await rate_limiter.acquire(estimated_tokens)
+            self._trace_wait("rate_limit_wait", "specify_rate_limit_wait_seconds", wait_start, lane=lane.name)
+            attempt_start = time.monotonic()
+            if deadline is not None:
+                kwargs["timeout"] = max(deadline - attempt_start, 0.001)
+            with self.tracer.span("api_attempt", "api", attempt=attempts, model=task.model) as span:
+                try:
+                    if self.config.streaming:
+                        response, ttft["ms"] = await self._stream_request(
+                            task, client, kwargs, attempt_start
+                        )
+                    else:
+                        response = await client.messages.create(**kwargs)
+                except BaseException as e:
+                    # Rejected/failed/cancelled attempts did not consume token quota
+                    rate_limiter.settle(reserved, 0)
+                    if controller and isinstance(e, OVERLOAD_ERRORS):
+                        controller.on_overload(parse_retry_after(e))
+                    self._trace_attempt(span, tier, time.monotonic() - attempt_start, type(e).__name__)
+                    raise
+                rate_limiter.settle(reserved, usage_token_count(response.usage))
+                if controller:
+                    controller.on_success(
+                        (time.monotonic() - attempt_start) * 1000,
+                        response.usage.output_tokens,
+                    )
+                self._trace_attempt(
+                    span, tier, time.monotonic() - attempt_start, "success",
+                    response.usage.output_tokens, ttft["ms"] if self.config.streaming else None,
+                )
+            return response
 
-            if task.system_prompt:
-                kwargs["system"] = task.system_prompt
+        try:
+            if deadline is not None:
+                response = await asyncio.wait_for(make_request(), deadline - time.monotonic())
+            else:
+                response = await make_request()
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+            result = self._record_response(task, response, duration_ms)
+            result.ttft_ms = ttft["ms"]
+            self._latency_samples[result.model_tier].append(duration_ms)
+            self._store_cached(cache_key, result)
+            return result
 
-            if task.temperature is not None:
-                kwargs["temperature"] = task.temperature
+        except Exception as e:
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+            timed_out = isinstance(e, asyncio.TimeoutError) or (
+                isinstance(e, anthropic.APITimeoutError)
+                and deadline is not None and time.monotonic() >= deadline
+            )
+            if timed_out:
+                return self._failed_result(
+                    task, f"Timed out after {task.timeout_ms}ms", duration_ms,
+                    status=ResultStatus.TIMEOUT,
+                )
+            return self._failed_result(task, str(e), duration_ms)
 
-            return await client.messages.create(**kwargs)
+    async def _stream_request(
+        self,
+        task: AgentTask,
+        client: anthropic.AsyncAnthropic,
+        kwargs: Dict[str, Any],
+        attempt_start: float,
+    ) -> Tuple[Any, Optional[int]]:
+        """
+        Execute one attempt via ``messages.stream``.
 
-        try:
-            response = await make_request()
-            duration_ms = int((time.monotonic() - start_time) * 1000)
+        Fires chunk/first-token/partial-ready callbacks as text arrives and
+        stops reading (closing the HTTP stream) once ``task.stop_pattern``
+        matches.
+
+        Returns:
+            Tuple of (final message, or a message-shaped object built from
+            the stream snapshot when stopped early; time to first token in ms)
+        """
+        stop_re = re.compile(task.stop_pattern) if task.stop_pattern else None
+        ready_re = re.compile(task.partial_ready_pattern) if task.partial_ready_pattern else None
+        ttft_ms: Optional[int] = None
+        partial_announced = False
+        text = ""
 
-            # Extract text content
-            output = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    output += block.text
-
-            # Update statistics
-            self.total_requests += 1
-            self.total_tokens_in += response.usage.input_tokens
-            self.total_tokens_out += response.usage.output_tokens
-            self.total_duration_ms += duration_ms
-
-            # Update per-model statistics
-            tier = model_id_to_tier(task.model)
-            cost = calculate_cost(tier, response.usage.input_tokens, response.usage.output_tokens)
-            self.by_model[tier]["tokens_in"] += response.usage.input_tokens
-            self.by_model[tier]["tokens_out"] += response.usage.output_tokens
-            self.by_model[tier]["requests"] += 1
-            self.by_model[tier]["cost"] += cost
-
-            return AgentResult(
-                name=task.name,
-                output=output,
-                success=True,
-                duration_ms=duration_ms,
-                model_used=task.model,
-                model_tier=tier,
-                tokens_in=response.usage.input_tokens,
-                tokens_out=response.usage.output_tokens,
-                cost=cost,
-                stop_reason=response.stop_reason,
+        async with client.messages.stream(**kwargs) as stream:
+            async for chunk in stream.text_stream:
+                if ttft_ms is None:
+                    ttft_ms = int((time.monotonic() - attempt_start) * 1000)
+                    if self._on_first_token:
+                        self._on_first_token(task.name, ttft_ms)
+                text += chunk
+                if self._on_chunk:
+                    self._on_chunk(task.name, chunk)
+                if ready_re and not partial_announced and ready_re.search(text):
+                    partial_announced = True
+                    if self._on_partial_ready:
+                        self._on_partial_ready(task.name, text)
+                if stop_re and stop_re.search(text):
+                    break
+            else:
+                message = await stream.get_final_message()
+                self._record_stream_stats(ttft_ms, early_stop=False)
+                return message, ttft_ms
+
+            # Stopped early: input usage comes from the stream snapshot,
+            # output is estimated from the text received so far
+            snapshot_usage = getattr(stream.current_message_snapshot, "usage", None)
+            usage = SimpleNamespace(
+                input_tokens=getattr(snapshot_usage, "input_tokens", 0) or 0,
+                output_tokens=estimate_input_tokens(text),
+                cache_read_input_tokens=getattr(snapshot_usage, "cache_read_input_tokens", 0) or 0,
+                cache_creation_input_tokens=getattr(snapshot_usage, "cache_creation_input_tokens", 0) or 0,
             )
+            self._record_stream_stats(ttft_ms, early_stop=True)
+            message = SimpleNamespace(
+                content=[SimpleNamespace(type="text", text=text)],
+                usage=usage,
+                stop_reason="stop_pattern",
+            )
+            return message, ttft_ms
 
-        except Exception as e:
-            duration_ms = int((time.monotonic() - start_time) * 1000)
-            return AgentResult(
-                name=task.name,
-                output="",
-                success=False,
-                duration_ms=duration_ms,
-                model_used=task.model,
-                model_tier=model_id_to_tier(task.model),
-                tokens_in=0,
-                tokens_out=0,
-                cost=0.0,
-                error=str(e),
+    def _record_stream_stats(self, ttft_ms: Optional[int], early_stop: bool) -> None:
+        self.streamed_requests += 1
+        self.total_ttft_ms += ttft_ms or 0
+        if early_stop:
+            self.early_stops += 1
+
+    def _record_response(
+        self,
+        task: AgentTask,
+        response: Any,
+        duration_ms: int,
+        cost_multiplier: float = 1.0,
+    ) -> AgentResult:
+        """
+        Convert an API response into an AgentResult and update statistics.
+
+        Args:
+            task: Task that produced the response
+            response: ``anthropic.types.Message`` (or compatible object)
+            duration_ms: Wall time attributed to the task
+            cost_multiplier: Price adjustment (e.g. batch discount)
+        """
+        # Extract text content
+        output = ""
+        for block in response.content:
+            if hasattr(block, "text"):
+                output += block.text
+
+        usage = response.usage
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+
+        # Update statistics
+        self.total_requests += 1
+        self.total_tokens_in += usage.input_tokens
+        self.total_tokens_out += usage.output_tokens
+        self.total_duration_ms += duration_ms
+
+        # Update per-model statistics
+        tier = model_id_to_tier(task.model)
+        cost = cost_multiplier * calculate_cost(
+            tier, usage.input_tokens, usage.output_tokens,
+            cache_read_tokens=cache_read, cache_write_tokens=cache_write,
+        )
+        self.by_model[tier]["tokens_in"] += usage.input_tokens
+        self.by_model[tier]["tokens_out"] += usage.output_tokens
+        self.by_model[tier]["cache_read_tokens"] += cache_read
+        self.by_model[tier]["cache_write_tokens"] += cache_write
+        self.by_model[tier]["requests"] += 1
+        self.by_model[tier]["cost"] += cost
+
+        return AgentResult(
+            name=task.name,
+            output=output,
+            success=True,
+            duration_ms=duration_ms,
+            model_used=task.model,
+            model_tier=tier,
+            tokens_in=usage.input_tokens,
+            tokens_out=usage.output_tokens,
+            cost=cost,
+            stop_reason=response.stop_reason,
+            cache_read_tokens=cache_read,
+            cache_write_tokens=cache_write,
+        )
+
+    def _failed_result(
+        self,
+        task: AgentTask,
+        error: str,
+        duration_ms: int = 0,
+        status: ResultStatus = ResultStatus.FAILED,
+    ) -> AgentResult:
+        """Build a failed AgentResult for a task."""
+        return AgentResult(
+            name=task.name,
+            output="",
+            success=False,
+            duration_ms=duration_ms,
+            model_used=task.model,
+            model_tier=model_id_to_tier(task.model),
+            tokens_in=0,
+            tokens_out=0,
+            cost=0.0,
+            error=error,
+            status=status,
+        )
+
+    def _trace_wait(self, name: str, metric: str, start_s: float, **labels: Any) -> None:
+        """Record a wait that began at ``start_s`` (tracer clock) and ends now."""
+        end_s = self.tracer.now()
+        self.tracer.record_span(name, "wait", start_s, end_s, **labels)
+        self.tracer.observe(metric, end_s - start_s, **labels)
+
+    def _trace_attempt(
+        self,
+        span: Span,
+        tier: str,
+        seconds: float,
+        outcome: str,
+        tokens_out: int = 0,
+        ttft_ms: Optional[int] = None,
+    ) -> None:
+        """Annotate an API attempt span and update the attempt metrics."""
+        span.attributes["outcome"] = outcome
+        self.tracer.increment("specify_api_attempts_total", tier=tier, outcome=outcome)
+        self.tracer.observe("specify_api_attempt_seconds", seconds, tier=tier)
+        if ttft_ms is not None:
+            span.attributes["ttfb_ms"] = ttft_ms
+            self.tracer.observe("specify_ttfb_seconds", ttft_ms / 1000, tier=tier)
+        # Generation speed, after the first token when it is known
+        generating = seconds - (ttft_ms or 0) / 1000
+        if tokens_out and generating > 0:
+            span.attributes["tokens_per_s"] = round(tokens_out / generating, 1)
+            self.tracer.observe("specify_output_tokens_per_second", tokens_out / generating, tier=tier)
+
+    def _trace_result(self, span: Optional[Span], result: AgentResult) -> None:
+        """Annotate a task span with its result and update the task metrics."""
+        status = result.status.value
+        if span is not None:
+            span.attributes.update(
+                status=status, tier=result.model_tier, cached=result.cached,
+                tokens_in=result.tokens_in, tokens_out=result.tokens_out, cost=round(result.cost, 6),
             )
+            self.tracer.observe(
+                "specify_task_duration_seconds", self.tracer.now() - span.start_s, tier=result.model_tier,
+            )
+        self.tracer.increment("specify_tasks_total", status=status, tier=result.model_tier)
+        if result.tokens_in or result.tokens_out:
+            self.tracer.increment("specify_tokens_total", result.tokens_in, direction="in", tier=result.model_tier)
+            self.tracer.increment("specify_tokens_total", result.tokens_out, direction="out", tier=result.model_tier)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Return pool execution statistics with per-model breakdown."""
@@ -377,6 +1334,8 @@ class DistributedAgentPool:
             "total_tokens_in": self.total_tokens_in,
             "total_tokens_out": self.total_tokens_out,
             "total_tokens": self.total_tokens_in + self.total_tokens_out,
+            "total_cache_read_tokens": sum(m["cache_read_tokens"] for m in self.by_model.values()),
+            "total_cache_write_tokens": sum(m["cache_write_tokens"] for m in self.by_model.values()),
             "total_cost": total_cost,
             "total_duration_ms": self.total_duration_ms,
             "avg_duration_ms": (
@@ -385,12 +1344,60 @@ class DistributedAgentPool:
             ),
             "pool_size": self.pool_size,
             "completed_tasks": len(self.results),
+            "connections": {
+                "shared": self._http_client is not None,
+                "clients": len(self.clients),
+                "in_flight": self.in_flight,
+                **describe_http_client(self.connection_config),
+            },
+            "rate_limiter": self.rate_limiter.get_statistics(),
+            "streaming": {
+                "requests": self.streamed_requests,
+                "avg_ttft_ms": (
+                    self.total_ttft_ms / self.streamed_requests
+                    if self.streamed_requests > 0 else 0
+                ),
+                "early_stops": self.early_stops,
+            },
+            "lanes": {
+                lane.name: lane.get_statistics()
+                for lane in [self.default_lane, *self.lanes.values()]
+            },
+            "hedging": {
+                "enabled": self.config.hedging,
+                "launched": self.hedges_launched,
+                "won": self.hedges_won,
+                "skipped": self.hedges_skipped,
+                "extra_cost": self.hedge_cost,
+                "extra_tokens": self.hedge_tokens,
+                "delay_ms": {
+                    tier: self.hedge_delay_ms(tier) for tier in self._latency_samples
+                },
+            },
+            "budget": self.budget.get_statistics() if self.budget else {"enabled": False},
+            "response_cache": (
+                {
+                    **self.response_cache.get_statistics(),
+                    "cached_results": self.cached_results,
+                    "saved_cost": self.cache_saved_cost,
+                    "saved_tokens": self.cache_saved_tokens,
+                }
+                if self.response_cache
+                else {"enabled": False}
+            ),
+            "concurrency": (
+                self.concurrency_controller.get_statistics()
+                if self.concurrency_controller
+                else {"limit": self.semaphore.limit, "adaptive": False}
+            ),
             "by_model": {
                 tier: {
                     "requests": stats["requests"],
                     "tokens_in": stats["tokens_in"],
                     "tokens_out": stats["tokens_out"],
                     "tokens_total": stats["tokens_in"] + stats["tokens_out"],
+                    "cache_read_tokens": stats["cache_read_tokens"],
+                    "cache_write_tokens": stats["cache_write_tokens"],
                     "cost": stats["cost"],
                 }
                 for tier, stats in self.by_model.items()
@@ -398,8 +1405,24 @@ class DistributedAgentPool:
             },
         }
 
-    async def close(self) -> None:
-        """Close all clients and release resources."""
+    async def close(self, drain_timeout_s: float = 30.0) -> None:
+        """
+        Close all clients and release resources.
+
+        Waits up to ``drain_timeout_s`` for in-flight requests to finish
+        before closing connections, so that concurrent callers are not cut
+        off mid-response.
+        """
+        if self.in_flight:
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout=drain_timeout_s)
+            except asyncio.TimeoutError:
+                pass
         for client in self.clients:
             await client.close()
         self.clients.clear()
+        self._client_load.clear()
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        if self.response_cache:
+            self.response_cache.close()
@@ -30,6 +30,14 @@ Architecture:
     │                                                             │
     └─────────────────────────────────────────────────────────────┘
 
+Packing:
+    By default a level is cut into chunks of ``max_batch_size`` tasks.
+    With ``packing="tokens"`` levels are packed first-fit-decreasing by
+    the tasks' token estimates, within ``max_batch_tokens`` and each
+    tier's TPM limit. OnlineBatchAggregator forms batches during
+    execution from tasks as they become ready, closing a batch when it is
+    full or ``batch_timeout_ms`` after its first task arrived.
+
 Usage:
     aggregator = BatchAggregator(config)
     batches = aggregator.aggregate(waves)
@@ -39,11 +47,17 @@ Usage:
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Any, Callable, Dict, List, Set, Optional, Tuple
 from collections import defaultdict
 
-from .agent_pool import AgentTask
+from .agent_pool import AgentTask, model_id_to_tier
+from .dag import DependencyGraph
+
+
+# Supported BatchConfig.packing modes
+PACKING_MODES = ("count", "tokens")
 
 
 @dataclass
@@ -54,13 +68,47 @@ class BatchConfig:
     Attributes:
         enabled: Whether batch aggregation is enabled
         max_batch_size: Maximum number of tasks per batch
-        batch_timeout_ms: Time to wait for more requests before executing
+        batch_timeout_ms: Time an online batch waits for more ready tasks
+            after its first one before it is executed (OnlineBatchAggregator)
         cross_wave_batching: Whether to batch tasks across wave boundaries
+        packing: "count" (chunks of max_batch_size) or "tokens"
+            (first-fit-decreasing by estimated tokens)
+        max_batch_tokens: Token capacity of a batch in "tokens" mode
+            (0: ``tokens_per_minute * tpm_headroom``)
+        tokens_per_minute: Pool TPM limit the capacity is derived from
+        tier_tokens_per_minute: TPM limit per tier ("opus"/"sonnet"/"haiku");
+            a batch holds at most ``tpm_headroom`` of it for that tier
+        tpm_headroom: Fraction of a TPM limit one batch may use
     """
     enabled: bool = False
     max_batch_size: int = 10
     batch_timeout_ms: int = 100
     cross_wave_batching: bool = True
+    packing: str = "count"
+    max_batch_tokens: int = 0
+    tokens_per_minute: int = 0
+    tier_tokens_per_minute: Dict[str, int] = field(default_factory=dict)
+    tpm_headroom: float = 0.9
+
+    def __post_init__(self):
+        if self.packing not in PACKING_MODES:
+            raise ValueError(f"Unknown packing mode '{self.packing}' (expected one of {', '.join(PACKING_MODES)})")
+
+    @property
+    def token_capacity(self) -> Optional[int]:
+        """Token capacity of one batch, or None if batches are not token-limited."""
+        if self.packing != "tokens":
+            return None
+        if self.max_batch_tokens:
+            return self.max_batch_tokens
+        if self.tokens_per_minute:
+            return int(self.tokens_per_minute * self.tpm_headroom)
+        return None
+
+    def tier_capacity(self, tier: str) -> Optional[int]:
+        """Token capacity of one batch for a tier, or None if unlimited."""
+        limit = self.tier_tokens_per_minute.get(tier) if self.packing == "tokens" else None
+        return int(limit * self.tpm_headroom) if limit else None
 
 
 @dataclass
@@ -72,10 +120,22 @@ class BatchGroup:
         tasks: List of tasks in this batch
         wave_indices: Set of original wave indices these tasks came from
         dependency_level: Topological level (0 = no deps, higher = more deps)
+        estimated_tokens: Pre-flight token estimate of all tasks
+        tier_tokens: Pre-flight token estimate per model tier
     """
     tasks: List[AgentTask] = field(default_factory=list)
     wave_indices: Set[int] = field(default_factory=set)
     dependency_level: int = 0
+    estimated_tokens: int = 0
+    tier_tokens: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, task: AgentTask, wave_index: int, tokens: int) -> None:
+        """Add a task with its token estimate."""
+        tier = model_id_to_tier(task.model)
+        self.tasks.append(task)
+        self.wave_indices.add(wave_index)
+        self.estimated_tokens += tokens
+        self.tier_tokens[tier] = self.tier_tokens.get(tier, 0) + tokens
 
     def __len__(self) -> int:
         return len(self.tasks)
@@ -166,11 +226,9 @@ class BatchAggregator:
         batches = []
         for wave in waves:
             if wave.tasks:
-                batch = BatchGroup(
-                    tasks=list(wave.tasks),
-                    wave_indices={wave.index},
-                    dependency_level=wave.index,
-                )
+                batch = BatchGroup(dependency_level=wave.index)
+                for task in wave.tasks:
+                    batch.add(task, wave.index, task.estimate_tokens())
                 batches.append(batch)
         return batches
 
@@ -214,43 +272,11 @@ class BatchAggregator:
 
         Returns:
             Dict mapping task name to level
-        """
-        levels: Dict[str, int] = {}
-        remaining = set(deps_graph.keys())
-
-        current_level = 0
-        max_iterations = len(remaining) + 1  # Prevent infinite loop
-
-        while remaining and max_iterations > 0:
-            max_iterations -= 1
-
-            # Find tasks whose deps are all resolved (in levels dict)
-            ready = []
-            for task_name in remaining:
-                deps = deps_graph[task_name]
-                if all(dep in levels for dep in deps):
-                    ready.append(task_name)
-
-            if not ready:
-                # Circular dependency - shouldn't happen if waves are valid
-                # Assign remaining tasks to current level
-                for task_name in remaining:
-                    levels[task_name] = current_level
-                break
-
-            # Assign level to ready tasks
-            for task_name in ready:
-                if deps_graph[task_name]:
-                    # Level is max of dependency levels + 1
-                    dep_levels = [levels[d] for d in deps_graph[task_name]]
-                    levels[task_name] = max(dep_levels) + 1
-                else:
-                    levels[task_name] = 0
-                remaining.remove(task_name)
 
-            current_level += 1
-
-        return levels
+        Raises:
+            CycleError: If the dependencies contain a cycle
+        """
+        return DependencyGraph(deps_graph).levels()
 
     def _group_by_levels(
         self,
@@ -261,7 +287,8 @@ class BatchAggregator:
         Group tasks by topological level into batches.
 
         Tasks at the same level are independent and can run in parallel.
-        Respects max_batch_size by splitting large levels into multiple batches.
+        Respects max_batch_size by splitting large levels into multiple batches,
+        and in "tokens" mode the token capacities as well (see ``_pack_level``).
 
         Args:
             task_map: Map of task name to (task, wave_index)
@@ -276,7 +303,6 @@ class BatchAggregator:
             task, wave_idx = task_map[task_name]
             level_groups[level].append((task, wave_idx))
 
-        # Convert to batches, splitting by max_batch_size
         batches: List[BatchGroup] = []
         for level in sorted(level_groups.keys()):
             tasks_at_level = level_groups[level]
@@ -284,18 +310,66 @@ class BatchAggregator:
             # Sort by priority within level
             tasks_at_level.sort(key=lambda x: x[0].priority)
 
-            # Split into batches of max_batch_size
-            for i in range(0, len(tasks_at_level), self.config.max_batch_size):
-                chunk = tasks_at_level[i:i + self.config.max_batch_size]
-                batch = BatchGroup(
-                    tasks=[t for t, _ in chunk],
-                    wave_indices={w for _, w in chunk},
-                    dependency_level=level,
-                )
-                batches.append(batch)
+            if self.config.packing == "count":
+                # Split into batches of max_batch_size
+                for i in range(0, len(tasks_at_level), self.config.max_batch_size):
+                    batch = BatchGroup(dependency_level=level)
+                    for task, wave_idx in tasks_at_level[i:i + self.config.max_batch_size]:
+                        batch.add(task, wave_idx, task.estimate_tokens())
+                    batches.append(batch)
+            else:
+                batches.extend(self._pack_level(tasks_at_level, level))
 
         return batches
 
+    def _pack_level(
+        self,
+        tasks_at_level: List[Tuple[AgentTask, int]],
+        level: int,
+    ) -> List[BatchGroup]:
+        """
+        Pack one level first-fit-decreasing by estimated tokens.
+
+        Tasks are placed largest first into the first batch with room in
+        task count, total tokens and the task's tier; a task larger than
+        the capacity on its own gets a batch to itself. Batches are
+        returned in order of their most urgent task.
+
+        Args:
+            tasks_at_level: (task, wave_index) pairs, sorted by priority
+            level: Topological level of the tasks
+
+        Returns:
+            List of BatchGroup objects for the level
+        """
+        capacity = self.config.token_capacity
+        sized = [(task, wave_idx, task.estimate_tokens()) for task, wave_idx in tasks_at_level]
+        # Stable sort keeps priority order among equally sized tasks
+        sized.sort(key=lambda x: -x[2])
+
+        bins: List[BatchGroup] = []
+        for task, wave_idx, tokens in sized:
+            tier = model_id_to_tier(task.model)
+            tier_capacity = self.config.tier_capacity(tier)
+            for batch in bins:
+                if len(batch) >= self.config.max_batch_size:
+                    continue
+                if capacity is not None and batch.estimated_tokens + tokens > capacity:
+                    continue
+                if tier_capacity is not None and batch.tier_tokens.get(tier, 0) + tokens > tier_capacity:
+                    continue
+                batch.add(task, wave_idx, tokens)
+                break
+            else:
+                batch = BatchGroup(dependency_level=level)
+                batch.add(task, wave_idx, tokens)
+                bins.append(batch)
+
+        for batch in bins:
+            batch.tasks.sort(key=lambda t: t.priority)
+        bins.sort(key=lambda b: b.tasks[0].priority)
+        return bins
+
     def can_batch_together(
         self,
         task_a: AgentTask,
@@ -332,12 +406,30 @@ class BatchAggregator:
             batches: Aggregated batches
 
         Returns:
-            Dict with aggregation statistics
+            Dict with aggregation statistics. ``packing_efficiency`` is the
+            fill of the binding capacity (tokens in "tokens" mode, task
+            slots otherwise) averaged over batches; ``batch_lower_bound``
+            is the fewest batches any packing could reach
         """
         original_boundaries = len(waves)
         new_boundaries = len(batches)
         total_tasks = sum(len(b.tasks) for b in batches)
 
+        # Fill of the binding capacity: tokens when token-limited, else task slots
+        capacity = self.config.token_capacity
+        total_tokens = sum(b.estimated_tokens for b in batches)
+        if capacity:
+            used, available = total_tokens, capacity * new_boundaries
+            lower_bound = sum(
+                max(-(-tokens // capacity), -(-count // self.config.max_batch_size))
+                for tokens, count in self._level_totals(batches)
+            )
+        else:
+            used, available = total_tasks, self.config.max_batch_size * new_boundaries
+            lower_bound = sum(
+                -(-count // self.config.max_batch_size) for _, count in self._level_totals(batches)
+            )
+
         # Calculate theoretical latency reduction
         if original_boundaries > 0:
             reduction_pct = (1 - new_boundaries / original_boundaries) * 100
@@ -356,6 +448,142 @@ class BatchAggregator:
                 1 for b in batches if len(b.wave_indices) > 1
                 for _ in b.tasks
             ),
+            "packing": self.config.packing,
+            "batch_token_capacity": capacity,
+            "total_estimated_tokens": total_tokens,
+            "max_batch_tokens": max((b.estimated_tokens for b in batches), default=0),
+            "oversized_batches": sum(
+                1 for b in batches if capacity and b.estimated_tokens > capacity
+            ),
+            "packing_efficiency": round(min(1.0, used / available), 3) if available else 0.0,
+            "batch_lower_bound": lower_bound,
+        }
+
+    @staticmethod
+    def _level_totals(batches: List[BatchGroup]) -> List[Tuple[int, int]]:
+        """(estimated tokens, task count) per dependency level."""
+        totals: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        for batch in batches:
+            totals[batch.dependency_level][0] += batch.estimated_tokens
+            totals[batch.dependency_level][1] += len(batch)
+        return [tuple(t) for t in totals.values()]
+
+
+class OnlineBatchAggregator:
+    """
+    Forms batches from tasks as they become ready during execution.
+
+    Tasks are added one at a time; the open batch is closed and returned
+    as soon as it is full, and ``poll`` closes it once ``batch_timeout_ms``
+    has passed since its first task arrived. The caller decides when
+    waiting is pointless (e.g. nothing in flight can make more tasks
+    ready) and calls ``flush``.
+
+    Example:
+        ```python
+        aggregator = OnlineBatchAggregator(BatchConfig(max_batch_size=4, batch_timeout_ms=50))
+        for batch in aggregator.add(task):
+            dispatch(batch)
+        ...
+        batch = aggregator.poll()  # after aggregator.time_until_due() seconds
+        ```
+    """
+
+    def __init__(
+        self,
+        config: Optional[BatchConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the aggregator.
+
+        Args:
+            config: Batch size, token capacities and timeout
+            clock: Monotonic clock in seconds
+        """
+        self.config = config or BatchConfig()
+        self.clock = clock
+        self._open: Optional[BatchGroup] = None
+        self._opened_at = 0.0
+
+        # Statistics
+        self.batches = 0
+        self.tasks = 0
+        self.flushes: Dict[str, int] = {"size": 0, "tokens": 0, "timeout": 0, "idle": 0}
+        self.fill_wait_s = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Tasks in the open batch."""
+        return len(self._open) if self._open is not None else 0
+
+    def add(self, task: AgentTask, wave_index: int = 0) -> List[BatchGroup]:
+        """
+        Add a ready task to the open batch.
+
+        Args:
+            task: Task whose dependencies are satisfied
+            wave_index: Wave the task was planned in
+
+        Returns:
+            Batches closed by this task (empty, or one or two when the task
+            did not fit the open batch's token capacity and filled the next)
+        """
+        tokens = task.estimate_tokens()
+        closed: List[BatchGroup] = []
+        if self._open is not None and not self._fits(task, tokens):
+            closed.append(self._close("tokens"))
+        if self._open is None:
+            self._open = BatchGroup(dependency_level=self.batches)
+            self._opened_at = self.clock()
+        self._open.add(task, wave_index, tokens)
+        self.tasks += 1
+        if len(self._open) >= self.config.max_batch_size:
+            closed.append(self._close("size"))
+        return closed
+
+    def _fits(self, task: AgentTask, tokens: int) -> bool:
+        """Whether a task fits the open batch's token capacities."""
+        capacity = self.config.token_capacity
+        if capacity is not None and self._open.estimated_tokens + tokens > capacity:
+            return False
+        tier = model_id_to_tier(task.model)
+        tier_capacity = self.config.tier_capacity(tier)
+        return tier_capacity is None or self._open.tier_tokens.get(tier, 0) + tokens <= tier_capacity
+
+    def time_until_due(self) -> Optional[float]:
+        """Seconds until the open batch times out (None if no batch is open)."""
+        if self._open is None:
+            return None
+        deadline = self._opened_at + self.config.batch_timeout_ms / 1000
+        return max(0.0, deadline - self.clock())
+
+    def poll(self) -> Optional[BatchGroup]:
+        """Close the open batch if its timeout has passed."""
+        if self._open is not None and self.time_until_due() == 0.0:
+            return self._close("timeout")
+        return None
+
+    def flush(self) -> Optional[BatchGroup]:
+        """Close the open batch now, if there is one."""
+        return self._close("idle") if self._open is not None else None
+
+    def _close(self, reason: str) -> BatchGroup:
+        batch, self._open = self._open, None
+        self.batches += 1
+        self.flushes[reason] += 1
+        self.fill_wait_s += self.clock() - self._opened_at
+        return batch
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return batch counts, flush reasons and the mean time batches stayed open."""
+        return {
+            "packing": self.config.packing,
+            "aggregated_batches": self.batches,
+            "total_tasks": self.tasks,
+            "avg_batch_size": self.tasks / self.batches if self.batches else 0,
+            "flushes": dict(self.flushes),
+            "avg_fill_wait_ms": round(self.fill_wait_s * 1000 / self.batches, 1) if self.batches else 0.0,
         }
 
 
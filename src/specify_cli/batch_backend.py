@@ -0,0 +1,208 @@
+"""
+Message Batches API execution backend.
+
+Submits a group of independent tasks as one Message Batches job (billed
+at 50% of the standard price), polls it with exponential backoff and maps
+each result back to an AgentResult by ``custom_id``. Suited to overnight
+or CI runs where throughput and cost matter more than latency.
+
+Usage:
+    backend = BatchBackend(pool)
+    results = await backend.execute(batch.tasks)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .agent_pool import AgentResult, AgentTask, ResultStatus
+
+if TYPE_CHECKING:
+    from .agent_pool import DistributedAgentPool
+
+
+# Message Batches are billed at 50% of standard API prices
+BATCH_COST_MULTIPLIER = 0.5
+
+# Result status of non-succeeded batch entries
+_OUTCOME_STATUS = {
+    "expired": ResultStatus.TIMEOUT,
+    "canceled": ResultStatus.CANCELLED,
+}
+
+
+@dataclass
+class BatchBackendConfig:
+    """
+    Configuration for Message Batches execution.
+
+    Attributes:
+        poll_interval_s: Initial delay between status polls
+        poll_max_interval_s: Upper bound for the poll delay
+        poll_backoff: Multiplier applied to the delay after each poll
+        max_wait_s: Give up (and cancel the batch) after this long
+    """
+    poll_interval_s: float = 5.0
+    poll_max_interval_s: float = 60.0
+    poll_backoff: float = 1.5
+    max_wait_s: float = 24 * 3600
+
+
+def _describe_error(result: Any) -> str:
+    """Render the error of an errored/canceled/expired batch result."""
+    error = getattr(result, "error", None)
+    inner = getattr(error, "error", error)
+    message = getattr(inner, "message", None)
+    error_type = getattr(inner, "type", None) or getattr(result, "type", "error")
+    return f"{error_type}: {message}" if message else str(error_type)
+
+
+class BatchBackend:
+    """
+    Executes agent tasks through the Message Batches API.
+
+    Requests are built with the pool's ``build_request_kwargs`` so prompt
+    caching and every other request option behave exactly as in the
+    per-request path; usage and cost are recorded in the pool's statistics
+    with the batch discount applied.
+
+    Example:
+        ```python
+        pool = DistributedAgentPool(pool_size=4)
+        backend = BatchBackend(pool, BatchBackendConfig(poll_interval_s=10))
+        results = await backend.execute(tasks)
+        ```
+    """
+
+    def __init__(
+        self,
+        pool: "DistributedAgentPool",
+        config: Optional[BatchBackendConfig] = None,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            pool: Agent pool providing clients, request building and statistics
+            config: Optional polling configuration
+        """
+        self.pool = pool
+        self.config = config or BatchBackendConfig()
+        self.batches_submitted = 0
+        self.last_batch_id: Optional[str] = None
+
+    @staticmethod
+    def custom_id_for(index: int) -> str:
+        """
+        Return the custom_id for the task at ``index``.
+
+        Task names may contain characters that custom_id does not allow
+        (``^[a-zA-Z0-9_-]{1,64}$``), so ids are positional.
+        """
+        return f"task-{index:05d}"
+
+    async def execute(self, tasks: List[AgentTask]) -> Dict[str, AgentResult]:
+        """
+        Submit tasks as one Message Batch and wait for all results.
+
+        Args:
+            tasks: Independent tasks to execute
+
+        Returns:
+            Dictionary mapping task names to their results
+        """
+        if not tasks:
+            return {}
+
+        start_time = time.monotonic()
+        by_custom_id = {self.custom_id_for(i): task for i, task in enumerate(tasks)}
+        client = self.pool.clients[0]
+
+        try:
+            batch = await client.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": self.pool.build_request_kwargs(task)}
+                    for custom_id, task in by_custom_id.items()
+                ]
+            )
+        except Exception as e:
+            return {
+                task.name: self.pool._failed_result(task, f"Batch submission failed: {e}")
+                for task in tasks
+            }
+
+        self.batches_submitted += 1
+        self.last_batch_id = batch.id
+
+        batch = await self._wait_until_ended(client, batch, start_time)
+        if batch.processing_status != "ended":
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+            return {
+                task.name: self.pool._failed_result(
+                    task, f"Batch {batch.id} did not finish within {self.config.max_wait_s}s",
+                    duration_ms, status=ResultStatus.TIMEOUT,
+                )
+                for task in tasks
+            }
+
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+        results: Dict[str, AgentResult] = {}
+
+        entries = await client.messages.batches.results(batch.id)
+        async for entry in entries:
+            task = by_custom_id.get(entry.custom_id)
+            if task is None:
+                continue
+            outcome = entry.result
+            if outcome.type == "succeeded":
+                results[task.name] = self.pool._record_response(
+                    task, outcome.message, duration_ms,
+                    cost_multiplier=BATCH_COST_MULTIPLIER,
+                )
+            else:
+                results[task.name] = self.pool._failed_result(
+                    task, _describe_error(outcome), duration_ms,
+                    status=_OUTCOME_STATUS.get(outcome.type, ResultStatus.FAILED),
+                )
+
+        for task in tasks:
+            if task.name not in results:
+                results[task.name] = self.pool._failed_result(
+                    task, f"No result returned for task in batch {batch.id}", duration_ms
+                )
+
+        return results
+
+    async def _wait_until_ended(self, client: Any, batch: Any, start_time: float) -> Any:
+        """
+        Poll the batch with exponential backoff until it ends or times out.
+
+        The remote batch is cancelled on timeout and when the caller is
+        cancelled while waiting (fail-fast, deadline, Ctrl-C), so it does
+        not keep running and billing on the server.
+        """
+        interval = self.config.poll_interval_s
+        batch_id = batch.id
+        try:
+            while batch.processing_status != "ended":
+                elapsed = time.monotonic() - start_time
+                if elapsed >= self.config.max_wait_s:
+                    try:
+                        batch = await client.messages.batches.cancel(batch_id)
+                    except Exception:
+                        pass
+                    return batch
+
+                await asyncio.sleep(min(interval, self.config.max_wait_s - elapsed))
+                interval = min(interval * self.config.poll_backoff, self.config.poll_max_interval_s)
+                batch = await client.messages.batches.retrieve(batch_id)
+        except asyncio.CancelledError:
+            try:
+                await asyncio.shield(client.messages.batches.cancel(batch_id))
+            except (Exception, asyncio.CancelledError):
+                pass
+            raise
+        return batch
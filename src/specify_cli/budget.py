@@ -0,0 +1,300 @@
+"""
+Cost and token budget governor for the agent pool.
+
+Estimates the worst-case cost of each task before dispatch, reserves it
+against the run's budget and settles the reservation with the real cost
+once the result is known. Tasks are downgraded to a cheaper tier when the
+budget runs low, and queued or refused when they cannot fit.
+
+Usage:
+    governor = BudgetGovernor(max_cost=2.50)
+    reservation = await governor.reserve(task)
+    result = await run(reservation.task)
+    governor.settle(reservation, result)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .agent_pool import (
+    AgentResult,
+    AgentTask,
+    ResultStatus,
+    calculate_cost,
+    estimate_input_tokens,
+    model_id_to_tier,
+)
+
+# Tiers from most to least expensive
+TIER_ORDER: Tuple[str, ...] = ("opus", "sonnet", "haiku")
+
+
+class BudgetExceededError(Exception):
+    """Raised when a task cannot be admitted without crossing the budget."""
+
+
+@dataclass
+class BudgetReservation:
+    """
+    Budget held for one dispatched task.
+
+    Attributes:
+        task: Task to execute (a downgraded copy if the tier was lowered)
+        cost: Reserved worst-case cost in USD
+        tokens: Reserved worst-case tokens
+        downgraded_from: Original model if the tier was lowered
+        input_cost: Estimated cost of the request's input alone
+        input_tokens: Estimated input tokens
+    """
+    task: AgentTask
+    cost: float
+    tokens: int
+    downgraded_from: Optional[str] = None
+    input_cost: float = 0.0
+    input_tokens: int = 0
+
+
+class BudgetGovernor:
+    """
+    Pre-flight budget admission with tier downgrades.
+
+    Reservation is atomic with respect to other coroutines: the fit check
+    and the booking happen without an intervening ``await``.
+
+    When the remaining budget drops below ``downgrade_below`` of the limit,
+    tasks are moved one tier down (opus → sonnet → haiku) through
+    ``template_parser.resolve_model``. A task that does not fit even at a
+    lower tier waits while other reservations are in flight (their settled
+    cost is usually far below the worst case) and is refused otherwise.
+    """
+
+    def __init__(
+        self,
+        max_cost: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        downgrade_below: float = 0.2,
+        prompt_caching: bool = False,
+    ):
+        """
+        Initialize the governor.
+
+        Args:
+            max_cost: Spend limit for the run in USD (None for no limit)
+            max_tokens: Token limit for the run (None for no limit)
+            downgrade_below: Fraction of the limit below which tiers are lowered
+            prompt_caching: Requests carry cache_control breakpoints, so the
+                shared prefix and system prompt may be billed at the
+                cache-write rate
+        """
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.downgrade_below = downgrade_below
+        self.prompt_caching = prompt_caching
+
+        self.spent_cost = 0.0
+        self.spent_tokens = 0
+        self.reserved_cost = 0.0
+        self.reserved_tokens = 0
+        self.in_flight = 0
+        self._waiters: List[asyncio.Future] = []
+
+        # Statistics
+        self.admitted = 0
+        self.downgraded = 0
+        self.queued = 0
+        self.refused = 0
+
+    @property
+    def remaining_cost(self) -> float:
+        """Budget not yet spent or reserved (inf without a cost limit)."""
+        if self.max_cost is None:
+            return float("inf")
+        return self.max_cost - self.spent_cost - self.reserved_cost
+
+    @property
+    def remaining_tokens(self) -> float:
+        """Tokens not yet spent or reserved (inf without a token limit)."""
+        if self.max_tokens is None:
+            return float("inf")
+        return self.max_tokens - self.spent_tokens - self.reserved_tokens
+
+    def estimate(
+        self,
+        task: AgentTask,
+        model: Optional[str] = None,
+        cost_multiplier: float = 1.0,
+    ) -> Tuple[int, float]:
+        """
+        Worst-case (tokens, cost) of a task on ``model`` (default: the task's model).
+
+        Input is estimated from the prompt, shared prefix and system prompt;
+        output is the full ``max_tokens`` allowance. With prompt caching the
+        prefix and system prompt are priced at the cache-write rate, which
+        the first request per prefix pays. ``cost_multiplier`` applies price
+        adjustments such as the batch discount.
+        """
+        tokens_in, cached = self._input_tokens(task)
+        tier = model_id_to_tier(model or task.model)
+        cost = cost_multiplier * calculate_cost(
+            tier, tokens_in - cached, task.max_tokens, cache_write_tokens=cached
+        )
+        return tokens_in + task.max_tokens, cost
+
+    def _input_tokens(self, task: AgentTask) -> Tuple[int, int]:
+        """Estimated (input tokens, of which billed as cache writes) of a task."""
+        tokens_in = estimate_input_tokens(task.full_prompt) + estimate_input_tokens(task.system_prompt or "")
+        cached = 0
+        if self.prompt_caching:
+            cached = estimate_input_tokens(task.prompt_prefix or "") + estimate_input_tokens(task.system_prompt or "")
+        return tokens_in, min(cached, tokens_in)
+
+    def _is_low(self) -> bool:
+        if self.max_cost and self.remaining_cost < self.downgrade_below * self.max_cost:
+            return True
+        if self.max_tokens and self.remaining_tokens < self.downgrade_below * self.max_tokens:
+            return True
+        return False
+
+    def _candidate_models(self, model: str) -> List[str]:
+        """The task's model followed by each cheaper tier."""
+        # Import here to avoid circular import (template_parser imports agent_pool)
+        from .template_parser import resolve_model
+
+        tier = model_id_to_tier(model)
+        start = TIER_ORDER.index(tier) if tier in TIER_ORDER else len(TIER_ORDER)
+        return [model] + [
+            resolve_model(None, model, max_model=lower) for lower in TIER_ORDER[start + 1:]
+        ]
+
+    def _plan(self, task: AgentTask, cost_multiplier: float) -> Optional[Tuple[str, int, float]]:
+        """Pick the model to run and its estimate, or None if nothing fits."""
+        candidates = self._candidate_models(task.model)
+        if self._is_low() and len(candidates) > 1:
+            candidates = candidates[1:]
+        for model in candidates:
+            tokens, cost = self.estimate(task, model, cost_multiplier)
+            if tokens <= self.remaining_tokens and cost <= self.remaining_cost:
+                return model, tokens, cost
+        return None
+
+    def try_reserve(
+        self,
+        task: AgentTask,
+        cost_multiplier: float = 1.0,
+        count_refusal: bool = False,
+    ) -> Optional[BudgetReservation]:
+        """
+        Reserve budget for a task without waiting; None if it does not fit.
+
+        Callers that give up on a task instead of waiting pass
+        ``count_refusal=True`` so the miss is counted as a refusal.
+        """
+        plan = self._plan(task, cost_multiplier)
+        if plan is None:
+            if count_refusal:
+                self.refused += 1
+            return None
+
+        model, tokens, cost = plan
+        downgraded_from = None
+        if model != task.model:
+            downgraded_from = task.model
+            task = dataclasses.replace(
+                task, model=model, metadata={**task.metadata, "downgraded_from": downgraded_from}
+            )
+            self.downgraded += 1
+
+        input_tokens, cached = self._input_tokens(task)
+        input_cost = cost_multiplier * calculate_cost(
+            model_id_to_tier(model), input_tokens - cached, 0, cache_write_tokens=cached
+        )
+        self.reserved_cost += cost
+        self.reserved_tokens += tokens
+        self.in_flight += 1
+        self.admitted += 1
+        return BudgetReservation(
+            task=task, cost=cost, tokens=tokens, downgraded_from=downgraded_from,
+            input_cost=input_cost, input_tokens=input_tokens,
+        )
+
+    async def reserve(self, task: AgentTask) -> BudgetReservation:
+        """
+        Reserve budget for a task, waiting for in-flight work if necessary.
+
+        Raises:
+            BudgetExceededError: If the task cannot fit and nothing in flight
+                could free budget
+        """
+        waited = False
+        while True:
+            reservation = self.try_reserve(task)
+            if reservation is not None:
+                return reservation
+            if self.in_flight == 0:
+                self.refused += 1
+                tokens, cost = self.estimate(task)
+                raise BudgetExceededError(
+                    f"Budget exceeded: task '{task.name}' needs up to ${cost:.4f} / "
+                    f"{tokens:,} tokens, remaining ${max(self.remaining_cost, 0):.4f} / "
+                    f"{max(self.remaining_tokens, 0):,.0f} tokens"
+                )
+            if not waited:
+                self.queued += 1
+                waited = True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+    def settle(self, reservation: BudgetReservation, result: Optional[AgentResult]) -> None:
+        """
+        Release a reservation and book the actual spend.
+
+        A task that raised (e.g. was cancelled) or timed out without
+        reported usage may still have been billed for its input, so the
+        input estimate is booked for it.
+
+        Args:
+            reservation: Reservation returned by ``reserve``/``try_reserve``
+            result: Result of the task, or None if it raised
+        """
+        self.reserved_cost -= reservation.cost
+        self.reserved_tokens -= reservation.tokens
+        self.in_flight -= 1
+        if result is None or (result.status == ResultStatus.TIMEOUT and not result.tokens_in):
+            self.spent_cost += reservation.input_cost
+            self.spent_tokens += reservation.input_tokens
+        else:
+            self.charge(result)
+
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def charge(self, result: AgentResult) -> None:
+        """Book spend that had no reservation (e.g. an unused hedged duplicate)."""
+        self.spent_cost += result.cost
+        self.spent_tokens += (
+            result.tokens_in + result.tokens_out
+            + result.cache_read_tokens + result.cache_write_tokens
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return budget state for get_statistics()."""
+        return {
+            "enabled": True,
+            "max_cost": self.max_cost,
+            "max_tokens": self.max_tokens,
+            "spent_cost": self.spent_cost,
+            "spent_tokens": self.spent_tokens,
+            "reserved_cost": self.reserved_cost,
+            "reserved_tokens": self.reserved_tokens,
+            "admitted": self.admitted,
+            "downgraded": self.downgraded,
+            "queued": self.queued,
+            "refused": self.refused,
+        }
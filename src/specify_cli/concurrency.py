@@ -0,0 +1,249 @@
+"""
+Adaptive concurrency control for the agent pool.
+
+Provides a limiter whose limit can change at runtime and an AIMD
+(additive increase / multiplicative decrease) controller that grows the
+limit on healthy responses and cuts it on 429/529 overload errors.
+
+Usage:
+    limiter = ConcurrencyLimiter(4)
+    controller = AdaptiveConcurrencyController(limiter, min_limit=1, max_limit=32)
+    async with limiter:
+        ...
+        controller.on_success(latency_ms, tokens_out)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class ConcurrencyLimiter:
+    """
+    Semaphore-like limiter with a mutable limit.
+
+    Lowering the limit never interrupts work already admitted; it only
+    delays new admissions until enough slots are released. Waiters are
+    granted in ascending ``priority`` order, FIFO among equal priorities.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Initial number of concurrent slots (>= 1)
+        """
+        self._limit = max(1, int(limit))
+        self.in_use = 0
+        self._waiters: List[Tuple[Any, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return self._limit
+
+    @limit.setter
+    def limit(self, value: int) -> None:
+        self._limit = max(1, int(value))
+        self._wake()
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers waiting for a slot."""
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self._limit:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self.in_use += 1
+            fut.set_result(None)
+
+    async def acquire(self, priority: Any = 0) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: Sort key among waiters (lower is served first); any
+                mutually comparable value, e.g. an int or a tuple
+        """
+        if self.in_use < self._limit and not self.waiting:
+            self.in_use += 1
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot was granted just before cancellation; give it back
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a previously acquired slot."""
+        self.in_use = max(0, self.in_use - 1)
+        self._wake()
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+def parse_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Extract the server-requested delay from an API error, in seconds.
+
+    Understands ``retry-after-ms``, numeric ``retry-after`` and the HTTP-date
+    form of ``retry-after``. Returns None when the error carries no hint.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD controller that adjusts a ConcurrencyLimiter from request feedback.
+
+    Growth only happens on *healthy* successes: the per-output-token latency
+    of the request must stay within ``latency_tolerance`` times the best
+    smoothed latency seen so far. This stops the pool from piling on more
+    concurrency once the API starts queueing requests server-side.
+
+    Decreases are applied at most once per ``cooldown_s`` so that a burst of
+    simultaneous 429s collapses the limit once, not N times.
+    """
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            limiter: Limiter whose limit is adjusted
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            decrease_factor: Multiplier applied on overload (0.0-1.0)
+            latency_tolerance: Allowed latency inflation over the baseline
+            cooldown_s: Minimum time between two decreases
+            clock: Monotonic clock, injectable for tests
+        """
+        self.limiter = limiter
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown_s = cooldown_s
+        self._clock = clock
+
+        # Fractional limit so additive increase can accumulate below 1 slot
+        self._window = float(min(max(limiter.limit, self.min_limit), self.max_limit))
+        self.limiter.limit = int(self._window)
+
+        self._ewma_ms_per_token: Optional[float] = None
+        self._baseline_ms_per_token: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._backoff_until = 0.0
+
+        # Statistics
+        self.increases = 0
+        self.decreases = 0
+        self.overloads = 0
+        self.peak_limit = self.limiter.limit
+
+    def _is_healthy(self, latency_ms: float, tokens_out: int) -> bool:
+        sample = latency_ms / max(tokens_out, 1)
+        if self._ewma_ms_per_token is None:
+            self._ewma_ms_per_token = sample
+        else:
+            self._ewma_ms_per_token = 0.8 * self._ewma_ms_per_token + 0.2 * sample
+        if self._baseline_ms_per_token is None:
+            self._baseline_ms_per_token = self._ewma_ms_per_token
+        else:
+            self._baseline_ms_per_token = min(self._baseline_ms_per_token, self._ewma_ms_per_token)
+        return sample <= self._baseline_ms_per_token * self.latency_tolerance
+
+    def on_success(self, latency_ms: float, tokens_out: int = 0) -> None:
+        """Record a successful request; grow the limit if latency is healthy."""
+        if not self._is_healthy(latency_ms, tokens_out):
+            return
+        if self._clock() < self._backoff_until:
+            return
+        previous = self.limiter.limit
+        self._window = min(float(self.max_limit), self._window + 1.0 / self._window)
+        if int(self._window) != previous:
+            self.limiter.limit = int(self._window)
+            self.increases += 1
+            self.peak_limit = max(self.peak_limit, self.limiter.limit)
+
+    def on_overload(self, retry_after: Optional[float] = None) -> None:
+        """Record a 429/529 response; shrink the limit multiplicatively."""
+        self.overloads += 1
+        now = self._clock()
+        if retry_after:
+            self._backoff_until = max(self._backoff_until, now + retry_after)
+        if now - self._last_decrease < self.cooldown_s:
+            return
+        self._last_decrease = now
+        self._window = max(float(self.min_limit), self._window * self.decrease_factor)
+        self.limiter.limit = int(self._window)
+        self.decreases += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return controller state for get_statistics()."""
+        return {
+            "limit": self.limiter.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "peak_limit": self.peak_limit,
+            "in_use": self.limiter.in_use,
+            "waiting": self.limiter.waiting,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "overloads": self.overloads,
+        }
@@ -0,0 +1,97 @@
+"""
+Shared HTTP connection pool for the agent pool.
+
+Builds a single tuned async HTTP client shared by every pool slot, so
+slots reuse keep-alive connections instead of opening their own, and
+requests are multiplexed over HTTP/2 when the optional ``h2`` package is
+installed.
+
+Usage:
+    http_client = build_http_client(ConnectionPoolConfig(http2=True))
+    client = anthropic.AsyncAnthropic(http_client=http_client)
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Dict
+
+import anthropic
+
+
+@dataclass
+class ConnectionPoolConfig:
+    """
+    Configuration for the shared HTTP client.
+
+    Attributes:
+        http2: Multiplex requests over HTTP/2 (requires the ``h2`` package;
+            falls back to HTTP/1.1 when it is missing)
+        max_connections: Maximum open connections
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry_s: Idle time before a kept-alive connection is closed
+    """
+    http2: bool = True
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry_s: float = 30.0
+
+
+def http2_available() -> bool:
+    """Return True if the optional ``h2`` package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def sdk_httpx_module() -> ModuleType:
+    """
+    Return the httpx module the installed Anthropic SDK is built on.
+
+    The SDK only accepts clients from its own httpx distribution (``httpx``,
+    or ``httpx2`` in newer releases), so limits and clients must be created
+    from the same module.
+    """
+    for base in anthropic.DefaultAsyncHttpxClient.__mro__:
+        if base.__name__ == "AsyncClient":
+            return importlib.import_module(base.__module__.split(".")[0])
+    import httpx
+    return httpx
+
+
+def build_http_client(config: ConnectionPoolConfig) -> Any:
+    """
+    Build the shared async HTTP client.
+
+    Uses ``anthropic.DefaultAsyncHttpxClient`` so the SDK's defaults
+    (timeouts, TCP keep-alive socket options, proxy handling) still apply;
+    only the connection limits and protocol are overridden.
+
+    Args:
+        config: Connection pool configuration
+
+    Returns:
+        An async HTTP client suitable for ``AsyncAnthropic(http_client=...)``
+    """
+    httpx_module = sdk_httpx_module()
+    limits = httpx_module.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry_s,
+    )
+    return anthropic.DefaultAsyncHttpxClient(
+        limits=limits,
+        http2=config.http2 and http2_available(),
+    )
+
+
+def describe_http_client(config: ConnectionPoolConfig) -> Dict[str, Any]:
+    """Return the effective connection settings for statistics."""
+    return {
+        "http2": config.http2 and http2_available(),
+        "http2_requested": config.http2,
+        "max_connections": config.max_connections,
+        "max_keepalive_connections": config.max_keepalive_connections,
+        "keepalive_expiry_s": config.keepalive_expiry_s,
+    }
@@ -0,0 +1,209 @@
+"""
+Dependency graph utilities shared by the schedulers and the template compiler.
+
+Validates dependency edges, computes a topological order and dependency
+levels in O(V + E), and reports unknown dependencies and cycles with
+clear errors.
+
+Usage:
+    graph = DependencyGraph.from_tasks(tasks)
+    order = graph.topological_order()    # raises CycleError
+    levels = graph.levels()              # {name: 0, 1, 2, ...}
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Set, Union
+
+if TYPE_CHECKING:
+    from .agent_pool import AgentTask
+
+
+class UnknownDependencyError(ValueError):
+    """
+    Raised when a node depends on a name that is not in the graph.
+
+    Attributes:
+        node: Node declaring the dependency
+        missing: Dependency names that do not exist
+    """
+
+    def __init__(self, node: str, missing: List[str]):
+        self.node = node
+        self.missing = missing
+        super().__init__(
+            f"Unknown dependency for '{node}': {', '.join(repr(m) for m in missing)}"
+        )
+
+
+class CycleError(ValueError):
+    """
+    Raised when the dependency graph contains a cycle.
+
+    Attributes:
+        cycle: Nodes on the cycle, each depending on the next; the first
+            node is repeated at the end
+    """
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(
+            f"Circular dependency detected: {' -> '.join(cycle)} "
+            f"(each task depends on the next)"
+        )
+
+
+def normalize_dependencies(depends_on: Union[None, str, Iterable[str]]) -> List[str]:
+    """Return dependency names as a de-duplicated list (a bare string is one name)."""
+    if not depends_on:
+        return []
+    if isinstance(depends_on, str):
+        return [depends_on]
+    return list(dict.fromkeys(depends_on))
+
+
+class DependencyGraph:
+    """
+    Validated dependency graph with linear-time ordering.
+
+    Node order follows the input mapping, and every traversal is stable with
+    respect to it, so results are deterministic.
+
+    Attributes:
+        nodes: Node names in input order
+        dependencies: Known dependencies of each node
+        successors: Nodes that depend on each node
+        unknown: Dropped dependency names per node (``on_unknown="ignore"``)
+    """
+
+    def __init__(
+        self,
+        dependencies: Mapping[str, Union[None, str, Iterable[str]]],
+        on_unknown: str = "error",
+    ):
+        """
+        Build the graph.
+
+        Args:
+            dependencies: Mapping of node name to the names it depends on
+            on_unknown: "error" to raise UnknownDependencyError, "ignore" to
+                drop dependencies on names outside the graph
+
+        Raises:
+            UnknownDependencyError: If a dependency is unknown and
+                ``on_unknown`` is "error"
+        """
+        if on_unknown not in ("error", "ignore"):
+            raise ValueError(f"on_unknown must be 'error' or 'ignore', got {on_unknown!r}")
+
+        self.nodes: List[str] = list(dependencies)
+        self.dependencies: Dict[str, List[str]] = {}
+        self.successors: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        self.unknown: Dict[str, List[str]] = {}
+
+        for name in self.nodes:
+            deps = normalize_dependencies(dependencies[name])
+            missing = [dep for dep in deps if dep not in self.successors]
+            if missing:
+                if on_unknown == "error":
+                    raise UnknownDependencyError(name, missing)
+                self.unknown[name] = missing
+                deps = [dep for dep in deps if dep in self.successors]
+            self.dependencies[name] = deps
+            for dep in deps:
+                self.successors[dep].append(name)
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable["AgentTask"], on_unknown: str = "error") -> "DependencyGraph":
+        """Build the graph of AgentTasks keyed by name (later duplicates win)."""
+        return cls({task.name: task.depends_on for task in tasks}, on_unknown)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def in_degrees(self) -> Dict[str, int]:
+        """Number of dependencies of each node."""
+        return {name: len(deps) for name, deps in self.dependencies.items()}
+
+    def topological_order(self) -> List[str]:
+        """
+        Order nodes so every node follows its dependencies (Kahn's algorithm).
+
+        Raises:
+            CycleError: If the graph contains a cycle
+        """
+        in_degree = self.in_degrees()
+        queue = deque(name for name in self.nodes if in_degree[name] == 0)
+        order: List[str] = []
+        while queue:
+            name = queue.popleft()
+            order.append(name)
+            for succ in self.successors[name]:
+                in_degree[succ] -= 1
+                if in_degree[succ] == 0:
+                    queue.append(succ)
+
+        if len(order) < len(self.nodes):
+            resolved = set(order)
+            raise CycleError(self.find_cycle([n for n in self.nodes if n not in resolved]))
+        return order
+
+    def levels(self) -> Dict[str, int]:
+        """
+        Longest-path level of each node: 0 without dependencies, otherwise
+        one more than the deepest dependency.
+
+        Raises:
+            CycleError: If the graph contains a cycle
+        """
+        levels: Dict[str, int] = {}
+        for name in self.topological_order():
+            levels[name] = 1 + max((levels[dep] for dep in self.dependencies[name]), default=-1)
+        return levels
+
+    def ancestors(self, name: str) -> Set[str]:
+        """Every node ``name`` depends on, directly or transitively."""
+        seen: Set[str] = set()
+        stack = list(self.dependencies[name])
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(self.dependencies[dep])
+        return seen
+
+    def find_cycle(self, candidates: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Find one cycle by depth-first search along dependency edges.
+
+        Args:
+            candidates: Nodes to start from (default: all nodes)
+
+        Returns:
+            Cycle as a list of nodes with the first repeated at the end, or an
+            empty list if there is none
+        """
+        done: Set[str] = set()
+        for root in candidates if candidates is not None else self.nodes:
+            if root in done:
+                continue
+            path = [root]
+            position = {root: 0}
+            stack = [iter(self.dependencies[root])]
+            while stack:
+                dep = next(stack[-1], None)
+                if dep is None:
+                    finished = path.pop()
+                    del position[finished]
+                    done.add(finished)
+                    stack.pop()
+                    continue
+                if dep in position:
+                    return path[position[dep]:] + [dep]
+                if dep in done:
+                    continue
+                position[dep] = len(path)
+                path.append(dep)
+                stack.append(iter(self.dependencies[dep]))
+        return []
@@ -0,0 +1,243 @@
+"""
+Upstream output injection for dependent agent tasks.
+
+A task can name the dependencies whose output it needs
+(``AgentTask.context_from``) and how much of it: the full text, an
+extractive summary or one markdown section. The selected outputs are
+placed in front of the task's prompt at dispatch time, within a token
+budget per task.
+
+Usage:
+    edges = parse_context_edges({"analyzer": "summary", "designer": "section:Interfaces"})
+    context, report = build_dependency_context(edges, outputs, budget_tokens=4000)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from .agent_pool import CHARS_PER_TOKEN, estimate_input_tokens
+
+
+CONTEXT_MODES: Tuple[str, ...] = ("full", "summary", "section")
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+TRUNCATION_MARKER = "[... truncated]"
+
+
+@dataclass
+class ContextEdge:
+    """
+    How one dependency's output is passed to a dependent task.
+
+    Attributes:
+        source: Name of the upstream task
+        mode: "full", "summary" (headings and first paragraph of each
+            section) or "section" (one markdown section)
+        section: Heading text for "section" mode, e.g. "Interfaces"
+        max_tokens: Cap for this edge (None: only the task budget applies)
+    """
+    source: str
+    mode: str = "full"
+    section: Optional[str] = None
+    max_tokens: Optional[int] = None
+
+    @classmethod
+    def from_spec(cls, source: str, spec: Union[None, bool, str, Mapping[str, Any]]) -> "ContextEdge":
+        """
+        Build an edge from its template form.
+
+        ``None``/``True`` means "full"; a string is a mode, or
+        ``"section:<heading>"``; a mapping has ``mode``, ``section`` and
+        ``max_tokens`` keys.
+
+        Raises:
+            ValueError: If the mode is unknown or a section has no heading
+        """
+        if spec is None or spec is True:
+            edge = cls(source)
+        elif isinstance(spec, str):
+            mode, _, section = spec.partition(":")
+            edge = cls(source, mode.strip(), section.strip() or None)
+        elif isinstance(spec, Mapping):
+            max_tokens = spec.get("max_tokens")
+            edge = cls(
+                source,
+                spec.get("mode", "section" if spec.get("section") else "full"),
+                spec.get("section"),
+                int(max_tokens) if max_tokens is not None else None,
+            )
+        else:
+            raise ValueError(f"Invalid context spec for '{source}': {spec!r}")
+
+        if edge.mode not in CONTEXT_MODES:
+            raise ValueError(
+                f"Unknown context mode for '{source}': {edge.mode!r} "
+                f"(expected one of {', '.join(CONTEXT_MODES)})"
+            )
+        if edge.mode == "section" and not edge.section:
+            raise ValueError(f"Context mode 'section' for '{source}' needs a heading")
+        return edge
+
+
+def parse_context_edges(
+    context_from: Union[None, str, List[str], Mapping[str, Any]],
+) -> List[ContextEdge]:
+    """Edges from ``AgentTask.context_from`` (a name, a list of names or a mapping)."""
+    if not context_from:
+        return []
+    if isinstance(context_from, str):
+        return [ContextEdge(context_from)]
+    if isinstance(context_from, Mapping):
+        return [ContextEdge.from_spec(source, spec) for source, spec in context_from.items()]
+    return [ContextEdge(source) for source in dict.fromkeys(context_from)]
+
+
+def extract_section(text: str, heading: str) -> Optional[str]:
+    """
+    Return the markdown section under ``heading``, including nested sections.
+
+    The heading matches case-insensitively with or without its ``#``
+    markers. Returns None if there is no such heading.
+    """
+    target = heading.lstrip("#").strip().lower()
+    lines = text.splitlines()
+    for start, line in enumerate(lines):
+        match = HEADING.match(line)
+        if not match or match.group(2).strip().lower() != target:
+            continue
+        level = len(match.group(1))
+        end = len(lines)
+        for i in range(start + 1, len(lines)):
+            nested = HEADING.match(lines[i])
+            if nested and len(nested.group(1)) <= level:
+                end = i
+                break
+        return "\n".join(lines[start:end]).strip()
+    return None
+
+
+def summarize(text: str) -> str:
+    """
+    Extractive summary: every heading with the first paragraph below it.
+
+    Text without headings is reduced to its first paragraph.
+    """
+    kept: List[str] = []
+    in_first_paragraph = True
+    for line in text.strip().splitlines():
+        if HEADING.match(line):
+            if kept and kept[-1]:
+                kept.append("")
+            kept.append(line)
+            in_first_paragraph = True
+        elif not line.strip():
+            if in_first_paragraph and kept and not HEADING.match(kept[-1]):
+                in_first_paragraph = False
+        elif in_first_paragraph:
+            kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def select_output(text: str, edge: ContextEdge) -> str:
+    """
+    Apply an edge's mode to an upstream output (before budgeting).
+
+    A missing section falls back to the summary of the whole output.
+    """
+    if edge.mode == "section":
+        section = extract_section(text, edge.section or "")
+        return section if section is not None else summarize(text)
+    if edge.mode == "summary":
+        return summarize(text)
+    return text.strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Cut text to at most ``max_tokens`` estimated tokens.
+
+    The cut falls on the last line break inside the limit when there is
+    one, and a marker line is appended.
+
+    Returns:
+        Tuple of (text, whether it was truncated)
+    """
+    if estimate_input_tokens(text) <= max_tokens:
+        return text, False
+    limit = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER) - 1
+    if limit <= 0:
+        return "", True
+    cut = text[:limit]
+    newline = cut.rfind("\n")
+    if newline > limit // 2:
+        cut = cut[:newline]
+    return f"{cut.rstrip()}\n{TRUNCATION_MARKER}", True
+
+
+def allocate_budget(sizes: List[int], budget: int) -> List[int]:
+    """
+    Split a token budget across edges by water-filling.
+
+    Edges needing less than an equal share get all they need; what they
+    leave over is shared equally by the larger ones. Ties are broken by
+    position, so the split is deterministic.
+    """
+    shares = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i], i))
+    for position, i in enumerate(order):
+        fair = remaining // (len(sizes) - position)
+        shares[i] = min(sizes[i], fair)
+        remaining -= shares[i]
+    return shares
+
+
+def build_dependency_context(
+    edges: List[ContextEdge],
+    outputs: Mapping[str, str],
+    budget_tokens: int,
+) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """
+    Render the upstream outputs a task receives.
+
+    Args:
+        edges: Edges of the task, in the order they are rendered
+        outputs: Output of each upstream task that is available
+        budget_tokens: Hard limit for all injected outputs together
+
+    Returns:
+        Tuple of (context block to put in front of the prompt, or "" if
+        nothing is injected; report per source with ``mode``,
+        ``source_tokens``, ``tokens`` and ``truncated``, or
+        ``missing: True`` when the output was not available)
+    """
+    report: Dict[str, Dict[str, Any]] = {}
+    selected: List[Tuple[ContextEdge, str]] = []
+    for edge in edges:
+        if edge.source not in outputs:
+            report[edge.source] = {"mode": edge.mode, "missing": True, "tokens": 0}
+            continue
+        selected.append((edge, select_output(outputs[edge.source], edge)))
+
+    wanted = [
+        min(estimate_input_tokens(text), edge.max_tokens if edge.max_tokens is not None else budget_tokens)
+        for edge, text in selected
+    ]
+    blocks: List[str] = []
+    for (edge, text), share in zip(selected, allocate_budget(wanted, max(0, budget_tokens))):
+        clipped, truncated = truncate_to_tokens(text, share)
+        report[edge.source] = {
+            "mode": edge.mode,
+            "source_tokens": estimate_input_tokens(outputs[edge.source]),
+            "tokens": estimate_input_tokens(clipped),
+            "truncated": truncated,
+        }
+        if clipped:
+            blocks.append(
+                f"<dependency_output name=\"{edge.source}\" mode=\"{edge.mode}\">\n"
+                f"{clipped}\n</dependency_output>"
+            )
+    return "\n\n".join(blocks), report
@@ -0,0 +1,155 @@
+"""
+Task duration estimates for critical-path scheduling.
+
+Estimates how long each agent task will run from the durations of
+earlier runs, kept per role group and model tier, falling back to a
+static model of the tier's latency and generation speed.
+
+Usage:
+    durations = DurationModel.load()
+    scheduler = WaveScheduler(pool, config, durations=durations)
+    await scheduler.execute_all(tasks)
+    durations.save()
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .agent_pool import AgentResult, AgentTask, estimate_input_tokens, model_id_to_tier
+
+
+DEFAULT_HISTORY_PATH = Path(".specify") / "history" / "durations.json"
+
+# Static fallback: typical time to first token and output speed per tier
+TIER_FIRST_TOKEN_MS: Dict[str, float] = {"opus": 2000.0, "sonnet": 1200.0, "haiku": 600.0}
+TIER_OUTPUT_TOKENS_PER_S: Dict[str, float] = {"opus": 40.0, "sonnet": 70.0, "haiku": 150.0}
+
+# Share of the max_tokens allowance a task is assumed to generate
+EXPECTED_OUTPUT_FRACTION = 0.5
+
+# Optional per-key statistics kept next to mean_ms and samples
+HISTORY_STATS = ("var_ms", "tokens_in", "tokens_out")
+
+
+class DurationModel:
+    """
+    Historical and estimated task durations per role group and model tier.
+
+    History is an exponentially weighted moving average, so a role whose
+    prompts change over time converges to its new duration within a few
+    runs.
+    """
+
+    def __init__(
+        self,
+        history: Optional[Dict[str, Dict[str, float]]] = None,
+        smoothing: float = 0.3,
+    ):
+        """
+        Initialize the model.
+
+        Args:
+            history: Mapping of ``role_group/tier`` to ``{"mean_ms", "samples"}``
+                and optionally ``var_ms``, ``tokens_in`` and ``tokens_out``
+            smoothing: EWMA weight of the newest sample (0.0-1.0)
+        """
+        self.history: Dict[str, Dict[str, float]] = dict(history or {})
+        self.smoothing = smoothing
+
+    @staticmethod
+    def key(role_group: str, tier: str) -> str:
+        """History key for a role group and model tier."""
+        return f"{role_group}/{tier}"
+
+    @staticmethod
+    def static_estimate_ms(task: AgentTask) -> float:
+        """Duration of a task from tier speed and its output allowance."""
+        tier = model_id_to_tier(task.model)
+        first_token = TIER_FIRST_TOKEN_MS.get(tier, TIER_FIRST_TOKEN_MS["sonnet"])
+        speed = TIER_OUTPUT_TOKENS_PER_S.get(tier, TIER_OUTPUT_TOKENS_PER_S["sonnet"])
+        return first_token + 1000 * task.max_tokens * EXPECTED_OUTPUT_FRACTION / speed
+
+    def estimate_ms(self, task: AgentTask) -> float:
+        """Expected duration of a task: history if available, else the static estimate."""
+        entry = self.history.get(self.key(task.role_group, model_id_to_tier(task.model)))
+        if entry:
+            return entry["mean_ms"]
+        return self.static_estimate_ms(task)
+
+    def stddev_ms(self, task: AgentTask) -> Optional[float]:
+        """Standard deviation of the task's duration, or None without enough history."""
+        entry = self.history.get(self.key(task.role_group, model_id_to_tier(task.model)))
+        if not entry or entry["samples"] < 2 or "var_ms" not in entry:
+            return None
+        return entry["var_ms"] ** 0.5
+
+    def estimate_tokens(self, task: AgentTask) -> Tuple[float, float]:
+        """
+        Expected (input, output) tokens of a task.
+
+        History if available; otherwise the prompt length and the expected
+        share of ``max_tokens``.
+        """
+        entry = self.history.get(self.key(task.role_group, model_id_to_tier(task.model)))
+        if entry and "tokens_in" in entry:
+            return entry["tokens_in"], entry["tokens_out"]
+        tokens_in = estimate_input_tokens(task.full_prompt) + estimate_input_tokens(task.system_prompt or "")
+        return float(tokens_in), task.max_tokens * EXPECTED_OUTPUT_FRACTION
+
+    def record(self, task: AgentTask, result: AgentResult) -> None:
+        """Fold a successful, uncached result into the history."""
+        if not result.success or result.cached:
+            return
+        tier = result.model_tier or model_id_to_tier(task.model)
+        key = self.key(task.role_group, tier)
+        tokens_in = float(result.tokens_in + result.cache_read_tokens + result.cache_write_tokens)
+        entry = self.history.get(key)
+        if entry is None:
+            self.history[key] = {
+                "mean_ms": float(result.duration_ms),
+                "samples": 1,
+                "var_ms": 0.0,
+                "tokens_in": tokens_in,
+                "tokens_out": float(result.tokens_out),
+            }
+            return
+        # Exponentially weighted mean and variance
+        a = self.smoothing
+        diff = result.duration_ms - entry["mean_ms"]
+        entry["mean_ms"] += a * diff
+        entry["var_ms"] = (1 - a) * (entry.get("var_ms", 0.0) + a * diff * diff)
+        for stat, value in (("tokens_in", tokens_in), ("tokens_out", float(result.tokens_out))):
+            previous = entry.get(stat, value)
+            entry[stat] = previous + a * (value - previous)
+        entry["samples"] += 1
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DEFAULT_HISTORY_PATH, **kwargs: Any) -> "DurationModel":
+        """
+        Load history from a JSON file.
+
+        A missing or unreadable file yields an empty model, so the first
+        run simply uses static estimates.
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(**kwargs)
+        history = {}
+        for key, entry in data.items():
+            if not isinstance(entry, dict) or "mean_ms" not in entry:
+                continue
+            history[key] = {"mean_ms": float(entry["mean_ms"]), "samples": int(entry.get("samples", 1))}
+            history[key].update(
+                (stat, float(entry[stat])) for stat in HISTORY_STATS if stat in entry
+            )
+        return cls(history, **kwargs)
+
+    def save(self, path: Union[str, Path] = DEFAULT_HISTORY_PATH) -> None:
+        """Write history to a JSON file, creating its directory."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.history, indent=2, sort_keys=True), encoding="utf-8")
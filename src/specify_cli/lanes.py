@@ -0,0 +1,196 @@
+"""
+Per-model-tier execution lanes with weighted fair queueing.
+
+Each lane owns its own concurrency limiter, rate limits and optional
+adaptive controller, so long opus generations cannot hold slots that
+haiku tasks are waiting for. Within a lane, waiters are served by
+priority and then fairly across role groups.
+
+Usage:
+    lane = Lane.from_config("haiku", LaneConfig(max_parallel=8, requests_per_minute=100))
+    async with lane.slot(task):
+        ...
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Tuple
+
+from .concurrency import AdaptiveConcurrencyController, ConcurrencyLimiter
+from .rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from .agent_pool import AgentTask
+
+
+DEFAULT_LANE = "default"
+
+
+@dataclass
+class LaneConfig:
+    """
+    Concurrency and rate budget of one lane.
+
+    Attributes:
+        max_parallel: Concurrent requests allowed in the lane
+        requests_per_minute: Lane RPM limit (0 disables)
+        tokens_per_minute: Lane TPM limit (0 disables)
+    """
+    max_parallel: int = 4
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LaneConfig":
+        """Build a LaneConfig from a template ``orchestration.lanes`` entry."""
+        return cls(
+            max_parallel=int(data.get("max_parallel", cls.max_parallel)),
+            requests_per_minute=int(data.get("requests_per_minute", 0) or 0),
+            tokens_per_minute=int(data.get("tokens_per_minute", 0) or 0),
+        )
+
+
+class FairQueue:
+    """
+    Start-time fair queueing keys across role groups.
+
+    Each group ``g`` keeps a finish tag ``F_g``; a task from ``g`` gets the
+    start tag ``S = max(V, F_g)`` and advances ``F_g = S + cost / weight``.
+    ``V`` (the lane's virtual time) follows the start tag of the most
+    recently admitted task, so an idle group re-enters at the current time
+    instead of cashing in credit it accumulated while absent.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            weights: Relative share per role group (default 1.0)
+        """
+        self.weights = dict(weights or {})
+        self.virtual_time = 0.0
+        self._finish: Dict[str, float] = {}
+
+    def key_for(self, task: "AgentTask") -> Tuple[int, float]:
+        """Return the waiter key for a task: (priority, virtual start time)."""
+        weight = max(self.weights.get(task.role_group, 1.0), 1e-6)
+        start = max(self.virtual_time, self._finish.get(task.role_group, 0.0))
+        self._finish[task.role_group] = start + task.estimate_tokens() / weight
+        return (task.priority, start)
+
+    def admitted(self, key: Tuple[int, float]) -> None:
+        """Advance the virtual time once a task with ``key`` is admitted."""
+        self.virtual_time = max(self.virtual_time, key[1])
+
+
+class Lane:
+    """
+    An isolated execution lane: limiter, rate limiter and fair queue.
+
+    Attributes:
+        name: Lane name (model tier or ``"default"``)
+        limiter: Concurrency limiter ordered by fair-queue keys
+        rate_limiter: RPM/TPM token buckets for the lane
+        controller: Optional AIMD controller driving ``limiter``
+        fair_queue: Key generator for waiters
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limiter: ConcurrencyLimiter,
+        rate_limiter: RateLimiter,
+        controller: Optional[AdaptiveConcurrencyController] = None,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the lane from existing components.
+
+        Args:
+            name: Lane name
+            limiter: Concurrency limiter for the lane
+            rate_limiter: Rate limiter for the lane
+            controller: Optional adaptive controller for ``limiter``
+            weights: Role-group weights for fair queueing
+        """
+        self.name = name
+        self.limiter = limiter
+        self.rate_limiter = rate_limiter
+        self.controller = controller
+        self.fair_queue = FairQueue(weights)
+
+        # Statistics
+        self.admitted = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.max_waiting = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        name: str,
+        config: LaneConfig,
+        adaptive: bool = False,
+        max_parallel: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> "Lane":
+        """
+        Create a lane with its own limiter and rate limiter.
+
+        Args:
+            name: Lane name
+            config: Lane budget
+            adaptive: Attach an AIMD controller bounded by ``max_parallel``
+            max_parallel: Upper concurrency bound in adaptive mode
+            weights: Role-group weights for fair queueing
+        """
+        limiter = ConcurrencyLimiter(config.max_parallel)
+        controller = (
+            AdaptiveConcurrencyController(
+                limiter,
+                min_limit=1,
+                max_limit=max(config.max_parallel, max_parallel or config.max_parallel),
+            )
+            if adaptive else None
+        )
+        rate_limiter = RateLimiter(
+            requests_per_minute=config.requests_per_minute,
+            tokens_per_minute=config.tokens_per_minute,
+        )
+        return cls(name, limiter, rate_limiter, controller, weights)
+
+    @asynccontextmanager
+    async def slot(self, task: "AgentTask") -> AsyncIterator["Lane"]:
+        """Hold one of the lane's concurrency slots while running ``task``."""
+        key = self.fair_queue.key_for(task)
+        if self.limiter.in_use >= self.limiter.limit or self.limiter.waiting:
+            self.max_waiting = max(self.max_waiting, self.limiter.waiting + 1)
+        wait_start = time.monotonic()
+        await self.limiter.acquire(key)
+        wait_ms = (time.monotonic() - wait_start) * 1000
+        self.fair_queue.admitted(key)
+        self.admitted += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        try:
+            yield self
+        finally:
+            self.limiter.release()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return lane counters for get_statistics()."""
+        return {
+            "limit": self.limiter.limit,
+            "in_use": self.limiter.in_use,
+            "waiting": self.limiter.waiting,
+            "max_waiting": self.max_waiting,
+            "admitted": self.admitted,
+            "avg_wait_ms": self.total_wait_ms / self.admitted if self.admitted else 0.0,
+            "max_wait_ms": self.max_wait_ms,
+            "adaptive": self.controller is not None,
+            "rate_limiter": self.rate_limiter.get_statistics(),
+        }
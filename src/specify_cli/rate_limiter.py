@@ -0,0 +1,235 @@
+"""
+Client-side rate limiting for Claude API requests.
+
+Provides a dual token-bucket limiter that admits requests before they
+reach the API, keeping the agent pool under its requests-per-minute and
+tokens-per-minute quota instead of running into 429 responses.
+
+Usage:
+    limiter = RateLimiter(requests_per_minute=50, tokens_per_minute=100_000)
+    reserved = await limiter.acquire(estimated_tokens)
+    response = await client.messages.create(...)
+    limiter.settle(reserved, response.usage.input_tokens + response.usage.output_tokens)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at a fixed rate.
+
+    The bucket starts full, so a fresh pool can burst up to ``capacity``
+    before being throttled to the sustained rate. The level may go
+    negative when actual usage exceeds the admitted estimate; the debt
+    is repaid by subsequent refills.
+
+    Attributes:
+        capacity: Maximum number of tokens the bucket can hold
+        refill_per_second: Sustained refill rate
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._clock = clock
+        self._level = float(capacity)
+        self._updated = clock()
+
+    @property
+    def level(self) -> float:
+        """Current number of available tokens (after refill)."""
+        self._refill()
+        return self._level
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._level = min(self.capacity, self._level + elapsed * self.refill_per_second)
+            self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0.0 if available now)."""
+        self._refill()
+        deficit = amount - self._level
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Remove tokens unconditionally (may leave the bucket in debt)."""
+        self._refill()
+        self._level -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return previously consumed tokens, never exceeding capacity."""
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """
+    Dual request + token bucket limiter for Claude API calls.
+
+    Each call to ``acquire`` takes one request from the RPM bucket and an
+    estimated number of tokens from the TPM bucket, waiting until both are
+    available. Waiters are admitted in FIFO order so a large request is not
+    starved by a stream of small ones. Once the real usage is known,
+    ``settle`` refunds (or debits) the difference from the estimate.
+
+    A limit of ``0`` or ``None`` disables the corresponding bucket.
+
+    Example:
+        ```python
+        limiter = RateLimiter(requests_per_minute=50, tokens_per_minute=100_000)
+        reserved = await limiter.acquire(12_000)
+        ...
+        limiter.settle(reserved, actual_tokens=4_200)
+        print(limiter.get_statistics()["avg_wait_ms"])
+        ```
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Sustained request rate (None/0 = unlimited)
+            tokens_per_minute: Sustained token rate (None/0 = unlimited)
+            clock: Monotonic clock, injectable for tests
+        """
+        self._clock = clock
+        self.request_bucket: Optional[TokenBucket] = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60.0, clock)
+            if requests_per_minute else None
+        )
+        self.token_bucket: Optional[TokenBucket] = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, clock)
+            if tokens_per_minute else None
+        )
+        self._lock = asyncio.Lock()
+
+        # Statistics
+        self.acquisitions = 0
+        self.throttled = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.tokens_reserved = 0
+        self.tokens_refunded = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any bucket is active."""
+        return self.request_bucket is not None or self.token_bucket is not None
+
+    def _clamp(self, tokens: int) -> int:
+        # A single request larger than the whole bucket could never be
+        # admitted; cap it at capacity so it waits for a full bucket instead.
+        if self.token_bucket is not None:
+            return min(tokens, int(self.token_bucket.capacity))
+        return tokens
+
+    def _time_until_admissible(self, tokens: int) -> float:
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.time_until(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.time_until(tokens))
+        return wait
+
+    async def acquire(self, tokens: int) -> int:
+        """
+        Wait until one request and ``tokens`` tokens can be admitted.
+
+        Args:
+            tokens: Estimated tokens (input + max output) for the request
+
+        Returns:
+            Number of tokens actually reserved (pass to ``settle``)
+        """
+        tokens = self._clamp(max(0, int(tokens)))
+        if not self.enabled:
+            self.acquisitions += 1
+            return tokens
+
+        start = self._clock()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._lock:
+                waited = False
+                while True:
+                    delay = self._time_until_admissible(tokens)
+                    if delay <= 0:
+                        break
+                    waited = True
+                    await asyncio.sleep(delay)
+
+                if self.request_bucket is not None:
+                    self.request_bucket.consume(1)
+                if self.token_bucket is not None:
+                    self.token_bucket.consume(tokens)
+        finally:
+            self.queue_depth -= 1
+
+        wait_ms = (self._clock() - start) * 1000
+        self.acquisitions += 1
+        self.throttled += 1 if waited else 0
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.tokens_reserved += tokens
+        return tokens
+
+    def settle(self, reserved: int, actual_tokens: int) -> None:
+        """
+        Reconcile a reservation with the real token usage.
+
+        Unused tokens are returned to the bucket; overruns are debited.
+
+        Args:
+            reserved: Value returned by ``acquire``
+            actual_tokens: Real usage reported by the API (0 if the call failed)
+        """
+        if self.token_bucket is None:
+            return
+        difference = reserved - actual_tokens
+        if difference > 0:
+            self.token_bucket.refund(difference)
+            self.tokens_refunded += difference
+        elif difference < 0:
+            self.token_bucket.consume(-difference)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return limiter wait-time and queue-depth statistics."""
+        return {
+            "enabled": self.enabled,
+            "acquisitions": self.acquisitions,
+            "throttled": self.throttled,
+            "total_wait_ms": round(self.total_wait_ms, 1),
+            "avg_wait_ms": (
+                round(self.total_wait_ms / self.acquisitions, 1)
+                if self.acquisitions > 0 else 0
+            ),
+            "max_wait_ms": round(self.max_wait_ms, 1),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "tokens_reserved": self.tokens_reserved,
+            "tokens_refunded": self.tokens_refunded,
+        }
@@ -0,0 +1,213 @@
+"""
+Persistent content-addressed cache for agent responses.
+
+Stores successful responses in a SQLite database, keyed by a hash of the
+exact request sent to the API, so re-running an orchestration answers
+identical requests locally and at zero cost.
+
+Usage:
+    cache = ResponseCache(".specify/cache")
+    key = cache.key_for(request_kwargs)
+    payload = cache.get(key)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+DEFAULT_CACHE_DIR = Path(".specify") / "cache"
+CACHE_DB_NAME = "responses.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with TTL and LRU eviction.
+
+    Entries older than ``ttl_s`` are never returned. When the number of
+    entries or their total payload size exceeds the configured caps, the
+    least recently accessed entries are evicted first.
+
+    In ``refresh`` mode lookups always miss but new responses are still
+    written, which replaces stale entries without disabling the cache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+        ttl_s: float = 7 * 24 * 3600,
+        max_entries: int = 10_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        refresh: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            ttl_s: Entry lifetime in seconds (0 disables expiry)
+            max_entries: Maximum number of cached responses (0 disables the cap)
+            max_bytes: Maximum total payload size in bytes (0 disables the cap)
+            refresh: Ignore existing entries on lookup, but keep writing
+            clock: Wall clock, injectable for tests
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / CACHE_DB_NAME
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self._clock = clock
+
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            str(self.path), isolation_level=None
+        )
+        self._conn.executescript(_SCHEMA)
+        self._size = (0, 0)
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(request: Dict[str, Any]) -> str:
+        """
+        Return the content address of a request.
+
+        The request is serialized as canonical JSON (sorted keys, no
+        whitespace) so that logically identical kwargs hash identically.
+        """
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached payload.
+
+        Args:
+            key: Key from ``key_for``
+
+        Returns:
+            The stored payload, or None on a miss, an expired entry or in
+            refresh mode
+        """
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        row = self._conn.execute(
+            "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = self._clock()
+        if row is None or self._expired(row[1], now):
+            self.misses += 1
+            return None
+
+        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        """
+        Store a payload, then evict expired and over-cap entries.
+
+        Args:
+            key: Key from ``key_for``
+            payload: JSON-serializable response data
+        """
+        data = json.dumps(payload, sort_keys=True)
+        now = self._clock()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, payload, size, created_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (key, data, len(data.encode("utf-8")), now, now),
+        )
+        self.writes += 1
+        self._evict(now)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        self._conn.execute("DELETE FROM responses")
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_s) and now - created_at > self.ttl_s
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under the caps."""
+        if self.ttl_s:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+        if self.max_entries:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+        if self.max_bytes:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at ASC, rowid ASC"
+                ).fetchall()
+                doomed = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                self.evictions += len(doomed)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache size."""
+        entries, size = self._size if self._conn is None else self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "path": str(self.path),
+            "refresh": self.refresh,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        """Close the database connection; statistics remain readable."""
+        if self._conn is None:
+            return
+        self._size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._conn.close()
+        self._conn = None
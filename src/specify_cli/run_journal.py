@@ -0,0 +1,185 @@
+"""
+Run journal for checkpoint/resume of orchestrated runs.
+
+The scheduler appends every finished AgentResult to a JSONL journal
+under ``.specify/runs/<run-id>/``. Resuming the run restores the tasks
+that already succeeded with an unchanged definition and executes only
+the rest.
+
+Usage:
+    journal = RunJournal.create(meta={"command": "implement", "feature": "001-auth"})
+    scheduler = WaveScheduler(pool, config, journal=journal)
+    await scheduler.execute_all(tasks)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import secrets
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from .agent_pool import AgentResult, AgentTask, ResultStatus
+from .dag import normalize_dependencies
+from .response_cache import ResponseCache
+
+
+DEFAULT_RUNS_DIR = Path(".specify") / "runs"
+JOURNAL_FILE = "journal.jsonl"
+RUN_FILE = "run.json"
+
+
+def task_fingerprint(task: AgentTask) -> str:
+    """
+    Hash of everything that determines a task's output.
+
+    Scheduling hints (priority, timeouts, metadata) are left out, so
+    changing them does not invalidate journalled results.
+    """
+    return ResponseCache.key_for({
+        "name": task.name,
+        "prompt": task.prompt,
+        "prompt_prefix": task.prompt_prefix,
+        "system_prompt": task.system_prompt,
+        "model": task.model,
+        "max_tokens": task.max_tokens,
+        "temperature": task.temperature,
+        "depends_on": sorted(normalize_dependencies(task.depends_on)),
+        "stop_pattern": task.stop_pattern,
+        "context_from": task.context_from,
+        "context_budget_tokens": task.context_budget_tokens,
+    })
+
+
+def new_run_id() -> str:
+    """Sortable, unique run id such as ``20250114-093012-1f2e3d``."""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+class RunJournal:
+    """
+    Append-only record of the results of one orchestrated run.
+
+    Each result is written and flushed as its own line, so everything
+    that finished before an interruption survives it.
+
+    Attributes:
+        run_id: Identifier of the run (name of its directory)
+        run_dir: Directory holding the journal and run metadata
+        path: Path of the JSONL journal
+    """
+
+    def __init__(self, run_dir: Union[str, Path]):
+        """
+        Attach to a run directory (use ``create`` or ``open``).
+
+        Args:
+            run_dir: Directory of the run, ``<runs_dir>/<run_id>``
+        """
+        self.run_dir = Path(run_dir)
+        self.run_id = self.run_dir.name
+        self.path = self.run_dir / JOURNAL_FILE
+
+    @classmethod
+    def create(
+        cls,
+        runs_dir: Union[str, Path] = DEFAULT_RUNS_DIR,
+        run_id: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> "RunJournal":
+        """
+        Start the journal of a new run.
+
+        Args:
+            runs_dir: Directory holding all run journals
+            run_id: Run identifier (generated if omitted)
+            meta: Extra run metadata for run.json (e.g. command, feature)
+
+        Raises:
+            FileExistsError: If a run with this id already exists
+        """
+        journal = cls(Path(runs_dir) / (run_id or new_run_id()))
+        journal.run_dir.mkdir(parents=True, exist_ok=False)
+        info = {"run_id": journal.run_id, "created_at": time.time(), **(meta or {})}
+        (journal.run_dir / RUN_FILE).write_text(json.dumps(info, indent=2), encoding="utf-8")
+        journal.path.touch()
+        return journal
+
+    @classmethod
+    def open(cls, run_id: str, runs_dir: Union[str, Path] = DEFAULT_RUNS_DIR) -> "RunJournal":
+        """
+        Open the journal of an earlier run for resuming.
+
+        Raises:
+            FileNotFoundError: If there is no run with this id
+        """
+        journal = cls(Path(runs_dir) / run_id)
+        if not journal.run_dir.is_dir():
+            raise FileNotFoundError(f"No run '{run_id}' in {runs_dir}")
+        return journal
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Run metadata from run.json (empty if missing or unreadable)."""
+        try:
+            return json.loads((self.run_dir / RUN_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, fingerprint: str, result: AgentResult) -> None:
+        """Append a finished task's result and flush it to disk."""
+        entry = {
+            "task": result.name,
+            "fingerprint": fingerprint,
+            "recorded_at": time.time(),
+            "result": dataclasses.asdict(result),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Journal entries in write order, skipping unreadable lines."""
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Truncated by a crash mid-write
+                continue
+            if isinstance(entry, dict) and "task" in entry and "result" in entry:
+                yield entry
+
+    def load(self) -> Dict[str, Tuple[str, AgentResult]]:
+        """Latest (fingerprint, result) of every journalled task."""
+        latest: Dict[str, Tuple[str, AgentResult]] = {}
+        for entry in self.entries():
+            data = dict(entry["result"])
+            try:
+                data["status"] = ResultStatus(data["status"]) if data.get("status") else None
+                latest[entry["task"]] = (entry.get("fingerprint", ""), AgentResult(**data))
+            except (TypeError, ValueError):
+                continue
+        return latest
+
+    def successful_results(self, fingerprints: Dict[str, str]) -> Dict[str, AgentResult]:
+        """
+        Results that can be reused instead of executing the task again.
+
+        Args:
+            fingerprints: ``task_fingerprint`` of each task of the new run
+
+        Returns:
+            Latest result of every task that succeeded with an unchanged
+            definition
+        """
+        return {
+            name: result
+            for name, (fingerprint, result) in self.load().items()
+            if result.success and fingerprints.get(name) == fingerprint
+        }
@@ -0,0 +1,380 @@
+"""
+Discrete-event simulator for what-if planning of orchestrated runs.
+
+Replays the task DAG on a virtual clock with durations drawn from the
+DurationModel history, and predicts makespan, peak concurrency, cost and
+rate-limit pressure for each execution strategy and pool size.
+
+Usage:
+    simulator = ExecutionSimulator(config, durations=DurationModel.load())
+    results = simulator.compare(tasks, pool_sizes=[2, 4, 8], runs=200)
+    best = ExecutionSimulator.best(results)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .agent_pool import AgentTask, calculate_cost, model_id_to_tier
+from .batch_aggregator import BatchAggregator, BatchConfig
+from .batch_backend import BATCH_COST_MULTIPLIER
+from .dag import DependencyGraph
+from .duration_model import DurationModel
+from .rate_limiter import TokenBucket
+from .wave_scheduler import ExecutionStrategy, Wave, WaveConfig, WaveScheduler
+
+# Coefficient of variation assumed for tasks without recorded spread
+DEFAULT_DURATION_CV = 0.25
+
+WINDOW_MS = 60_000.0
+
+
+@dataclass
+class SimulationResult:
+    """
+    Predicted outcome of running a task graph with one strategy and pool size.
+
+    Attributes:
+        strategy: Execution strategy simulated
+        pool_size: Concurrent execution slots
+        runs: Number of sampled runs the figures are drawn from
+        makespan_ms: Mean predicted wall time
+        makespan_p90_ms: 90th percentile of the predicted wall time
+        peak_concurrency: Most tasks holding a slot at once
+        utilisation: Busy share of slot capacity (mean over runs)
+        cost: Expected spend in USD at list prices
+        tokens_in: Expected input tokens
+        tokens_out: Expected output tokens
+        peak_requests_per_minute: Most requests started in any 60 s window
+        peak_tokens_per_minute: Most tokens used by requests started in any
+            60 s window
+        throttled_ms: Mean total time tasks waited for the rate limiter
+        rate_limit_pressure: Peak demand as a share of the tighter of the
+            RPM/TPM limits (1.0 = at the limit)
+    """
+    strategy: str
+    pool_size: int
+    runs: int
+    makespan_ms: float
+    makespan_p90_ms: float
+    peak_concurrency: int
+    utilisation: float
+    cost: float
+    tokens_in: int
+    tokens_out: int
+    peak_requests_per_minute: int
+    peak_tokens_per_minute: int
+    throttled_ms: float
+    rate_limit_pressure: float
+
+
+@dataclass
+class _Plan:
+    """Release rule of a strategy: groups opened by their predecessor's progress."""
+    groups: List[List[str]]
+    # Finished tasks of group k needed to open group k + 1
+    open_after: List[int]
+    # Dependencies that must finish before a task is dispatched
+    dependencies: Dict[str, List[str]]
+
+
+class ExecutionSimulator:
+    """
+    What-if planner for strategies and pool sizes.
+
+    Everything the scheduler would decide (wave construction, dispatch
+    order, overlap threshold, batch grouping) comes from the given
+    WaveConfig, with ``strategy`` and ``max_parallel`` overridden per
+    simulation.
+    """
+
+    def __init__(
+        self,
+        config: Optional[WaveConfig] = None,
+        durations: Optional[DurationModel] = None,
+        requests_per_minute: Optional[int] = 50,
+        tokens_per_minute: Optional[int] = 100_000,
+    ):
+        """
+        Initialize the simulator.
+
+        Args:
+            config: Base scheduler configuration
+            durations: Duration and token history (static estimates if omitted)
+            requests_per_minute: Pool RPM limit (None/0 = unlimited)
+            tokens_per_minute: Pool TPM limit (None/0 = unlimited)
+        """
+        self.config = config or WaveConfig()
+        self.durations = durations or DurationModel()
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+    def simulate(
+        self,
+        tasks: List[AgentTask],
+        strategy: ExecutionStrategy,
+        pool_size: int,
+        runs: int = 1,
+        seed: int = 0,
+    ) -> SimulationResult:
+        """
+        Predict one strategy at one pool size.
+
+        Args:
+            tasks: Tasks of the run
+            strategy: Strategy to simulate
+            pool_size: Concurrent slots (``--pool-size``)
+            runs: Sampled runs; 1 uses expected durations without sampling
+            seed: Random seed for the sampled durations
+
+        Returns:
+            SimulationResult with means over the sampled runs
+
+        Raises:
+            ValueError: If the dependencies are unknown or cyclic
+        """
+        pool_size = max(1, pool_size)
+        config = replace(self.config, strategy=strategy, max_parallel=pool_size)
+        scheduler = WaveScheduler(None, config, durations=self.durations)
+        waves = scheduler.build_waves(tasks)
+        by_name = {t.name: t for wave in waves for t in wave.tasks}
+        plan = self._plan(config, waves)
+        # Dispatch order: group (wave/batch), then the scheduler's ready key
+        dispatch_key: Dict[str, Tuple] = {}
+        for group, names in enumerate(plan.groups):
+            for name in names:
+                dispatch_key[name] = (group, scheduler._ready_key(by_name[name]), len(dispatch_key))
+
+        expected_tokens = {name: self.durations.estimate_tokens(t) for name, t in by_name.items()}
+        cost = sum(
+            calculate_cost(model_id_to_tier(t.model), int(expected_tokens[n][0]), int(expected_tokens[n][1]))
+            for n, t in by_name.items()
+        )
+        if strategy == ExecutionStrategy.BATCHED and config.backend == "batch":
+            cost *= BATCH_COST_MULTIPLIER
+
+        rng = random.Random(seed)
+        samples = [
+            self._run_once(by_name, plan, dispatch_key, pool_size,
+                           self._sample_durations(by_name, rng if runs > 1 else None),
+                           expected_tokens)
+            for _ in range(max(1, runs))
+        ]
+        makespans = sorted(s[0] for s in samples)
+        peak_rpm = max(s[3] for s in samples)
+        peak_tpm = max(s[4] for s in samples)
+        limits = [
+            peak / limit for peak, limit in
+            ((peak_rpm, self.requests_per_minute), (peak_tpm, self.tokens_per_minute)) if limit
+        ]
+        return SimulationResult(
+            strategy=strategy.value,
+            pool_size=pool_size,
+            runs=len(samples),
+            makespan_ms=sum(makespans) / len(makespans),
+            makespan_p90_ms=makespans[min(len(makespans) - 1, math.ceil(0.9 * len(makespans)) - 1)],
+            peak_concurrency=max(s[1] for s in samples),
+            utilisation=sum(s[2] for s in samples) / len(samples),
+            cost=cost,
+            tokens_in=int(sum(t[0] for t in expected_tokens.values())),
+            tokens_out=int(sum(t[1] for t in expected_tokens.values())),
+            peak_requests_per_minute=peak_rpm,
+            peak_tokens_per_minute=peak_tpm,
+            throttled_ms=sum(s[5] for s in samples) / len(samples),
+            rate_limit_pressure=max(limits, default=0.0),
+        )
+
+    def compare(
+        self,
+        tasks: List[AgentTask],
+        strategies: Optional[Iterable[ExecutionStrategy]] = None,
+        pool_sizes: Sequence[int] = (1, 2, 4, 8),
+        runs: int = 1,
+        seed: int = 0,
+    ) -> List[SimulationResult]:
+        """Simulate every combination of strategy and pool size (all strategies by default)."""
+        return [
+            self.simulate(tasks, strategy, pool_size, runs=runs, seed=seed)
+            for strategy in (strategies or list(ExecutionStrategy))
+            for pool_size in pool_sizes
+        ]
+
+    @staticmethod
+    def best(results: List[SimulationResult]) -> Optional[SimulationResult]:
+        """Fastest option by p90 makespan; ties go to the cheaper, then smaller pool."""
+        return min(
+            results,
+            key=lambda r: (round(r.makespan_p90_ms), r.cost, r.pool_size),
+            default=None,
+        )
+
+    def _plan(self, config: WaveConfig, waves: List[Wave]) -> _Plan:
+        """Translate a strategy into groups and release thresholds."""
+        names = [[t.name for t in wave.tasks] for wave in waves]
+        no_deps: Dict[str, List[str]] = {n: [] for group in names for n in group}
+
+        # Online batches form as tasks become ready: dataflow, give or take the fill window
+        if config.strategy == ExecutionStrategy.AGGRESSIVE or (
+            config.strategy == ExecutionStrategy.BATCHED and config.online_batching
+        ):
+            tasks = [t for wave in waves for t in wave.tasks]
+            graph = DependencyGraph.from_tasks(tasks, on_unknown="ignore")
+            return _Plan([[t.name for t in tasks]], [], graph.dependencies)
+
+        if config.strategy == ExecutionStrategy.BATCHED:
+            aggregator = BatchAggregator(BatchConfig(
+                enabled=True,
+                max_batch_size=config.max_batch_size,
+                cross_wave_batching=config.cross_wave_batching,
+                packing=config.batch_packing,
+                tokens_per_minute=self.tokens_per_minute or 0,
+            ))
+            names = [[t.name for t in batch.tasks] for batch in aggregator.aggregate(waves)]
+            return _Plan(names, [len(group) for group in names], no_deps)
+
+        if config.strategy == ExecutionStrategy.OVERLAPPED:
+            threshold = config.overlap_threshold
+            open_after = [math.ceil(threshold * len(group) - 1e-9) for group in names]
+            return _Plan(names, open_after, no_deps)
+
+        return _Plan(names, [len(group) for group in names], no_deps)
+
+    def _sample_durations(
+        self,
+        tasks: Dict[str, AgentTask],
+        rng: Optional[random.Random],
+    ) -> Dict[str, float]:
+        """Expected durations, or a lognormal draw around them when ``rng`` is given."""
+        sampled: Dict[str, float] = {}
+        for name, task in tasks.items():
+            mean = self.durations.estimate_ms(task)
+            if rng is None or mean <= 0:
+                sampled[name] = mean
+                continue
+            std = self.durations.stddev_ms(task)
+            cv = std / mean if std is not None else DEFAULT_DURATION_CV
+            sigma2 = math.log(1 + cv * cv)
+            sampled[name] = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        return sampled
+
+    def _run_once(
+        self,
+        tasks: Dict[str, AgentTask],
+        plan: _Plan,
+        dispatch_key: Dict[str, Tuple],
+        slots: int,
+        durations: Dict[str, float],
+        tokens: Dict[str, Tuple[float, float]],
+    ) -> Tuple[float, int, float, int, int, float]:
+        """
+        Run the event loop once.
+
+        Returns:
+            Tuple of (makespan ms, peak concurrency, utilisation, peak RPM,
+            peak TPM, throttled ms)
+        """
+        clock = {"now": 0.0}
+
+        def now_s() -> float:
+            return clock["now"] / 1000
+
+        rpm, tpm = self.requests_per_minute, self.tokens_per_minute
+        request_bucket = TokenBucket(rpm, rpm / 60.0, now_s) if rpm else None
+        token_bucket = TokenBucket(tpm, tpm / 60.0, now_s) if tpm else None
+
+        group_of = {name: g for g, names in enumerate(plan.groups) for name in names}
+        successors: Dict[str, List[str]] = {name: [] for name in group_of}
+        remaining = {name: 0 for name in group_of}
+        for name, deps in plan.dependencies.items():
+            for dep in deps:
+                if dep in successors:
+                    successors[dep].append(name)
+                    remaining[name] += 1
+        finished_in_group = [0] * len(plan.groups)
+        opened = 0
+        ready: List[Tuple[Tuple, str]] = []
+        running: List[Tuple[float, int, str, float]] = []
+        starts: List[Tuple[float, float]] = []
+        admitted_at = 0.0
+        busy = throttled = 0.0
+        peak = 0
+        now = 0.0
+
+        def open_groups() -> None:
+            nonlocal opened
+            while opened < len(plan.groups) and (
+                opened == 0 or finished_in_group[opened - 1] >= plan.open_after[opened - 1]
+            ):
+                for name in plan.groups[opened]:
+                    if remaining[name] == 0:
+                        heapq.heappush(ready, (dispatch_key[name], name))
+                opened += 1
+
+        open_groups()
+        while ready or running:
+            while ready and len(running) < slots:
+                _, name = heapq.heappop(ready)
+                estimate = tasks[name].estimate_tokens()
+                if token_bucket is not None:
+                    estimate = min(estimate, int(token_bucket.capacity))
+
+                # The limiter admits in FIFO order; the task holds its slot meanwhile
+                start = clock["now"] = max(now, admitted_at)
+                wait = max(
+                    request_bucket.time_until(1) if request_bucket else 0.0,
+                    token_bucket.time_until(estimate) if token_bucket else 0.0,
+                )
+                start = clock["now"] = start + wait * 1000
+                if request_bucket:
+                    request_bucket.consume(1)
+                if token_bucket:
+                    token_bucket.consume(estimate)
+                admitted_at = start
+                throttled += start - now
+
+                used = sum(tokens[name])
+                starts.append((start, used))
+                heapq.heappush(running, (start + durations[name], len(starts), name, estimate - used))
+                busy += durations[name]
+                peak = max(peak, len(running))
+
+            now, _, name, refund = heapq.heappop(running)
+            if token_bucket is not None:
+                # Settle the pre-flight estimate against expected usage
+                clock["now"] = max(now, admitted_at)
+                if refund > 0:
+                    token_bucket.refund(refund)
+                else:
+                    token_bucket.consume(-refund)
+
+            group = group_of[name]
+            finished_in_group[group] += 1
+            for succ in successors[name]:
+                remaining[succ] -= 1
+                if remaining[succ] == 0 and group_of[succ] < opened:
+                    heapq.heappush(ready, (dispatch_key[succ], succ))
+            open_groups()
+
+        peak_rpm, peak_tpm = self._peak_window(starts)
+        utilisation = busy / (slots * now) if now > 0 else 0.0
+        return now, peak, min(1.0, utilisation), peak_rpm, peak_tpm, throttled
+
+    @staticmethod
+    def _peak_window(starts: List[Tuple[float, float]]) -> Tuple[int, int]:
+        """Most requests and tokens started within any 60 s window."""
+        starts = sorted(starts)
+        peak_requests = peak_tokens = 0
+        lo = 0
+        tokens = 0.0
+        for hi, (start, used) in enumerate(starts):
+            tokens += used
+            while starts[lo][0] <= start - WINDOW_MS:
+                tokens -= starts[lo][1]
+                lo += 1
+            peak_requests = max(peak_requests, hi - lo + 1)
+            peak_tokens = max(peak_tokens, int(tokens))
+        return peak_requests, peak_tokens
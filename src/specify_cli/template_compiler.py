@@ -11,6 +11,12 @@ Usage:
     # Compile single template
     python -m specify_cli.template_compiler --template commands/specify.md
 
+    # Recompile whenever a template or shared module changes
+    python -m specify_cli.template_compiler --watch
+
+    # Compile in 4 worker processes
+    python -m specify_cli.template_compiler --jobs 4
+
 Output:
     Creates .json files in compiled/ directory with:
     - Pre-parsed frontmatter and config
@@ -18,6 +24,13 @@ Output:
     - Source hash for cache invalidation
     - Fast path optimizations
 
+Incremental builds:
+    compiled/.manifest.json records the hash of every template and of each
+    file it includes. A template is recompiled only when one of them
+    changed; with ``jobs > 1`` the stale templates are compiled in a
+    process pool and the manifest is updated by the parent in template
+    order. Shared modules are read, hashed and expanded once per build.
+
 Performance:
     Before: 2-3s per template load (parsing, includes)
     After:  ~100ms per template load (JSON read)
@@ -28,22 +41,52 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 import yaml
 
-COMPILER_VERSION = "0.1.0"
+from .dag import DependencyGraph
+
+# Optional filesystem events for --watch (polling is used without watchdog)
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+COMPILER_VERSION = "0.2.0"
 SCHEMA_VERSION = "1.0"
+MANIFEST_FILE = ".manifest.json"
+
+# Files modified this recently are re-hashed even if size and mtime match:
+# a same-size rewrite within the filesystem's timestamp granularity would
+# otherwise go unnoticed
+RACY_MTIME_NS = 2_000_000_000
 
 
 @dataclass
 class CompilationResult:
-    """Result of compiling a single template."""
+    """
+    Result of compiling a single template.
+
+    Attributes:
+        up_to_date: The template and its includes were unchanged since the
+            last compilation, so it was not recompiled
+        written: The output file was (re)written; False when compilation
+            produced the same content as the existing output
+        fragment_hits: Includes served from the build's FragmentCache
+        fragment_misses: Includes that had to be read, stripped and hashed
+    """
 
     command: str
     source_file: Path
@@ -53,6 +96,103 @@ class CompilationResult:
     success: bool
     error: Optional[str] = None
     warnings: List[str] = field(default_factory=list)
+    up_to_date: bool = False
+    written: bool = False
+    fragment_hits: int = 0
+    fragment_misses: int = 0
+
+    @property
+    def fragment_hit_rate(self) -> float:
+        """Share of fragment lookups that were cache hits."""
+        lookups = self.fragment_hits + self.fragment_misses
+        return self.fragment_hits / lookups if lookups else 0.0
+
+
+@dataclass
+class Fragment:
+    """
+    An include file as read during one build.
+
+    Attributes:
+        content: File content with any frontmatter stripped
+        digest: sha256 of the raw file content
+        stamp: (size, mtime_ns) when the file was read
+        expansion: ``content`` with its includes resolved, once known to be
+            independent of the including template
+        targets: Include paths looked up while expanding (other than the
+            fragment itself); the expansion is valid wherever none of
+            them has been visited yet
+        visited: Files the expansion included
+        resolved_files: Include paths the expansion added, in order
+        missing: Include paths the expansion did not find
+    """
+
+    content: str
+    digest: str
+    stamp: Optional[Tuple[int, int]]
+    expansion: Optional[str] = None
+    targets: frozenset = frozenset()
+    visited: List[Path] = field(default_factory=list)
+    resolved_files: List[str] = field(default_factory=list)
+    missing: List[Path] = field(default_factory=list)
+
+
+class FragmentCache:
+    """
+    Include fragments of one build, keyed by resolved path.
+
+    An entry is reused while the file's size and mtime are unchanged;
+    ``clear()`` starts a new build. Files in ``file_cache`` are taken from
+    there instead of the disk.
+    """
+
+    def __init__(self, file_cache: Optional[Mapping[Path, str]] = None):
+        """
+        Args:
+            file_cache: Read-only file contents by resolved path
+        """
+        self.file_cache = file_cache or {}
+        self.fragments: Dict[Path, Fragment] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> Optional[Fragment]:
+        """Fragment for a resolved path (None if the file does not exist)."""
+        try:
+            stat = os.stat(path)
+            stamp: Optional[Tuple[int, int]] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            if path not in self.file_cache:
+                return None
+            stamp = None
+
+        fragment = self.fragments.get(path)
+        if fragment is not None and fragment.stamp == stamp:
+            self.hits += 1
+            return fragment
+
+        self.misses += 1
+        raw = self.file_cache.get(path)
+        if raw is None:
+            raw = path.read_text(encoding="utf-8")
+        fragment = Fragment(
+            content=strip_frontmatter(raw),
+            digest=hashlib.sha256(raw.encode("utf-8")).hexdigest(),
+            stamp=stamp,
+        )
+        self.fragments[path] = fragment
+        return fragment
+
+    def digest(self, path: Path) -> Optional[str]:
+        """sha256 of a file, from its fragment if already read (not counted as a lookup)."""
+        fragment = self.fragments.get(path)
+        if fragment is None:
+            fragment = self.get(path)
+        return fragment.digest if fragment is not None else None
+
+    def clear(self) -> None:
+        """Forget all fragments (counters are kept)."""
+        self.fragments.clear()
 
 
 class IncludeResolver:
@@ -60,21 +200,30 @@ class IncludeResolver:
     Resolves {{include: path}} directives in template content.
 
     Supports transitive resolution - includes within includes are resolved.
-    Tracks resolved files to prevent circular includes.
+    Tracks resolved files to prevent circular includes. After ``resolve``,
+    ``dependencies`` holds the absolute path of every file read and
+    ``missing`` every include path that did not exist.
     """
 
     INCLUDE_PATTERN = re.compile(r"\{\{include:\s*([^}]+)\}\}")
 
-    def __init__(self, shared_dir: Path):
+    def __init__(self, shared_dir: Path, file_cache: Optional[Mapping[Path, str]] = None):
         """
         Initialize resolver with shared modules directory.
 
         Args:
             shared_dir: Path to templates/shared/ directory
+            file_cache: Read-only contents of include files by resolved path
+                (see ``load_include_cache``); other files are read from disk
+                through ``self.fragments``
         """
         self.shared_dir = shared_dir
+        self.fragments = FragmentCache(file_cache)
         self._resolved_files: List[str] = []
         self._visited: set[Path] = set()
+        self._lookups: List[Path] = []
+        self.dependencies: List[Path] = []
+        self.missing: List[Path] = []
 
     def resolve(
         self, content: str, source_path: Path
@@ -91,6 +240,9 @@ class IncludeResolver:
         """
         self._resolved_files = []
         self._visited = {source_path.resolve()}
+        self._lookups = []
+        self.dependencies = []
+        self.missing = []
 
         resolved = self._resolve_includes(content, source_path.parent)
 
@@ -109,15 +261,19 @@ class IncludeResolver:
                 full_path = base_dir / include_path
 
             full_path = full_path.resolve()
+            self._lookups.append(full_path)
 
             # Prevent circular includes
             if full_path in self._visited:
                 return f"<!-- CIRCULAR INCLUDE: {include_path} -->"
 
-            if not full_path.exists():
+            fragment = self.fragments.get(full_path)
+            if fragment is None:
+                self.missing.append(full_path)
                 return f"<!-- INCLUDE NOT FOUND: {include_path} -->"
 
             self._visited.add(full_path)
+            self.dependencies.append(full_path)
             # Store relative path if possible, otherwise just the filename
             try:
                 rel_path = str(full_path.relative_to(self.shared_dir.parent))
@@ -126,24 +282,49 @@ class IncludeResolver:
                 rel_path = include_path
             self._resolved_files.append(rel_path)
 
-            # Read and recursively resolve
-            included_content = full_path.read_text(encoding="utf-8")
-
-            # Strip any frontmatter from included files
-            if included_content.startswith("---"):
-                lines = included_content.split("\n")
-                end_idx = None
-                for i, line in enumerate(lines[1:], start=1):
-                    if line.strip() == "---":
-                        end_idx = i
-                        break
-                if end_idx:
-                    included_content = "\n".join(lines[end_idx + 1:])
-
-            return self._resolve_includes(included_content, full_path.parent)
+            return self._expand(fragment, full_path)
 
         return self.INCLUDE_PATTERN.sub(replace_include, content)
 
+    def _expand(self, fragment: Fragment, full_path: Path) -> str:
+        """Resolve a fragment's includes, reusing an earlier expansion if still valid."""
+        if fragment.expansion is not None and self._visited.isdisjoint(fragment.targets):
+            self._lookups.extend(fragment.targets)
+            self._visited.update(fragment.visited)
+            self.dependencies.extend(fragment.visited)
+            self._resolved_files.extend(fragment.resolved_files)
+            self.missing.extend(fragment.missing)
+            return fragment.expansion
+
+        lookups = len(self._lookups)
+        dependencies = len(self.dependencies)
+        resolved_files = len(self._resolved_files)
+        missing = len(self.missing)
+
+        expansion = self._resolve_includes(fragment.content, full_path.parent)
+
+        # Keep the expansion unless files visited before it changed its outcome
+        visited = self.dependencies[dependencies:]
+        targets = frozenset(self._lookups[lookups:]) - {full_path}
+        added = set(visited)
+        if all(path in added or path not in self._visited for path in targets):
+            fragment.expansion = expansion
+            fragment.targets = targets
+            fragment.visited = visited
+            fragment.resolved_files = self._resolved_files[resolved_files:]
+            fragment.missing = self.missing[missing:]
+        return expansion
+
+
+def strip_frontmatter(content: str) -> str:
+    """Remove YAML frontmatter from an included file."""
+    if content.startswith("---"):
+        lines = content.split("\n")
+        for i, line in enumerate(lines[1:], start=1):
+            if line.strip() == "---":
+                return "\n".join(lines[i + 1:])
+    return content
+
 
 def parse_frontmatter(content: str) -> Optional[Dict[str, Any]]:
     """Extract YAML frontmatter from template content."""
@@ -183,11 +364,17 @@ def get_template_body(content: str) -> str:
     return content
 
 
-def compute_source_hash(content: str, includes: List[str], shared_dir: Path) -> str:
+def compute_source_hash(
+    content: str,
+    includes: List[str],
+    shared_dir: Path,
+    fragments: Optional[FragmentCache] = None,
+) -> str:
     """
     Compute SHA-256 hash of template content including all resolved includes.
 
     This hash changes when any source file changes, enabling cache invalidation.
+    Include digests are taken from ``fragments`` when given.
     """
     hasher = hashlib.sha256()
 
@@ -196,13 +383,162 @@ def compute_source_hash(content: str, includes: List[str], shared_dir: Path) ->
 
     # Hash included files
     for include_path in sorted(includes):
-        full_path = shared_dir.parent / include_path
-        if full_path.exists():
-            hasher.update(full_path.read_text(encoding="utf-8").encode("utf-8"))
+        full_path = (shared_dir.parent / include_path).resolve()
+        if fragments is not None:
+            digest = fragments.digest(full_path)
+        elif full_path.exists():
+            digest = hashlib.sha256(full_path.read_text(encoding="utf-8").encode("utf-8")).hexdigest()
+        else:
+            digest = None
+        if digest is not None:
+            hasher.update(digest.encode("ascii"))
 
     return f"sha256:{hasher.hexdigest()[:16]}"
 
 
+def load_include_cache(shared_dir: Path) -> Dict[Path, str]:
+    """Contents of every text file under the shared modules directory, by resolved path."""
+    cache: Dict[Path, str] = {}
+    if not shared_dir.exists():
+        return cache
+    for path in sorted(shared_dir.rglob("*")):
+        if path.is_file():
+            try:
+                cache[path.resolve()] = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                continue
+    return cache
+
+
+class CompilationManifest:
+    """
+    Record of the inputs each compiled template was built from.
+
+    Stored as JSON next to the compiled output. Paths are kept relative to
+    the manifest's directory so the output directory can be moved along
+    with its sources.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Load the manifest (an unreadable or outdated one counts as empty).
+
+        Args:
+            path: Manifest file, usually compiled/.manifest.json
+        """
+        self.path = path
+        self.root = path.parent.resolve()
+        self.templates: Dict[str, Dict[str, Any]] = {}
+        # path -> [size, mtime_ns, sha256]; reused while size and mtime match
+        # (and the mtime is not recent, see RACY_MTIME_NS)
+        self.files: Dict[str, List[Any]] = {}
+        self._dirty = False
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("compiler_version") == COMPILER_VERSION and data.get("schema_version") == SCHEMA_VERSION:
+            self.templates = data.get("templates", {})
+            self.files = data.get("files", {})
+
+    def _key(self, path: Path) -> str:
+        return os.path.relpath(Path(path).resolve(), self.root)
+
+    def digest(self, path: Path) -> Optional[str]:
+        """sha256 of a file (None if it does not exist)."""
+        key = self._key(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        cached = self.files.get(key)
+        racy = time.time_ns() - stat.st_mtime_ns < RACY_MTIME_NS
+        if cached and not racy and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        if cached != [stat.st_size, stat.st_mtime_ns, digest]:
+            self.files[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._dirty = True
+        return digest
+
+    def is_fresh(self, command: str, template_path: Path, output_file: Path) -> bool:
+        """Whether a template's output is still valid for its current inputs."""
+        entry = self.templates.get(command)
+        if entry is None or entry.get("source") != self._key(template_path):
+            return False
+        if "error" not in entry and (entry.get("output") != self._key(output_file) or not output_file.exists()):
+            return False
+        if entry.get("has_compressed") != template_path.with_suffix(".COMPRESSED.md").exists():
+            return False
+        for key, digest in entry.get("inputs", {}).items():
+            if self.digest(self.root / key) != digest:
+                return False
+        return not any((self.root / key).exists() for key in entry.get("missing", []))
+
+    def record(
+        self,
+        command: str,
+        template_path: Path,
+        output_file: Path,
+        result: CompilationResult,
+        dependencies: List[Path],
+        missing: List[Path],
+        has_compressed: bool,
+    ) -> None:
+        """Remember what a successful compilation was built from."""
+        inputs = {self._key(path): self.digest(path) for path in [template_path, *dependencies]}
+        self.templates[command] = {
+            "source": self._key(template_path),
+            "output": self._key(output_file),
+            "source_hash": result.source_hash,
+            "includes_resolved": result.includes_resolved,
+            "has_compressed": has_compressed,
+            "inputs": inputs,
+            "missing": sorted({self._key(path) for path in missing}),
+        }
+        self._dirty = True
+
+    def record_failure(self, command: str, template_path: Path, error: str) -> None:
+        """Remember that a template failed for reasons in the template itself."""
+        self.templates[command] = {
+            "source": self._key(template_path),
+            "error": error,
+            "has_compressed": template_path.with_suffix(".COMPRESSED.md").exists(),
+            "inputs": {self._key(template_path): self.digest(template_path)},
+        }
+        self._dirty = True
+
+    def forget(self, command: str) -> Optional[Dict[str, Any]]:
+        """Drop a template's entry (it will be compiled next time)."""
+        entry = self.templates.pop(command, None)
+        if entry is not None:
+            self._dirty = True
+        return entry
+
+    def watched_paths(self) -> List[Path]:
+        """Every input and missing include of every template."""
+        keys = {key for entry in self.templates.values() for key in entry.get("inputs", {})}
+        keys |= {key for entry in self.templates.values() for key in entry.get("missing", [])}
+        return [self.root / key for key in sorted(keys)]
+
+    def save(self) -> None:
+        """Write the manifest if it changed."""
+        if not self._dirty:
+            return
+        # Forget stat entries of files no template depends on any more
+        used = {key for entry in self.templates.values() for key in entry.get("inputs", {})}
+        self.files = {key: value for key, value in self.files.items() if key in used}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({
+            "compiler_version": COMPILER_VERSION,
+            "schema_version": SCHEMA_VERSION,
+            "templates": self.templates,
+            "files": self.files,
+        }, indent=2, sort_keys=True), encoding="utf-8")
+        self._dirty = False
+
+
 class TemplateCompiler:
     """
     Main compiler for template pre-compilation.
@@ -215,6 +551,7 @@ class TemplateCompiler:
         templates_dir: Path,
         shared_dir: Path,
         output_dir: Path,
+        file_cache: Optional[Mapping[Path, str]] = None,
     ):
         """
         Initialize compiler.
@@ -223,35 +560,173 @@ class TemplateCompiler:
             templates_dir: Path to templates/commands/
             shared_dir: Path to templates/shared/
             output_dir: Path to output compiled/ directory
+            file_cache: Read-only include contents (see ``load_include_cache``)
         """
         self.templates_dir = templates_dir
         self.shared_dir = shared_dir
         self.output_dir = output_dir
-        self.resolver = IncludeResolver(shared_dir)
+        self.resolver = IncludeResolver(shared_dir, file_cache)
+        self.manifest = CompilationManifest(output_dir / MANIFEST_FILE)
 
-    def compile_all(self) -> List[CompilationResult]:
+    def templates(self) -> List[Path]:
+        """Command templates to compile (COMPRESSED variants excluded)."""
+        return sorted(
+            p for p in self.templates_dir.glob("*.md")
+            if not p.name.endswith(".COMPRESSED.md")
+        )
+
+    def compile_all(self, force: bool = False, jobs: int = 1) -> List[CompilationResult]:
         """
         Compile all command templates to JSON.
 
+        Templates whose source, includes and COMPRESSED variant are
+        unchanged since the last run are not recompiled (see
+        CompilationManifest); a template that had no valid frontmatter
+        keeps failing without being parsed again until it changes.
+        Outputs of templates that no longer exist are removed.
+
+        Args:
+            force: Recompile every template regardless of the manifest
+            jobs: Worker processes for the templates that need compiling
+                (0 = CPU count); results are the same for any value
+
         Returns:
-            List of CompilationResult for each template
+            List of CompilationResult for each template, in template order
         """
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Fragments are shared by the templates of one build only
+        self.resolver.fragments.clear()
 
-        results: List[CompilationResult] = []
-
-        # Process non-COMPRESSED templates only
-        templates = sorted(
-            p for p in self.templates_dir.glob("*.md")
-            if not p.name.endswith(".COMPRESSED.md")
-        )
+        results: List[Optional[CompilationResult]] = []
+        stale: List[Tuple[int, Path]] = []
+        templates = self.templates()
 
         for template_path in templates:
-            result = self.compile_template(template_path)
-            results.append(result)
-
+            command = template_path.stem
+            output_file = self.output_dir / f"{command}.json"
+            if not force and self.manifest.is_fresh(command, template_path, output_file):
+                entry = self.manifest.templates[command]
+                results.append(CompilationResult(
+                    command=command,
+                    source_file=template_path,
+                    source_hash=entry.get("source_hash", ""),
+                    output_file=output_file,
+                    includes_resolved=entry.get("includes_resolved", []),
+                    success="error" not in entry,
+                    error=entry.get("error"),
+                    up_to_date=True,
+                ))
+            else:
+                stale.append((len(results), template_path))
+                results.append(None)
+
+        jobs = jobs or os.cpu_count() or 1
+        paths = [path for _, path in stale]
+        if jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(paths)),
+                initializer=_init_worker,
+                initargs=(self.templates_dir, self.shared_dir, self.output_dir,
+                          load_include_cache(self.shared_dir)),
+            ) as pool:
+                compiled = list(pool.map(_compile_in_worker, paths))
+        else:
+            compiled = [self._compile(path) for path in paths]
+
+        # Manifest updates happen here, in template order
+        for (index, template_path), (result, inputs) in zip(stale, compiled):
+            self._record(template_path, result, inputs)
+            results[index] = result
+
+        # Outputs of deleted templates
+        current = {p.stem for p in templates}
+        for command in [c for c in self.manifest.templates if c not in current]:
+            entry = self.manifest.forget(command)
+            orphan = self.manifest.root / entry["output"] if "output" in entry else None
+            if orphan is not None and orphan.exists():
+                orphan.unlink()
+
+        self.manifest.save()
         return results
 
+    def watch(
+        self,
+        on_compile: Optional[Callable[[List[CompilationResult]], None]] = None,
+        interval_s: float = 0.5,
+        stop: Optional[threading.Event] = None,
+        jobs: int = 1,
+    ) -> None:
+        """
+        Recompile whenever a template or one of its includes changes.
+
+        Uses watchdog filesystem events when the package is installed and
+        polls file stats every ``interval_s`` otherwise. Changes arriving
+        within ``interval_s`` of each other are compiled together.
+
+        Args:
+            on_compile: Called with the results of every compilation that
+                rebuilt at least one template (and once for the initial build)
+            interval_s: Polling interval and event debounce in seconds
+            stop: Set to end the loop (runs until interrupted otherwise)
+            jobs: Worker processes per compilation (see compile_all)
+        """
+        stop = stop or threading.Event()
+        # Snapshot first so changes made during the initial build are seen
+        snapshot = self._snapshot()
+        results = self.compile_all(jobs=jobs)
+        if on_compile:
+            on_compile(results)
+
+        changed = threading.Event()
+        observer = None
+        if WATCHDOG_AVAILABLE:
+            class Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if not event.is_directory:
+                        changed.set()
+
+            observer = Observer()
+            for directory in {self.templates_dir.resolve(), self.shared_dir.resolve()}:
+                if directory.exists():
+                    observer.schedule(Handler(), str(directory), recursive=True)
+            observer.start()
+
+        try:
+            while not stop.is_set():
+                if observer is not None:
+                    if not changed.wait(interval_s):
+                        continue
+                    # Debounce: let editors finish writing
+                    stop.wait(interval_s)
+                    changed.clear()
+                else:
+                    stop.wait(interval_s)
+                    current = self._snapshot()
+                    if current == snapshot:
+                        continue
+                    snapshot = current
+                results = self.compile_all(jobs=jobs)
+                if on_compile and any(not r.up_to_date for r in results):
+                    on_compile(results)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """(size, mtime) of templates, shared modules and manifest inputs."""
+        paths = set(self.templates_dir.glob("*.md")) | set(self.manifest.watched_paths())
+        if self.shared_dir.exists():
+            paths |= {p for p in self.shared_dir.rglob("*") if p.is_file()}
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path)] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
     def compile_template(self, template_path: Path) -> CompilationResult:
         """
         Compile a single template to JSON.
@@ -262,8 +737,37 @@ class TemplateCompiler:
         Returns:
             CompilationResult with success status and output info
         """
+        result, inputs = self._compile(template_path)
+        self._record(template_path, result, inputs)
+        return result
+
+    def _record(
+        self,
+        template_path: Path,
+        result: CompilationResult,
+        inputs: Optional[Dict[str, Any]],
+    ) -> None:
+        """Update the manifest from the outcome of ``_compile``."""
+        if inputs is None:
+            self.manifest.forget(result.command)
+        elif "error" in inputs:
+            self.manifest.record_failure(result.command, template_path, inputs["error"])
+        else:
+            self.manifest.record(result.command, template_path, result.output_file, result, **inputs)
+
+    def _compile(self, template_path: Path) -> Tuple[CompilationResult, Optional[Dict[str, Any]]]:
+        """
+        Compile a template and write its output, without touching the manifest.
+
+        Returns:
+            The result and what the manifest should record: the inputs read
+            (``dependencies``, ``missing``, ``has_compressed``), ``error``
+            for a template that is invalid in itself, or None to forget it
+        """
         command = template_path.stem
         output_file = self.output_dir / f"{command}.json"
+        fragments = self.resolver.fragments
+        hits, misses = fragments.hits, fragments.misses
 
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -274,6 +778,7 @@ class TemplateCompiler:
             # Parse frontmatter
             frontmatter = parse_frontmatter(content)
             if frontmatter is None:
+                error = "No valid YAML frontmatter found"
                 return CompilationResult(
                     command=command,
                     source_file=template_path,
@@ -281,8 +786,8 @@ class TemplateCompiler:
                     output_file=output_file,
                     includes_resolved=[],
                     success=False,
-                    error="No valid YAML frontmatter found",
-                )
+                    error=error,
+                ), {"error": error}
 
             # Get template body
             body = get_template_body(content)
@@ -291,7 +796,7 @@ class TemplateCompiler:
             resolved_body, includes = self.resolver.resolve(body, template_path)
 
             # Compute source hash
-            source_hash = compute_source_hash(content, includes, self.shared_dir)
+            source_hash = compute_source_hash(content, includes, self.shared_dir, fragments)
 
             # Check for COMPRESSED variant
             compressed_path = template_path.with_suffix(".COMPRESSED.md")
@@ -308,11 +813,8 @@ class TemplateCompiler:
                 has_compressed=has_compressed,
             )
 
-            # Write output
-            output_file.write_text(
-                json.dumps(compiled, indent=2, ensure_ascii=False),
-                encoding="utf-8"
-            )
+            # Write output (unless only the compilation time would change)
+            written = self._write_output(output_file, compiled)
 
             return CompilationResult(
                 command=command,
@@ -321,7 +823,14 @@ class TemplateCompiler:
                 output_file=output_file,
                 includes_resolved=includes,
                 success=True,
-            )
+                written=written,
+                fragment_hits=fragments.hits - hits,
+                fragment_misses=fragments.misses - misses,
+            ), {
+                "dependencies": list(self.resolver.dependencies),
+                "missing": list(self.resolver.missing),
+                "has_compressed": has_compressed,
+            }
 
         except Exception as e:
             return CompilationResult(
@@ -332,7 +841,31 @@ class TemplateCompiler:
                 includes_resolved=[],
                 success=False,
                 error=str(e),
-            )
+            ), None
+
+    def _write_output(self, output_file: Path, compiled: Dict[str, Any]) -> bool:
+        """
+        Write compiled JSON unless the existing file matches it.
+
+        ``meta.compiled_at`` is ignored in the comparison, so recompiling
+        unchanged inputs leaves the file (and its mtime) alone.
+
+        Returns:
+            True if the file was written
+        """
+        try:
+            existing = json.loads(output_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            existing = None
+        if isinstance(existing, dict) and isinstance(existing.get("meta"), dict):
+            previous = dict(existing, meta={**existing["meta"], "compiled_at": None})
+            if previous == dict(compiled, meta={**compiled["meta"], "compiled_at": None}):
+                return False
+        output_file.write_text(
+            json.dumps(compiled, indent=2, ensure_ascii=False),
+            encoding="utf-8"
+        )
+        return True
 
     def _build_compiled_structure(
         self,
@@ -421,39 +954,21 @@ class TemplateCompiler:
         """
         Compute wave assignments for subagents based on dependencies.
 
+        Dependencies on roles that are not defined in the template do not
+        delay a subagent.
+
         Returns:
             Dict mapping role names to wave numbers (0-indexed)
-        """
-        assignments: Dict[str, int] = {}
 
-        # Build dependency graph
+        Raises:
+            CycleError: If the subagent dependencies contain a cycle
+        """
         roles = {agent.get("role", f"agent-{i}"): agent for i, agent in enumerate(subagents)}
-
-        # Simple topological sort for wave assignment
-        remaining = set(roles.keys())
-        wave = 0
-
-        while remaining:
-            # Find agents with no unresolved dependencies
-            ready = []
-            for role in remaining:
-                deps = roles[role].get("depends_on", []) or []
-                if all(d not in remaining for d in deps):
-                    ready.append(role)
-
-            if not ready:
-                # Circular dependency - assign remaining to next wave
-                for role in remaining:
-                    assignments[role] = wave
-                break
-
-            for role in ready:
-                assignments[role] = wave
-                remaining.remove(role)
-
-            wave += 1
-
-        return assignments
+        graph = DependencyGraph(
+            {role: agent.get("depends_on") for role, agent in roles.items()},
+            on_unknown="ignore",
+        )
+        return graph.levels()
 
     def _extract_sections(self, body: str) -> Dict[str, str]:
         """
@@ -511,6 +1026,26 @@ class TemplateCompiler:
         return fast_paths
 
 
+# Compiler of a worker process in parallel builds (set by _init_worker)
+_WORKER_COMPILER: Optional[TemplateCompiler] = None
+
+
+def _init_worker(
+    templates_dir: Path,
+    shared_dir: Path,
+    output_dir: Path,
+    file_cache: Dict[Path, str],
+) -> None:
+    global _WORKER_COMPILER
+    _WORKER_COMPILER = TemplateCompiler(templates_dir, shared_dir, output_dir, file_cache=file_cache)
+
+
+def _compile_in_worker(template_path: Path) -> Tuple[CompilationResult, Optional[Dict[str, Any]]]:
+    if _WORKER_COMPILER is None:
+        raise RuntimeError("Template compiler worker not initialised (_init_worker did not run)")
+    return _WORKER_COMPILER._compile(template_path)
+
+
 def main():
     """CLI entry point for template compilation."""
     parser = argparse.ArgumentParser(
@@ -539,6 +1074,29 @@ def main():
         type=str,
         help="Compile single template (relative path)",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompile every template, ignoring the manifest",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and recompile when templates or shared modules change",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Compile in N worker processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval / debounce for --watch in seconds",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -558,6 +1116,7 @@ def main():
         # Compile single template
         template_path = args.templates_dir / args.template
         result = compiler.compile_template(template_path)
+        compiler.manifest.save()
 
         if result.success:
             print(f"Compiled: {result.command} -> {result.output_file}")
@@ -566,24 +1125,48 @@ def main():
         else:
             print(f"FAILED: {result.command} - {result.error}", file=sys.stderr)
             sys.exit(1)
+    elif args.watch:
+        print(f"Watching {args.templates_dir} and {args.shared_dir} (Ctrl+C to stop)")
+        try:
+            compiler.watch(
+                on_compile=lambda results: report_results(results, args.verbose),
+                interval_s=args.interval,
+                jobs=args.jobs,
+            )
+        except KeyboardInterrupt:
+            pass
     else:
         # Compile all templates
-        results = compiler.compile_all()
+        results = compiler.compile_all(force=args.force, jobs=args.jobs)
+        if not report_results(results, args.verbose):
+            sys.exit(1)
 
-        success_count = sum(1 for r in results if r.success)
-        fail_count = len(results) - success_count
 
-        print(f"\nCompilation complete: {success_count} succeeded, {fail_count} failed")
+def report_results(results: List[CompilationResult], verbose: bool = False) -> bool:
+    """Print a compilation summary; returns True if every template compiled."""
+    success_count = sum(1 for r in results if r.success)
+    fail_count = len(results) - success_count
+    up_to_date = sum(1 for r in results if r.up_to_date)
+    unchanged = sum(1 for r in results if r.success and not r.up_to_date and not r.written)
 
-        for result in results:
-            if result.success:
-                if args.verbose:
-                    print(f"  {result.command}: {result.source_hash}")
-            else:
-                print(f"  FAILED {result.command}: {result.error}", file=sys.stderr)
+    print(
+        f"\n[{time.strftime('%H:%M:%S')}] Compilation complete: {success_count} succeeded, "
+        f"{fail_count} failed ({up_to_date} up to date, {unchanged} unchanged)"
+    )
 
-        if fail_count > 0:
-            sys.exit(1)
+    for result in results:
+        if result.success:
+            if verbose and not result.up_to_date:
+                print(f"  {result.command}: {result.source_hash}")
+        else:
+            print(f"  FAILED {result.command}: {result.error}", file=sys.stderr)
+
+    hits = sum(r.fragment_hits for r in results)
+    lookups = hits + sum(r.fragment_misses for r in results)
+    if verbose and lookups:
+        print(f"  Include fragments: {hits}/{lookups} includes cached ({hits / lookups:.0%})")
+
+    return fail_count == 0
 
 
 if __name__ == "__main__":
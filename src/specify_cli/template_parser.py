@@ -12,6 +12,9 @@ Template Structure:
       model: opus
       orchestration:
         max_parallel: 3
+        batch_packing: tokens                    # optional, count | tokens
+        online_batching: true                    # optional, batches form as tasks become ready
+        batch_timeout_ms: 100                    # optional, online batch fill window
         wave_overlap:
           enabled: true
           overlap_threshold: 0.80
@@ -23,6 +26,13 @@ Template Structure:
           priority: 10
           prompt: "Analyze the code..."
           model_override: sonnet
+          partial_output_ready: "## Interfaces"   # optional, streaming mode
+          stop_when: "</analysis>"               # optional, streaming mode
+        - role: generator
+          depends_on: [analyzer]
+          context_from:                          # optional, upstream outputs
+            analyzer: "section:Interfaces"       #   full | summary | section:<heading>
+          context_budget: 2000                   # optional, tokens
     ---
     # Template content...
     ```
@@ -38,13 +48,16 @@ Usage:
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 
 from .agent_pool import AgentTask, ModelTier
+from .dag import normalize_dependencies
+from .dependency_context import parse_context_edges
+from .lanes import LaneConfig
 from .wave_scheduler import WaveConfig, ExecutionStrategy
 
 
@@ -88,6 +101,8 @@ class TemplateConfig:
         subagents: List of subagent definitions
         phases: Named execution phases with model overrides
         raw_frontmatter: Original parsed YAML frontmatter
+        lanes: Per-model-tier lane budgets from ``orchestration.lanes``
+        role_group_weights: Fair-queueing weights from ``orchestration.role_group_weights``
     """
     description: str
     default_model: str
@@ -95,6 +110,8 @@ class TemplateConfig:
     subagents: List[Dict[str, Any]]
     phases: Dict[str, Dict[str, Any]]
     raw_frontmatter: Dict[str, Any]
+    lanes: Dict[str, LaneConfig] = field(default_factory=dict)
+    role_group_weights: Dict[str, float] = field(default_factory=dict)
 
 
 def parse_frontmatter(content: str) -> Optional[Dict[str, Any]]:
@@ -177,6 +194,12 @@ def parse_template_config(template_path: Path) -> TemplateConfig:
         ),
         fail_fast=True,
         timeout_per_task_ms=orchestration.get("timeout_per_agent"),
+        timeout_total_ms=orchestration.get("timeout_total"),
+        critical_path_priority=bool(orchestration.get("critical_path_priority", False)),
+        context_budget_tokens=int(orchestration.get("context_budget", 4000)),
+        batch_packing=orchestration.get("batch_packing", "count"),
+        online_batching=bool(orchestration.get("online_batching", False)),
+        batch_timeout_ms=orchestration.get("batch_timeout_ms"),
     )
 
     # Subagents
@@ -185,6 +208,16 @@ def parse_template_config(template_path: Path) -> TemplateConfig:
     # Phases (for phase-specific model overrides)
     phases = claude_code.get("phases", {})
 
+    # Per-tier lanes, e.g. lanes: {opus: {max_parallel: 2, tokens_per_minute: 40000}}
+    lanes = {
+        tier: LaneConfig.from_dict(lane or {})
+        for tier, lane in (orchestration.get("lanes") or {}).items()
+    }
+    role_group_weights = {
+        group: float(weight)
+        for group, weight in (orchestration.get("role_group_weights") or {}).items()
+    }
+
     return TemplateConfig(
         description=frontmatter.get("description", ""),
         default_model=default_model,
@@ -192,6 +225,8 @@ def parse_template_config(template_path: Path) -> TemplateConfig:
         subagents=subagents,
         phases=phases,
         raw_frontmatter=frontmatter,
+        lanes=lanes,
+        role_group_weights=role_group_weights,
     )
 
 
@@ -266,10 +301,51 @@ def resolve_model(
     return resolved_model
 
 
+def load_feature_artifacts(project_root: Path, feature: str) -> Dict[str, str]:
+    """
+    Read the artifacts every subagent of a feature works from.
+
+    Loads spec.md and plan.md from ``specs/<feature>/`` and the project
+    constitution from ``memory/constitution.md``. Missing files are left out.
+
+    Args:
+        project_root: Path to project root directory
+        feature: Feature identifier (e.g., "001-user-auth")
+
+    Returns:
+        Mapping of artifact filename to content
+    """
+    candidates = {
+        "spec.md": project_root / "specs" / feature / "spec.md",
+        "plan.md": project_root / "specs" / feature / "plan.md",
+        "constitution.md": project_root / "memory" / "constitution.md",
+    }
+    artifacts = {}
+    for filename, path in candidates.items():
+        if path.is_file():
+            artifacts[filename] = path.read_text(encoding="utf-8")
+    return artifacts
+
+
+def _artifact_blocks(artifacts: Optional[Dict[str, str]]) -> List[str]:
+    """Render artifacts as ``<artifact>`` blocks in filename order."""
+    lines: List[str] = []
+    for filename in sorted(artifacts or {}):
+        content = artifacts[filename]
+        if not content:
+            continue
+        lines.append("")
+        lines.append(f"<artifact name=\"{filename}\">")
+        lines.append(content.rstrip())
+        lines.append("</artifact>")
+    return lines
+
+
 def build_prompt_with_context(
     base_prompt: str,
     feature: str,
-    context: Optional[Dict[str, Any]] = None
+    context: Optional[Dict[str, Any]] = None,
+    artifacts: Optional[Dict[str, str]] = None,
 ) -> str:
     """
     Build a complete prompt with feature context.
@@ -278,6 +354,7 @@ def build_prompt_with_context(
         base_prompt: The base prompt from template
         feature: Feature identifier (e.g., "001-user-auth")
         context: Additional context to inject
+        artifacts: Mapping of artifact filename to content, appended last
 
     Returns:
         Complete prompt string
@@ -294,14 +371,51 @@ def build_prompt_with_context(
         for key, value in context.items():
             prompt_parts.append(f"  {key}: {value}")
 
+    prompt_parts.extend(_artifact_blocks(artifacts))
+
     return "\n".join(prompt_parts)
 
 
+def build_shared_prefix(
+    feature: str,
+    context: Optional[Dict[str, Any]] = None,
+    artifacts: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Build the preamble shared by every subagent of a command.
+
+    The prefix is identical across agents (feature header, context, then
+    artifacts in a stable order), so it can be sent as a cached content
+    block and billed at the cache-read rate after the first call.
+
+    Args:
+        feature: Feature identifier (e.g., "001-user-auth")
+        context: Additional context to inject
+        artifacts: Mapping of artifact filename to content (spec.md, plan.md, ...)
+
+    Returns:
+        Shared prefix string
+    """
+    prefix_parts = [f"Feature: {feature}"]
+
+    if context:
+        prefix_parts.append("")
+        prefix_parts.append("Additional Context:")
+        for key, value in context.items():
+            prefix_parts.append(f"  {key}: {value}")
+
+    prefix_parts.extend(_artifact_blocks(artifacts))
+
+    return "\n".join(prefix_parts)
+
+
 def parse_subagents_from_template(
     template_path: Path,
     feature: str,
     context: Optional[Dict[str, Any]] = None,
     filter_parallel: bool = True,
+    artifacts: Optional[Dict[str, str]] = None,
+    cache_shared_prefix: bool = False,
 ) -> List[AgentTask]:
     """
     Extract subagent definitions from template YAML frontmatter.
@@ -314,6 +428,12 @@ def parse_subagents_from_template(
         feature: Feature identifier for prompt context
         context: Additional context to inject into prompts
         filter_parallel: If True, only return agents marked parallel=true
+        artifacts: Feature artifacts (spec.md, plan.md, constitution.md, ...)
+            to include in every prompt
+        cache_shared_prefix: If True, send feature header, context and
+            artifacts as ``AgentTask.prompt_prefix`` so the pool can cache it
+            (use with ``PoolConfig.prompt_caching``); otherwise inline
+            everything into ``prompt``
 
     Returns:
         List of AgentTask objects
@@ -333,6 +453,10 @@ def parse_subagents_from_template(
     max_model = read_max_model_from_constitution(Path.cwd())
 
     tasks: List[AgentTask] = []
+    shared_prefix = (
+        build_shared_prefix(feature, context, artifacts)
+        if cache_shared_prefix else None
+    )
 
     for agent_def in config.subagents:
         # Skip non-parallel agents if filtering
@@ -348,20 +472,39 @@ def parse_subagents_from_template(
 
         # Build prompt with context
         base_prompt = agent_def.get("prompt", f"Execute {agent_def.get('role', 'unknown')}")
-        prompt = build_prompt_with_context(base_prompt, feature, context)
+        if shared_prefix is not None:
+            prompt = base_prompt
+        else:
+            prompt = build_prompt_with_context(base_prompt, feature, context, artifacts)
 
         # Extract dependencies
         depends_on = agent_def.get("depends_on", [])
         if depends_on is None:
             depends_on = []
 
+        name = agent_def.get("role", f"agent-{len(tasks)}")
+        context_from = agent_def.get("context_from") or {}
+        outside = [
+            edge.source for edge in parse_context_edges(context_from)
+            if edge.source not in normalize_dependencies(depends_on)
+        ]
+        if outside:
+            raise ValueError(
+                f"Subagent '{name}': context_from sources must be listed in depends_on: {outside}"
+            )
+
         task = AgentTask(
-            name=agent_def.get("role", f"agent-{len(tasks)}"),
+            name=name,
             prompt=prompt,
             model=model,
             depends_on=depends_on,
             priority=agent_def.get("priority", 5),
             role_group=agent_def.get("role_group", "DEFAULT"),
+            prompt_prefix=shared_prefix,
+            stop_pattern=agent_def.get("stop_when"),
+            partial_ready_pattern=agent_def.get("partial_output_ready"),
+            context_from=context_from,
+            context_budget_tokens=agent_def.get("context_budget"),
             metadata={
                 "trigger": agent_def.get("trigger"),
                 "template": str(template_path),
@@ -0,0 +1,375 @@
+"""
+Span-based tracing and metrics for orchestrated runs.
+
+Records nested spans for the stages of a run (waves, tasks, slot and
+rate-limit waits, API attempts, backoff) together with run metrics, and
+exports them as a Chrome trace and in Prometheus text format. A disabled
+tracer records nothing.
+
+Usage:
+    tracer = Tracer()
+    pool = DistributedAgentPool(config=config, tracer=tracer)
+    scheduler = WaveScheduler(pool, tracer=tracer)
+    await scheduler.execute_all(tasks)
+    tracer.write_chrome_trace(".specify/traces/run.json")
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+
+DEFAULT_TRACE_DIR = Path(".specify") / "traces"
+
+# Histogram bucket upper bounds in seconds (API calls run up to minutes)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+RATE_BUCKETS: Tuple[float, ...] = (5.0, 10.0, 20.0, 40.0, 60.0, 80.0, 120.0, 200.0)
+
+# Name, type and help text of every metric the orchestrator records
+METRICS: Dict[str, Tuple[str, str]] = {
+    "specify_run_duration_seconds": ("gauge", "Wall time of the run"),
+    "specify_tasks_total": ("counter", "Finished tasks by status and model tier"),
+    "specify_task_duration_seconds": ("histogram", "Task wall time in the pool, including waits and retries"),
+    "specify_queue_wait_seconds": ("histogram", "Time a ready task waited for dispatch by the scheduler"),
+    "specify_slot_wait_seconds": ("histogram", "Time a task waited for a lane slot (concurrency semaphore)"),
+    "specify_rate_limit_wait_seconds": ("histogram", "Time an attempt waited for the RPM/TPM rate limiter"),
+    "specify_api_attempts_total": ("counter", "API attempts by model tier and outcome"),
+    "specify_api_attempt_seconds": ("histogram", "Duration of single API attempts"),
+    "specify_retries_total": ("counter", "Retried API attempts by model tier"),
+    "specify_backoff_seconds_total": ("counter", "Time spent sleeping between retries"),
+    "specify_ttfb_seconds": ("histogram", "Time to first streamed token"),
+    "specify_output_tokens_per_second": ("histogram", "Output tokens per second of successful attempts"),
+    "specify_tokens_total": ("counter", "Tokens used by direction and model tier"),
+    "specify_test_verification_seconds": ("histogram", "Duration of test verification subprocesses"),
+}
+
+_BUCKETS: Dict[str, Tuple[float, ...]] = {"specify_output_tokens_per_second": RATE_BUCKETS}
+
+# Span categories that get their own Chrome trace tracks, with track labels
+TRACK_CATEGORIES: Dict[str, str] = {"wave": "waves", "task": "slot"}
+
+
+@dataclass
+class Span:
+    """
+    One timed stage of a run.
+
+    Attributes:
+        name: Span name, e.g. "task", "api_attempt"
+        category: Grouping for trace viewers ("run", "wave", "task", "api",
+            "wait", "verify", or "stage" for anything else)
+        span_id: Unique id within the tracer
+        parent_id: Enclosing span, or None for the root
+        start_s: Start on the tracer clock (seconds)
+        end_s: End on the tracer clock, or None while open
+        attributes: Extra details shown with the span (task name, tokens, ...)
+    """
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    start_s: float
+    end_s: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_s(self) -> float:
+        """Duration in seconds (0.0 while the span is open)."""
+        return (self.end_s - self.start_s) if self.end_s is not None else 0.0
+
+
+class _Histogram:
+    """Cumulative Prometheus histogram of one label set."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Tracer:
+    """
+    Collects spans and metrics of one run.
+
+    Not thread-safe; meant for the single event loop of an orchestrated run.
+
+    Attributes:
+        enabled: Whether anything is recorded
+        spans: Finished and open spans in start order
+    """
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled: Record spans and metrics (False makes every call a no-op)
+            clock: Monotonic time source in seconds (injectable for tests)
+        """
+        self.enabled = enabled
+        self.clock = clock
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._current: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+            f"specify_span_{id(self)}", default=None
+        )
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    # ------------------------------------------------------------------ spans
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block as a child of the current span.
+
+        Spans opened in asyncio tasks created inside the block become its
+        children too. Yields the Span so the block can add attributes (a
+        detached one when disabled); an escaping exception is recorded as
+        ``error``.
+        """
+        if not self.enabled:
+            yield Span(name, category, 0, None, 0.0)
+            return
+        span = self._open(name, category, self._current.get(), attributes)
+        token = self._current.set(span.span_id)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            span.end_s = self.clock()
+            self._current.reset(token)
+
+    def record_span(
+        self,
+        name: str,
+        category: str,
+        start_s: float,
+        end_s: float,
+        **attributes: Any,
+    ) -> Optional[Span]:
+        """Add an already finished span (e.g. a wait measured by the caller) under the current span."""
+        if not self.enabled:
+            return None
+        span = self._open(name, category, self._current.get(), attributes, start_s)
+        span.end_s = end_s
+        return span
+
+    def now(self) -> float:
+        """Current time on the tracer clock."""
+        return self.clock()
+
+    def _open(
+        self,
+        name: str,
+        category: str,
+        parent_id: Optional[int],
+        attributes: Dict[str, Any],
+        start_s: Optional[float] = None,
+    ) -> Span:
+        span = Span(
+            name=name,
+            category=category,
+            span_id=next(self._ids),
+            parent_id=parent_id,
+            start_s=self.clock() if start_s is None else start_s,
+            attributes={k: v for k, v in attributes.items() if v is not None},
+        )
+        self.spans.append(span)
+        return span
+
+    # ---------------------------------------------------------------- metrics
+
+    def increment(self, metric: str, value: float = 1.0, **labels: Any) -> None:
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        series = self._counters.setdefault(metric, {})
+        key = self._label_key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, metric: str, value: float, **labels: Any) -> None:
+        """Set a gauge."""
+        if self.enabled:
+            self._gauges.setdefault(metric, {})[self._label_key(labels)] = value
+
+    def observe(self, metric: str, value: float, **labels: Any) -> None:
+        """Add a sample to a histogram."""
+        if not self.enabled:
+            return
+        series = self._histograms.setdefault(metric, {})
+        key = self._label_key(labels)
+        if key not in series:
+            series[key] = _Histogram(_BUCKETS.get(metric, DEFAULT_BUCKETS))
+        series[key].observe(value)
+
+    def counter_value(self, metric: str, **labels: Any) -> float:
+        """Current value of a counter (summed over all label sets if no labels are given)."""
+        series = self._counters.get(metric, {})
+        if labels:
+            return series.get(self._label_key(labels), 0.0)
+        return sum(series.values())
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+    # ---------------------------------------------------------------- export
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Spans as Chrome trace events (JSON object format).
+
+        Complete events on one track must nest, so spans that may overlap
+        get their own tracks: every task span (with its children) goes on
+        the lowest-numbered "slot" track free when it starts, every wave or
+        batch span on a "waves" track likewise, and the rest on "scheduler".
+        """
+        origin = min((s.start_s for s in self.spans), default=0.0)
+        end_now = self.clock()
+        by_id = {s.span_id: s for s in self.spans}
+
+        def end_of(span: Span) -> float:
+            return span.end_s if span.end_s is not None else end_now
+
+        def track_root(span: Optional[Span]) -> Optional[Span]:
+            while span is not None and span.category not in TRACK_CATEGORIES:
+                span = by_id.get(span.parent_id) if span.parent_id is not None else None
+            return span
+
+        # Greedy interval partitioning of track roots, per category
+        tracks: Dict[int, Tuple[str, int]] = {}
+        free_at: Dict[str, List[float]] = {category: [] for category in TRACK_CATEGORIES}
+        for span in sorted(self.spans, key=lambda s: (s.start_s, s.span_id)):
+            if span.category not in TRACK_CATEGORIES:
+                continue
+            lanes = free_at[span.category]
+            for index, busy_until in enumerate(lanes):
+                if busy_until <= span.start_s:
+                    break
+            else:
+                index = len(lanes)
+                lanes.append(0.0)
+            lanes[index] = end_of(span)
+            tracks[span.span_id] = (span.category, index)
+
+        tids: Dict[Tuple[str, int], int] = {}
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "specify orchestrate"}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "scheduler"}},
+        ]
+        for category in TRACK_CATEGORIES:
+            for index in range(len(free_at[category])):
+                tid = tids[(category, index)] = len(tids) + 1
+                label = TRACK_CATEGORIES[category]
+                events.append({
+                    "name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                    "args": {"name": f"{label} {index + 1}"},
+                })
+
+        for span in self.spans:
+            root = track_root(span)
+            events.append({
+                "name": span.attributes.get("task", span.name) if span.category == "task" else span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start_s - origin) * 1_000_000, 3),
+                "dur": round((end_of(span) - span.start_s) * 1_000_000, 3),
+                "pid": 1,
+                "tid": tids[tracks[root.span_id]] if root is not None else 0,
+                "args": {
+                    **{k: _json_value(v) for k, v in span.attributes.items()},
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                },
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        names = sorted(set(self._counters) | set(self._gauges) | set(self._histograms))
+        for name in names:
+            kind, help_text = METRICS.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(self._counters.get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for key, value in sorted(self._gauges.get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for key, histogram in sorted(self._histograms.get(name, {}).items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> Path:
+        """Write the Chrome trace JSON, creating parent directories. Returns the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return path
+
+    def write_prometheus(self, path: Union[str, Path]) -> Path:
+        """Write the Prometheus metrics, creating parent directories. Returns the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_prometheus(), encoding="utf-8")
+        return path
+
+    def breakdown(self) -> Dict[str, float]:
+        """Total seconds per span name, e.g. for "where did the time go" summaries."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_s
+        return totals
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (
+        k + '="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in key
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
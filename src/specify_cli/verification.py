@@ -0,0 +1,457 @@
+"""
+Bounded executor for TDD red-phase test verification.
+
+Runs test processes through a worker limit sized to the CPU count,
+detects the test framework once per project root and memoises outcomes
+by test file and project tree, so re-verifying an unchanged test costs
+nothing. The tree hash is computed off the event loop and kept until
+``invalidate_tree()`` is called.
+
+Usage:
+    executor = VerificationExecutor()
+    result = await executor.verify("tests/test_auth.py", project_root, timeout_ms=30000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+
+# Directories whose contents do not affect test outcomes (or that test runs write to)
+TREE_HASH_EXCLUDED_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".specify", ".venv", "venv", "node_modules",
+    "__pycache__", ".pytest_cache", ".mypy_cache", ".ruff_cache", ".tox", ".nox",
+    "dist", "build", "coverage", ".next",
+})
+TREE_HASH_EXCLUDED_FILES = frozenset({".coverage", ".DS_Store"})
+
+
+@dataclass
+class TestVerificationResult:
+    """
+    Result of running actual test verification.
+
+    Captures whether the test was executed and whether it failed (TDD Red).
+
+    Attributes:
+        test_ran: Whether the test was actually executed
+        test_failed: True if test failed (TDD Red confirmed)
+        exit_code: Process exit code from test runner
+        stdout: Standard output from test runner
+        stderr: Standard error from test runner
+        duration_ms: How long the test took to run
+        test_file: Path to the test file
+        error: Error message if verification couldn't complete
+        cached: Whether the outcome was reused from an earlier run of the
+            same test against the same tree
+    """
+    test_ran: bool
+    test_failed: bool  # True = TDD Red confirmed
+    exit_code: int
+    stdout: str
+    stderr: str
+    duration_ms: int
+    test_file: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+class TestFrameworkDetector:
+    """
+    Detect test framework and generate appropriate test commands.
+
+    Supports Python (pytest), TypeScript/JavaScript (jest/vitest), and Go.
+    """
+
+    FRAMEWORKS: Dict[str, Dict[str, Any]] = {
+        "python": {
+            "detect": ["pyproject.toml", "pytest.ini", "setup.py", "setup.cfg", "tox.ini"],
+            "command": ["pytest", "{test_file}", "-v", "--tb=short", "-x"],
+            "fail_exit_codes": [1],  # 1 = test failures
+        },
+        "typescript": {
+            "detect": ["package.json", "jest.config.js", "jest.config.ts", "vitest.config.ts"],
+            "command": ["npm", "test", "--", "--testPathPattern={test_file}", "--passWithNoTests=false"],
+            "fail_exit_codes": [1],
+        },
+        "go": {
+            "detect": ["go.mod"],
+            "command": ["go", "test", "-v", "-run", "{test_pattern}", "./..."],
+            "fail_exit_codes": [1],
+        },
+    }
+
+    @classmethod
+    def detect(cls, project_root: Path) -> Optional[str]:
+        """
+        Detect project's test framework.
+
+        Args:
+            project_root: Root directory of the project
+
+        Returns:
+            Language identifier or None if not detected
+        """
+        for lang, config in cls.FRAMEWORKS.items():
+            for detect_file in config["detect"]:
+                if (project_root / detect_file).exists():
+                    return lang
+        return None
+
+    @classmethod
+    def get_test_command(cls, lang: str, test_file: str) -> List[str]:
+        """
+        Get test command for language.
+
+        Args:
+            lang: Language identifier from detect()
+            test_file: Path to test file
+
+        Returns:
+            Command list ready for subprocess
+        """
+        config = cls.FRAMEWORKS.get(lang, {})
+        cmd_template = config.get("command", [])
+        # Extract test pattern from filename for Go
+        test_pattern = Path(test_file).stem.replace("test_", "Test").replace("_test", "")
+        return [
+            c.format(test_file=test_file, test_pattern=test_pattern)
+            for c in cmd_template
+        ]
+
+    @classmethod
+    def get_fail_exit_codes(cls, lang: str) -> List[int]:
+        """Get exit codes that indicate test failure."""
+        config = cls.FRAMEWORKS.get(lang, {})
+        return config.get("fail_exit_codes", [1])
+
+
+def file_hash(path: Path) -> str:
+    """sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tree_hash(project_root: Path) -> str:
+    """
+    Hash of the project tree from each file's relative path, size and mtime.
+
+    Stat-based rather than content-based: cheap enough to compute before
+    every verification, and any edit changes the mtime.
+    """
+    digest = hashlib.sha256()
+    root = str(project_root)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in TREE_HASH_EXCLUDED_DIRS)
+        for name in sorted(filenames):
+            if name in TREE_HASH_EXCLUDED_FILES:
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(path, root)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class VerificationExecutor:
+    """
+    Runs test verifications with a process limit and result memoisation.
+
+    One executor is meant to live for a whole run (the WaveScheduler owns
+    one), so detection and outcomes are shared by every test task.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        memoize: bool = True,
+        detector: Type[TestFrameworkDetector] = TestFrameworkDetector,
+        warm: bool = False,
+        warm_python: Optional[str] = None,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Concurrent test processes (CPU count if omitted)
+            memoize: Reuse outcomes for unchanged test file and tree
+            detector: Framework detector (class with detect, get_test_command
+                and get_fail_exit_codes)
+            warm: Run pytest in long-lived warm workers
+            warm_python: Interpreter for warm workers (the one behind
+                ``pytest`` on PATH if omitted)
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.memoize = memoize
+        self.detector = detector
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._frameworks: Dict[Path, Optional[str]] = {}
+        self._results: Dict[Tuple[str, str, str], TestVerificationResult] = {}
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        # Tree hash per project root, reused until invalidate_tree()
+        self._tree_hashes: Dict[Path, str] = {}
+        self._tree_hashing: Dict[Path, asyncio.Future] = {}
+        self._warm_pool = None
+        if warm:
+            # Import here to avoid circular import (warm_workers uses TestVerificationResult)
+            from .warm_workers import WarmWorkerPool
+            self._warm_pool = WarmWorkerPool(python=warm_python)
+
+        # Statistics
+        self.runs = 0
+        self.warm_runs = 0
+        self.cache_hits = 0
+        self.running = 0
+        self.peak_running = 0
+
+    def detect(self, project_root: Path) -> Optional[str]:
+        """Test framework of a project root, detected once per root."""
+        root = Path(project_root).resolve()
+        if root not in self._frameworks:
+            self._frameworks[root] = self.detector.detect(root)
+        return self._frameworks[root]
+
+    async def verify(
+        self,
+        test_file: str,
+        project_root: Path,
+        timeout_ms: int = 30000,
+    ) -> TestVerificationResult:
+        """
+        Run a test file and report whether it fails (TDD Red).
+
+        Args:
+            test_file: Test file path relative to the project root
+            project_root: Directory the test command runs in
+            timeout_ms: Kill the test process after this long
+
+        Returns:
+            TestVerificationResult; ``cached`` is set when the outcome of an
+            earlier run was reused
+        """
+        start_time = time.monotonic()
+        project_root = Path(project_root)
+
+        lang = self.detect(project_root)
+        if not lang:
+            return TestVerificationResult(
+                test_ran=False, test_failed=True,  # Assume valid (graceful)
+                exit_code=0, stdout="Skipped - no test framework", stderr="",
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                test_file=str(test_file), error="NO_TEST_FRAMEWORK"
+            )
+
+        if not self.memoize:
+            return await self._run(lang, test_file, project_root, timeout_ms)
+
+        try:
+            test_digest = file_hash(project_root / test_file)
+        except OSError as e:
+            return TestVerificationResult(
+                test_ran=False, test_failed=False, exit_code=-1,
+                stdout="", stderr=str(e),
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                test_file=str(test_file), error=str(type(e).__name__)
+            )
+        key = (str(test_file), test_digest, await self.tree_hash(project_root))
+
+        if key in self._results:
+            self.cache_hits += 1
+            return dataclasses.replace(self._results[key], cached=True, duration_ms=0)
+
+        # The same test against the same tree may already be running; the
+        # run is a shared task, so a cancelled caller does not stop it for
+        # the others
+        run = self._in_flight.get(key)
+        shared = run is not None
+        if run is None:
+            run = asyncio.ensure_future(self._run(lang, test_file, project_root, timeout_ms))
+            self._in_flight[key] = run
+            run.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.cache_hits += 1
+        result = await asyncio.shield(run)
+        return dataclasses.replace(result, cached=True, duration_ms=0) if shared else result
+
+    async def tree_hash(self, project_root: Path) -> str:
+        """
+        ``tree_hash`` of a project root, walked in a worker thread.
+
+        The hash is computed once and shared by every verification of the
+        root (concurrent ones wait for the same walk) until
+        ``invalidate_tree`` is called, e.g. when a wave completes.
+        """
+        root = Path(project_root).resolve()
+        if root in self._tree_hashes:
+            return self._tree_hashes[root]
+        walk = self._tree_hashing.get(root)
+        if walk is None or walk.get_loop() is not asyncio.get_running_loop():
+            walk = asyncio.ensure_future(asyncio.to_thread(tree_hash, root))
+            self._tree_hashing[root] = walk
+            walk.add_done_callback(lambda done: self._tree_hashed(root, done))
+        return await asyncio.shield(walk)
+
+    def _tree_hashed(self, root: Path, walk: asyncio.Future) -> None:
+        """Keep a finished walk's hash unless the tree was invalidated meanwhile."""
+        if self._tree_hashing.get(root) is not walk:
+            return
+        del self._tree_hashing[root]
+        if not walk.cancelled() and walk.exception() is None:
+            self._tree_hashes[root] = walk.result()
+
+    def invalidate_tree(self, project_root: Optional[Path] = None) -> None:
+        """Forget the tree hash of a project root (of all roots if omitted)."""
+        if project_root is None:
+            self._tree_hashes.clear()
+            self._tree_hashing.clear()
+        else:
+            root = Path(project_root).resolve()
+            self._tree_hashes.pop(root, None)
+            self._tree_hashing.pop(root, None)
+
+    def _finish(self, key: Tuple[str, str, str], run: asyncio.Future) -> None:
+        """Memoise a completed test run."""
+        self._in_flight.pop(key, None)
+        if run.cancelled() or run.exception() is not None:
+            return
+        result = run.result()
+        if result.test_ran and result.error is None:
+            self._results[key] = result
+
+    async def _run(
+        self,
+        lang: str,
+        test_file: str,
+        project_root: Path,
+        timeout_ms: int,
+    ) -> TestVerificationResult:
+        """Run the test in a worker slot, warm if possible."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        async with self._semaphore:
+            self.runs += 1
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+            try:
+                result = await self._run_warm(lang, test_file, project_root, timeout_ms)
+                if result is not None:
+                    self.warm_runs += 1
+                    return result
+                return await self._run_cold(lang, test_file, project_root, timeout_ms)
+            finally:
+                self.running -= 1
+
+    async def _run_warm(
+        self,
+        lang: str,
+        test_file: str,
+        project_root: Path,
+        timeout_ms: int,
+    ) -> Optional[TestVerificationResult]:
+        """Run the test in a warm worker; None if none can serve it."""
+        if self._warm_pool is None or not self._warm_pool.supports(lang, project_root):
+            return None
+        cmd = self.detector.get_test_command(lang, str(test_file))
+        # Warm workers take pytest's own arguments: `pytest ARGS` or `python -m pytest ARGS`
+        if cmd and os.path.basename(cmd[0]) == "pytest":
+            args = cmd[1:]
+        elif cmd[1:3] == ["-m", "pytest"]:
+            args = cmd[3:]
+        else:
+            return None
+        return await self._warm_pool.run(
+            args, project_root, str(test_file), timeout_ms,
+            self.detector.get_fail_exit_codes(lang),
+        )
+
+    async def _run_cold(
+        self,
+        lang: str,
+        test_file: str,
+        project_root: Path,
+        timeout_ms: int,
+    ) -> TestVerificationResult:
+        """Run the test command in a new process."""
+        # Build test command (safe - passed as list, not shell string)
+        cmd = self.detector.get_test_command(lang, str(test_file))
+        start_time = time.monotonic()
+        try:
+            # Safe subprocess execution - no shell injection
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(project_root)
+            )
+
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate(),
+                    timeout=timeout_ms / 1000
+                )
+            except asyncio.CancelledError:
+                proc.kill()
+                await proc.wait()
+                raise
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return TestVerificationResult(
+                    test_ran=True, test_failed=False, exit_code=-1,
+                    stdout="", stderr="Test execution timed out",
+                    duration_ms=timeout_ms,
+                    test_file=str(test_file), error="TIMEOUT"
+                )
+
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+            exit_code = proc.returncode or 0
+
+            # TDD Red = test should FAIL (exit code in fail codes)
+            fail_codes = self.detector.get_fail_exit_codes(lang)
+            test_failed = exit_code in fail_codes
+
+            return TestVerificationResult(
+                test_ran=True, test_failed=test_failed, exit_code=exit_code,
+                stdout=stdout.decode("utf-8", errors="replace")[:2000],
+                stderr=stderr.decode("utf-8", errors="replace")[:2000],
+                duration_ms=duration_ms, test_file=str(test_file)
+            )
+
+        except Exception as e:
+            return TestVerificationResult(
+                test_ran=False, test_failed=False, exit_code=-1,
+                stdout="", stderr=str(e),
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                test_file=str(test_file), error=str(type(e).__name__)
+            )
+
+    async def close(self) -> None:
+        """Stop warm workers, if any."""
+        if self._warm_pool is not None:
+            await self._warm_pool.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return run, memoisation and concurrency counters."""
+        return {
+            "max_workers": self.max_workers,
+            "runs": self.runs,
+            "warm_runs": self.warm_runs,
+            "cache_hits": self.cache_hits,
+            "memoized_results": len(self._results),
+            "peak_running": self.peak_running,
+            "frameworks": {str(root): lang for root, lang in self._frameworks.items()},
+            "warm_workers": self._warm_pool.get_statistics() if self._warm_pool else None,
+        }
@@ -0,0 +1,334 @@
+"""
+Warm pytest workers for early test verification.
+
+A warm worker is a long-lived Python process in the project root that
+has imported pytest once and runs ``pytest.main`` for each test file it
+is sent, avoiding interpreter and plugin startup per verification.
+Project modules are unloaded after every run so edits are picked up.
+
+Usage:
+    pool = WarmWorkerPool()
+    result = await pool.run(["tests/test_auth.py", "-x"], project_root,
+                            "tests/test_auth.py", timeout_ms=30000, fail_exit_codes=[1])
+    await pool.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .verification import TestVerificationResult
+
+
+# Languages with a warm worker implementation
+WARM_LANGUAGES = ("python",)
+
+# Seconds a new worker may take to import pytest and report ready
+STARTUP_TIMEOUT_S = 60.0
+
+# Driver run by every worker. Protocol: one JSON object per line each way.
+# The original stdout is kept for the protocol; fd 1 is pointed at stderr so
+# stray writes cannot corrupt it.
+WORKER_SOURCE = r'''
+import contextlib, importlib, io, json, os, sys, time
+
+protocol = os.fdopen(os.dup(1), "w", buffering=1)
+os.dup2(2, 1)
+
+def reply(payload):
+    protocol.write(json.dumps(payload) + "\n")
+    protocol.flush()
+
+try:
+    import pytest
+except BaseException as e:
+    reply({"ready": False, "error": repr(e)})
+    sys.exit(1)
+
+root = os.path.abspath(os.getcwd()) + os.sep
+reply({"ready": True, "pid": os.getpid(), "pytest": pytest.__version__})
+
+for line in sys.stdin:
+    request = json.loads(line)
+    importlib.invalidate_caches()
+    modules, path = set(sys.modules), list(sys.path)
+    output = io.StringIO()
+    start = time.monotonic()
+    error = None
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            exit_code = int(pytest.main(list(request["args"])))
+    except BaseException as e:
+        exit_code, error = -1, repr(e)
+    # Unload the project's modules so the next run sees edited files
+    for name in set(sys.modules) - modules:
+        file = getattr(sys.modules.get(name), "__file__", None) or ""
+        if os.path.abspath(file).startswith(root):
+            del sys.modules[name]
+    sys.path[:] = path
+    reply({
+        "exit_code": exit_code,
+        "output": output.getvalue()[-2000:],
+        "error": error,
+        "duration_ms": int((time.monotonic() - start) * 1000),
+    })
+'''
+
+
+class WarmWorkerError(Exception):
+    """Raised when a worker cannot be started or breaks the protocol."""
+
+
+def default_python() -> str:
+    """
+    Interpreter the cold ``pytest`` command would use.
+
+    Follows the ``pytest`` script's shebang when it names a Python
+    interpreter; otherwise the first ``python3``/``python`` on PATH.
+    """
+    script = shutil.which("pytest")
+    if script:
+        try:
+            with open(script, "rb") as f:
+                shebang = f.readline().decode("utf-8", errors="replace")
+        except OSError:
+            shebang = ""
+        parts = shebang[2:].split() if shebang.startswith("#!") else []
+        if parts and os.path.basename(parts[0]) == "env" and len(parts) > 1:
+            parts = [shutil.which(parts[1]) or parts[1]]
+        if parts and "python" in os.path.basename(parts[0]):
+            return parts[0]
+    return shutil.which("python3") or shutil.which("python") or sys.executable
+
+
+class WarmPytestWorker:
+    """
+    One long-lived pytest process bound to a project root.
+
+    Attributes:
+        project_root: Directory the worker runs in
+        pid: Process id once started
+        runs: Test runs served
+    """
+
+    def __init__(self, project_root: Path, python: str):
+        """
+        Initialize the worker (``start`` launches the process).
+
+        Args:
+            project_root: Directory the worker runs in
+            python: Interpreter with pytest installed
+        """
+        self.project_root = Path(project_root)
+        self.python = python
+        self.pid: Optional[int] = None
+        self.runs = 0
+        self._proc: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is running."""
+        return self._proc is not None and self._proc.returncode is None
+
+    async def start(self) -> None:
+        """
+        Launch the process and wait until pytest is imported.
+
+        Raises:
+            WarmWorkerError: If the interpreter or pytest is unavailable
+        """
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                self.python, "-c", WORKER_SOURCE,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                cwd=str(self.project_root),
+            )
+            hello = await asyncio.wait_for(self._read(), STARTUP_TIMEOUT_S)
+        except (OSError, asyncio.TimeoutError, WarmWorkerError) as e:
+            await self.close()
+            raise WarmWorkerError(f"Could not start pytest worker with {self.python}: {e}") from e
+        if not hello.get("ready"):
+            await self.close()
+            raise WarmWorkerError(f"pytest worker failed to start: {hello.get('error')}")
+        self.pid = hello.get("pid")
+
+    async def run(
+        self,
+        args: List[str],
+        test_file: str,
+        timeout_ms: int,
+        fail_exit_codes: List[int],
+    ) -> TestVerificationResult:
+        """
+        Run pytest with ``args`` in the worker.
+
+        A timeout kills the worker; the result then reports ``TIMEOUT``.
+
+        Raises:
+            WarmWorkerError: If the worker died or sent an invalid reply
+        """
+        if not self.alive:
+            raise WarmWorkerError("pytest worker is not running")
+        start_time = time.monotonic()
+        self._proc.stdin.write((json.dumps({"args": args}) + "\n").encode())
+        try:
+            await self._proc.stdin.drain()
+            reply = await asyncio.wait_for(self._read(), timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            await self.close()
+            return TestVerificationResult(
+                test_ran=True, test_failed=False, exit_code=-1,
+                stdout="", stderr="Test execution timed out",
+                duration_ms=timeout_ms,
+                test_file=str(test_file), error="TIMEOUT"
+            )
+        except (OSError, WarmWorkerError):
+            await self.close()
+            raise WarmWorkerError("pytest worker exited")
+        except asyncio.CancelledError:
+            await self.close()
+            raise
+        self.runs += 1
+
+        if reply.get("error"):
+            # pytest.main itself raised; the worker may be in a bad state
+            await self.close()
+            raise WarmWorkerError(f"pytest worker error: {reply['error']}")
+        exit_code = int(reply.get("exit_code", -1))
+        return TestVerificationResult(
+            test_ran=True, test_failed=exit_code in fail_exit_codes, exit_code=exit_code,
+            stdout=reply.get("output", ""), stderr="",
+            duration_ms=int((time.monotonic() - start_time) * 1000),
+            test_file=str(test_file),
+        )
+
+    async def _read(self) -> Dict[str, Any]:
+        line = await self._proc.stdout.readline()
+        if not line:
+            raise WarmWorkerError("pytest worker closed its pipe")
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise WarmWorkerError(f"Invalid reply from pytest worker: {line[:200]!r}") from e
+
+    async def close(self) -> None:
+        """Stop the process (idempotent)."""
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        if proc.stdin is not None:
+            proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), 1.0)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+
+class WarmWorkerPool:
+    """
+    Idle warm workers per project root, spawned on demand.
+
+    The pool does not limit concurrency itself; callers (the
+    VerificationExecutor) bound how many runs are in flight, and at most
+    that many workers per root are ever started.
+    """
+
+    def __init__(self, python: Optional[str] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            python: Interpreter with pytest (see ``default_python`` if omitted)
+        """
+        self.python = python or default_python()
+        self._idle: Dict[Path, List[WarmPytestWorker]] = {}
+        self._unavailable: Dict[Path, str] = {}
+        self._workers: List[WarmPytestWorker] = []
+
+        # Statistics
+        self.started = 0
+        self.warm_runs = 0
+
+    def supports(self, lang: str, project_root: Path) -> bool:
+        """Whether a warm worker can serve ``lang`` tests in ``project_root``."""
+        return lang in WARM_LANGUAGES and Path(project_root).resolve() not in self._unavailable
+
+    async def run(
+        self,
+        args: List[str],
+        project_root: Path,
+        test_file: str,
+        timeout_ms: int,
+        fail_exit_codes: List[int],
+    ) -> Optional[TestVerificationResult]:
+        """
+        Run a test in a warm worker for the project root.
+
+        Returns:
+            The result, or None if no worker could serve it (the caller
+            should fall back to the cold command)
+        """
+        root = Path(project_root).resolve()
+        if root in self._unavailable:
+            return None
+        idle = self._idle.setdefault(root, [])
+        worker = idle.pop() if idle else None
+        if worker is not None and not worker.alive:
+            await self._discard(worker)
+            worker = None
+        if worker is None:
+            worker = WarmPytestWorker(root, self.python)
+            try:
+                await worker.start()
+            except WarmWorkerError as e:
+                # Do not retry a root whose environment cannot run workers
+                self._unavailable[root] = str(e)
+                return None
+            self.started += 1
+            self._workers.append(worker)
+
+        try:
+            result = await worker.run(args, test_file, timeout_ms, fail_exit_codes)
+        except WarmWorkerError:
+            await self._discard(worker)
+            return None
+        self.warm_runs += 1
+        if worker.alive:
+            idle.append(worker)
+        else:
+            # Killed after a timeout
+            await self._discard(worker)
+        return result
+
+    async def _discard(self, worker: WarmPytestWorker) -> None:
+        """Forget a worker that is no longer running."""
+        if worker in self._workers:
+            self._workers.remove(worker)
+        await worker.close()
+
+    async def close(self) -> None:
+        """Stop every worker."""
+        workers, self._workers = self._workers, []
+        self._idle.clear()
+        for worker in workers:
+            await worker.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return worker and run counters."""
+        return {
+            "python": self.python,
+            "started": self.started,
+            "alive": sum(1 for w in self._workers if w.alive),
+            "warm_runs": self.warm_runs,
+            "unavailable": {str(root): reason for root, reason in self._unavailable.items()},
+        }
@@ -0,0 +1,175 @@
+"""
+Test doubles for the Anthropic async client used by DistributedAgentPool,
+and a builder for pools wired to them.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from src.specify_cli.agent_pool import DistributedAgentPool, PoolConfig
+
+
+def make_message(
+    text: str = "ok",
+    tokens_in: int = 100,
+    tokens_out: int = 50,
+    cache_read: int = 0,
+    cache_write: int = 0,
+    stop_reason: str = "end_turn",
+) -> SimpleNamespace:
+    """Build an object shaped like anthropic.types.Message."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(
+            input_tokens=tokens_in,
+            output_tokens=tokens_out,
+            cache_read_input_tokens=cache_read,
+            cache_creation_input_tokens=cache_write,
+        ),
+        stop_reason=stop_reason,
+    )
+
+
+class FakeMessages:
+    """
+    Stand-in for AsyncAnthropic().messages returning canned responses.
+
+    ``delays`` gives per-call latencies in call order; once exhausted,
+    every call takes ``delay``.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        errors: Optional[List[BaseException]] = None,
+        chunks: Optional[List[str]] = None,
+        delays: Optional[List[float]] = None,
+        **message_kwargs: Any,
+    ):
+        self.delay = delay
+        self.delays = list(delays or [])
+        self.errors = list(errors or [])
+        self.chunks = chunks or ["o", "k"]
+        self.message_kwargs = message_kwargs
+        self.calls: List[Dict[str, Any]] = []
+        self.chunks_sent = 0
+
+    async def create(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        delay = self.delays.pop(0) if self.delays else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return make_message(**self.message_kwargs)
+
+    def stream(self, **kwargs: Any) -> "FakeStream":
+        self.calls.append(kwargs)
+        return FakeStream(self)
+
+
+class FakeStream:
+    """Async context manager shaped like AsyncMessageStreamManager/AsyncMessageStream."""
+
+    def __init__(self, messages: FakeMessages):
+        self._messages = messages
+        self.current_message_snapshot = make_message(
+            text="", **{k: v for k, v in messages.message_kwargs.items() if k != "text"}
+        )
+
+    async def __aenter__(self) -> "FakeStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
+
+    @property
+    def text_stream(self):
+        async def generate():
+            for chunk in self._messages.chunks:
+                if self._messages.delay:
+                    await asyncio.sleep(self._messages.delay / len(self._messages.chunks))
+                self._messages.chunks_sent += 1
+                yield chunk
+
+        return generate()
+
+    async def get_final_message(self) -> SimpleNamespace:
+        kwargs = dict(self._messages.message_kwargs)
+        kwargs["text"] = "".join(self._messages.chunks)
+        return make_message(**kwargs)
+
+
+class FakeClient:
+    """Stand-in for anthropic.AsyncAnthropic."""
+
+    def __init__(self, batches: Optional["FakeBatches"] = None, **kwargs: Any):
+        self.messages = FakeMessages(**kwargs)
+        self.messages.batches = batches or FakeBatches()
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBatches:
+    """
+    In-process fake of the Message Batches endpoints.
+
+    A created batch reports ``in_progress`` for ``polls_until_ended``
+    retrieve calls, then ``ended``. Requests whose prompt contains
+    ``fail_marker`` come back as errored results.
+    """
+
+    def __init__(self, polls_until_ended: int = 2, fail_marker: str = "FAIL"):
+        self.polls_until_ended = polls_until_ended
+        self.fail_marker = fail_marker
+        self.submitted: Dict[str, List[Dict[str, Any]]] = {}
+        self.polls: Dict[str, int] = {}
+        self.cancelled: List[str] = []
+
+    def _batch(self, batch_id: str) -> SimpleNamespace:
+        ended = self.polls[batch_id] >= self.polls_until_ended or batch_id in self.cancelled
+        return SimpleNamespace(id=batch_id, processing_status="ended" if ended else "in_progress")
+
+    async def create(self, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        batch_id = f"msgbatch_{len(self.submitted) + 1:03d}"
+        self.submitted[batch_id] = list(requests)
+        self.polls[batch_id] = 0
+        return self._batch(batch_id)
+
+    async def retrieve(self, batch_id: str) -> SimpleNamespace:
+        self.polls[batch_id] += 1
+        return self._batch(batch_id)
+
+    async def cancel(self, batch_id: str) -> SimpleNamespace:
+        self.cancelled.append(batch_id)
+        return SimpleNamespace(id=batch_id, processing_status="canceling")
+
+    async def results(self, batch_id: str):
+        async def entries():
+            for request in self.submitted[batch_id]:
+                content = request["params"]["messages"][0]["content"]
+                text = content if isinstance(content, str) else content[-1]["text"]
+                if self.fail_marker in text:
+                    result = SimpleNamespace(
+                        type="errored",
+                        error=SimpleNamespace(
+                            error=SimpleNamespace(type="invalid_request_error", message="bad prompt")
+                        ),
+                    )
+                else:
+                    result = SimpleNamespace(
+                        type="succeeded", message=make_message(text=f"done: {text}")
+                    )
+                yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+        return entries()
+
+
+def make_pool(config: Optional[PoolConfig] = None, **client_kwargs: Any) -> DistributedAgentPool:
+    """Create a pool whose clients are replaced with FakeClients."""
+    pool = DistributedAgentPool(config=config or PoolConfig(pool_size=2))
+    pool.clients = [FakeClient(**client_kwargs) for _ in range(len(pool.clients))]
+    return pool
@@ -0,0 +1,150 @@
+"""
+Unit tests for agent_pool module (request building, usage accounting).
+"""
+
+import asyncio
+
+from src.specify_cli.agent_pool import (
+    AgentTask,
+    DistributedAgentPool,
+    PoolConfig,
+    calculate_cost,
+)
+
+from .fakes import make_pool
+
+
+class TestPromptCaching:
+    """Test cache_control breakpoints and cache-aware cost accounting."""
+
+    def test_prefix_and_system_get_cache_breakpoints(self):
+        pool = make_pool(PoolConfig(pool_size=1, prompt_caching=True))
+        task = AgentTask(
+            name="a",
+            prompt="do the thing",
+            prompt_prefix="Feature: 001\n\n<artifact>...</artifact>",
+            system_prompt="You are an architect.",
+        )
+        kwargs = pool.build_request_kwargs(task)
+
+        system = kwargs["system"]
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+
+        content = kwargs["messages"][0]["content"]
+        assert content[0]["text"].startswith("Feature: 001")
+        assert content[0]["cache_control"] == {"type": "ephemeral"}
+        assert content[1] == {"type": "text", "text": "do the thing"}
+
+    def test_caching_is_off_by_default(self):
+        pool = make_pool()
+        task = AgentTask(name="a", prompt="p", system_prompt="s")
+        kwargs = pool.build_request_kwargs(task)
+        assert kwargs["system"] == "s"
+        assert kwargs["messages"][0]["content"] == "p"
+
+    def test_cache_tokens_recorded_and_discounted(self):
+        pool = make_pool(tokens_in=100, tokens_out=10, cache_read=10_000, cache_write=0)
+        task = AgentTask(name="a", prompt="p", prompt_prefix="shared", model="claude-sonnet-4-5-20250929")
+
+        result = asyncio.run(pool.execute_wave([task]))["a"]
+        assert result.cache_read_tokens == 10_000
+        assert result.cost == calculate_cost("sonnet", 100, 10, cache_read_tokens=10_000)
+        assert result.cost < calculate_cost("sonnet", 10_100, 10)
+
+        by_model = pool.get_statistics()["by_model"]["sonnet"]
+        assert by_model["cache_read_tokens"] == 10_000
+        assert by_model["cache_write_tokens"] == 0
+
+    def test_full_prompt_joins_prefix(self):
+        task = AgentTask(name="a", prompt="body", prompt_prefix="head")
+        assert task.full_prompt == "head\n\nbody"
+        assert AgentTask(name="b", prompt="body").full_prompt == "body"
+
+
+class TestStreaming:
+    """Test streaming mode callbacks, early stop and partial readiness."""
+
+    def test_chunks_and_ttft_reported(self):
+        pool = make_pool(PoolConfig(pool_size=1, streaming=True), chunks=["Hel", "lo"])
+        chunks, first_tokens = [], []
+        pool.on_chunk(lambda name, text: chunks.append((name, text)))
+        pool.on_first_token(lambda name, ms: first_tokens.append(name))
+
+        result = asyncio.run(pool.execute_wave([AgentTask(name="a", prompt="p")]))["a"]
+
+        assert result.success
+        assert result.output == "Hello"
+        assert result.ttft_ms is not None
+        assert chunks == [("a", "Hel"), ("a", "lo")]
+        assert first_tokens == ["a"]
+        assert pool.get_statistics()["streaming"]["requests"] == 1
+
+    def test_stop_pattern_cancels_stream(self):
+        pool = make_pool(
+            PoolConfig(pool_size=1, streaming=True),
+            chunks=["<answer>42", "</answer>", " and more", " text"],
+        )
+        task = AgentTask(name="a", prompt="p", stop_pattern=r"</answer>")
+
+        result = asyncio.run(pool.execute_wave([task]))["a"]
+
+        assert result.output == "<answer>42</answer>"
+        assert result.stop_reason == "stop_pattern"
+        assert pool.clients[0].messages.chunks_sent == 2
+        assert pool.get_statistics()["streaming"]["early_stops"] == 1
+
+    def test_partial_ready_announced_once(self):
+        pool = make_pool(
+            PoolConfig(pool_size=1, streaming=True),
+            chunks=["## Interfaces\n", "a\n", "b\n"],
+        )
+        announced = []
+        pool.on_partial_ready(lambda name, text: announced.append((name, text)))
+        task = AgentTask(name="a", prompt="p", partial_ready_pattern=r"## Interfaces")
+
+        asyncio.run(pool.execute_wave([task]))
+
+        assert announced == [("a", "## Interfaces\n")]
+
+
+class TestConnections:
+    """Test shared connection pooling, client assignment and draining."""
+
+    def test_shared_mode_uses_one_client(self):
+        pool = DistributedAgentPool(config=PoolConfig(pool_size=4))
+        stats = pool.get_statistics()["connections"]
+        assert len(pool.clients) == 1
+        assert stats["shared"] is True
+        assert stats["max_connections"] == 64
+        asyncio.run(pool.close())
+        assert pool._http_client.is_closed
+
+    def test_per_client_mode(self):
+        pool = DistributedAgentPool(config=PoolConfig(pool_size=3, shared_connections=False))
+        assert len(pool.clients) == 3
+        assert pool.get_statistics()["connections"]["shared"] is False
+
+    def test_least_busy_client_is_chosen(self):
+        pool = make_pool(PoolConfig(pool_size=3, shared_connections=False))
+        first = pool._acquire_client()
+        second = pool._acquire_client()
+        pool._release_client(first)
+        assert second != first
+        assert pool._acquire_client() == first
+        assert pool.in_flight == 2
+
+    def test_close_drains_in_flight_requests(self):
+        pool = make_pool(PoolConfig(pool_size=1), delay=0.05)
+        clients = list(pool.clients)
+
+        async def scenario():
+            running = asyncio.create_task(pool.execute_task(AgentTask(name="a", prompt="p")))
+            await asyncio.sleep(0.01)
+            assert pool.in_flight == 1
+            await pool.close()
+            assert running.done()
+            return running.result()
+
+        result = asyncio.run(scenario())
+        assert result.success
+        assert all(client.closed for client in clients)
@@ -0,0 +1,240 @@
+"""
+Unit tests for count- and token-based batch packing and online batching.
+"""
+
+import asyncio
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentTask, ModelTier, PoolConfig, ResultStatus
+from src.specify_cli.batch_aggregator import BatchAggregator, BatchConfig, OnlineBatchAggregator
+from src.specify_cli.wave_scheduler import ExecutionStrategy, Wave, WaveConfig, WaveScheduler
+
+from .fakes import FakeClient, make_pool
+
+
+def task(name, tokens, model=ModelTier.HAIKU.value, priority=5, depends_on=None):
+    """Task whose pre-flight estimate is exactly ``tokens``."""
+    return AgentTask(
+        name=name, prompt="", model=model, max_tokens=tokens,
+        priority=priority, depends_on=depends_on or [],
+    )
+
+
+def aggregate(tasks, **config):
+    aggregator = BatchAggregator(BatchConfig(enabled=True, **config))
+    waves = [Wave(index=0, tasks=tasks)]
+    batches = aggregator.aggregate(waves)
+    return batches, aggregator.get_aggregation_stats(waves, batches)
+
+
+class TestCountPacking:
+    """Test the default chunking by task count."""
+
+    def test_levels_are_chunked_in_priority_order(self):
+        tasks = [task(f"t{i}", 100, priority=9 - i) for i in range(5)]
+        tasks.append(task("after", 100, depends_on=["t0"]))
+
+        batches, stats = aggregate(tasks, max_batch_size=2)
+
+        assert [b.task_names for b in batches] == [["t4", "t3"], ["t2", "t1"], ["t0"], ["after"]]
+        assert batches[0].estimated_tokens == 200
+        assert stats["packing"] == "count"
+        assert stats["batch_token_capacity"] is None
+        assert stats["batch_lower_bound"] == 4
+        assert stats["packing_efficiency"] == pytest.approx(6 / 8)
+
+
+class TestTokenPacking:
+    """Test first-fit-decreasing packing by estimated tokens."""
+
+    def test_large_prompt_does_not_share_a_burst(self):
+        tasks = [task("plan", 170_000, model=ModelTier.OPUS.value)]
+        tasks += [task(f"small{i}", 2_000) for i in range(9)]
+
+        batches, stats = aggregate(tasks, packing="tokens", tokens_per_minute=200_000, tpm_headroom=0.9)
+
+        assert stats["batch_token_capacity"] == 180_000
+        assert all(b.estimated_tokens <= 180_000 for b in batches)
+        assert sum(len(b) for b in batches) == 10
+        assert len(batches) == 2
+        assert stats["oversized_batches"] == 0
+
+    def test_first_fit_decreasing(self):
+        sizes = {"a": 7, "b": 5, "c": 4, "d": 3, "e": 1}
+        tasks = [task(name, size) for name, size in sizes.items()]
+
+        batches, stats = aggregate(tasks, packing="tokens", max_batch_tokens=10)
+
+        assert sorted(sorted(b.task_names) for b in batches) == [["a", "d"], ["b", "c", "e"]]
+        assert stats["batch_lower_bound"] == 2
+        assert stats["packing_efficiency"] == 1.0
+
+    def test_tier_headroom(self):
+        tasks = [task(f"opus{i}", 30_000, model=ModelTier.OPUS.value) for i in range(2)]
+        tasks += [task(f"haiku{i}", 30_000) for i in range(2)]
+
+        batches, _ = aggregate(
+            tasks, packing="tokens", max_batch_tokens=200_000,
+            tier_tokens_per_minute={"opus": 40_000}, tpm_headroom=1.0,
+        )
+
+        assert len(batches) == 2
+        assert all(b.tier_tokens.get("opus", 0) <= 40_000 for b in batches)
+
+    def test_oversized_task_gets_its_own_batch(self):
+        tasks = [task("huge", 500), task("small", 10)]
+
+        batches, stats = aggregate(tasks, packing="tokens", max_batch_tokens=100)
+
+        assert [b.task_names for b in batches] == [["huge"], ["small"]]
+        assert stats["oversized_batches"] == 1
+        assert stats["max_batch_tokens"] == 500
+
+    def test_batches_follow_priority(self):
+        tasks = [task("big", 90, priority=9), task("urgent", 50, priority=1), task("other", 40)]
+
+        batches, _ = aggregate(tasks, packing="tokens", max_batch_tokens=100)
+
+        assert batches[0].task_names[0] == "urgent"
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError, match="Unknown packing mode"):
+            BatchConfig(packing="weight")
+
+
+class TestSchedulerPacking:
+    """Test token packing in WaveScheduler's batched strategy."""
+
+    def test_batches_sized_from_pool_limits(self):
+        pool = make_pool(PoolConfig(pool_size=4, tokens_per_minute=10_000))
+        tasks = [task(f"t{i}", 2_000) for i in range(6)]
+        scheduler = WaveScheduler(pool, WaveConfig(
+            strategy=ExecutionStrategy.BATCHED, batch_packing="tokens",
+        ))
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert all(r.success for r in results.values())
+        assert scheduler.batch_stats["batch_token_capacity"] == 9_000
+        assert scheduler.batch_stats["aggregated_batches"] == 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOnlineBatchAggregator:
+    """Test size, token and timeout flushes of online batches."""
+
+    def test_full_batch_closes_immediately(self):
+        aggregator = OnlineBatchAggregator(BatchConfig(max_batch_size=2))
+
+        assert aggregator.add(task("a", 10)) == []
+        closed = aggregator.add(task("b", 10))
+
+        assert [b.task_names for b in closed] == [["a", "b"]]
+        assert aggregator.pending == 0
+        assert aggregator.time_until_due() is None
+
+    def test_timeout_closes_partial_batch(self):
+        clock = FakeClock()
+        aggregator = OnlineBatchAggregator(BatchConfig(max_batch_size=5, batch_timeout_ms=100), clock=clock)
+
+        aggregator.add(task("a", 10))
+        clock.now = 0.05
+        aggregator.add(task("b", 10))
+        assert aggregator.poll() is None
+        assert aggregator.time_until_due() == pytest.approx(0.05)
+
+        clock.now = 0.1
+        batch = aggregator.poll()
+
+        assert batch.task_names == ["a", "b"]
+        stats = aggregator.get_statistics()
+        assert stats["flushes"]["timeout"] == 1
+        assert stats["avg_fill_wait_ms"] == pytest.approx(100.0)
+
+    def test_token_capacity_closes_batch_before_overflow(self):
+        aggregator = OnlineBatchAggregator(BatchConfig(packing="tokens", max_batch_tokens=100))
+
+        aggregator.add(task("a", 60))
+        closed = aggregator.add(task("b", 60))
+
+        assert [b.task_names for b in closed] == [["a"]]
+        assert aggregator.flush().task_names == ["b"]
+        assert aggregator.get_statistics()["flushes"] == {"size": 0, "tokens": 1, "timeout": 0, "idle": 1}
+
+
+class TestOnlineBatching:
+    """Test online batch formation in WaveScheduler's batched strategy."""
+
+    def scheduler(self, delays, fail_fast=True, **config):
+        pool = make_pool(PoolConfig(pool_size=4), delays=delays)
+        return WaveScheduler(pool, WaveConfig(
+            strategy=ExecutionStrategy.BATCHED, max_parallel=4, fail_fast=fail_fast,
+            online_batching=True, **config,
+        ))
+
+    def chain(self):
+        # "slow" and "fast" are independent; "next" only needs "fast"
+        return [
+            AgentTask(name="slow", prompt="slow"),
+            AgentTask(name="fast", prompt="fast"),
+            AgentTask(name="next", prompt="next", depends_on=["fast"]),
+        ]
+
+    def test_dependent_does_not_wait_for_level(self):
+        scheduler = self.scheduler(delays=[0.2, 0.01, 0.01], batch_timeout_ms=10)
+        order = []
+        scheduler.on_task_complete(lambda name, result: order.append(name))
+
+        results = asyncio.run(scheduler.execute_all(self.chain()))
+
+        assert all(r.success for r in results.values())
+        assert order == ["fast", "next", "slow"]
+        assert scheduler.batch_stats["aggregated_batches"] == 2
+        assert all(wave.finished for wave in scheduler.waves)
+
+    def test_ready_tasks_share_a_batch(self):
+        scheduler = self.scheduler(delays=[], max_batch_size=3, batch_timeout_ms=1000)
+        tasks = [AgentTask(name=f"t{i}", prompt=f"t{i}") for i in range(7)]
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert len(results) == 7
+        assert scheduler.batch_stats["flushes"] == {"size": 2, "tokens": 0, "timeout": 0, "idle": 1}
+
+    def test_pool_batch_timeout_is_the_default(self):
+        pool = make_pool(PoolConfig(pool_size=2, batch_timeout_ms=250))
+        scheduler = WaveScheduler(pool, WaveConfig(strategy=ExecutionStrategy.BATCHED))
+
+        assert scheduler._batch_config().batch_timeout_ms == 250
+        scheduler.config.batch_timeout_ms = 20
+        assert scheduler._batch_config().batch_timeout_ms == 20
+
+    def test_failure_skips_dependents(self):
+        scheduler = self.scheduler(delays=[], fail_fast=False)
+        scheduler.pool.clients = [FakeClient(errors=[ValueError("boom")] * 10)]
+        scheduler.pool.config.max_retries = 1
+        tasks = [
+            AgentTask(name="a", prompt="a"),
+            AgentTask(name="b", prompt="b", depends_on=["a"]),
+        ]
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert not results["a"].success
+        assert results["b"].status == ResultStatus.SKIPPED
+
+    def test_fail_fast_raises(self):
+        scheduler = self.scheduler(delays=[])
+        scheduler.pool.clients = [FakeClient(errors=[ValueError("boom")] * 10)]
+        scheduler.pool.config.max_retries = 1
+
+        with pytest.raises(RuntimeError, match="Batch execution failed"):
+            asyncio.run(scheduler.execute_all([AgentTask(name="a", prompt="a")]))
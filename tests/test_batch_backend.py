@@ -0,0 +1,103 @@
+"""
+Unit tests for batch_backend module (Message Batches execution).
+"""
+
+import asyncio
+
+from src.specify_cli.agent_pool import AgentTask, PoolConfig, calculate_cost
+from src.specify_cli.batch_backend import BatchBackend, BatchBackendConfig
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig, WaveScheduler
+
+from .fakes import FakeBatches, make_pool
+
+FAST_POLL = BatchBackendConfig(poll_interval_s=0.001, poll_max_interval_s=0.002)
+
+
+class TestBatchBackend:
+    """Test submission, polling and result mapping."""
+
+    def test_results_mapped_by_custom_id(self):
+        batches = FakeBatches(polls_until_ended=3)
+        pool = make_pool(PoolConfig(pool_size=1), batches=batches)
+        tasks = [
+            AgentTask(name="analyze the spec", prompt="one"),
+            AgentTask(name="write/plan", prompt="two"),
+        ]
+
+        results = asyncio.run(BatchBackend(pool, FAST_POLL).execute(tasks))
+
+        assert set(results) == {"analyze the spec", "write/plan"}
+        assert results["analyze the spec"].output == "done: one"
+        assert results["write/plan"].output == "done: two"
+        submitted = next(iter(batches.submitted.values()))
+        assert [r["custom_id"] for r in submitted] == ["task-00000", "task-00001"]
+        assert batches.polls["msgbatch_001"] == 3
+
+    def test_batch_discount_applied(self):
+        pool = make_pool(PoolConfig(pool_size=1), batches=FakeBatches(polls_until_ended=0))
+        task = AgentTask(name="a", prompt="p")
+
+        result = asyncio.run(BatchBackend(pool, FAST_POLL).execute([task]))["a"]
+
+        assert result.cost == calculate_cost("sonnet", 100, 50) * 0.5
+        assert pool.get_statistics()["total_requests"] == 1
+
+    def test_errored_entries_become_failed_results(self):
+        pool = make_pool(PoolConfig(pool_size=1), batches=FakeBatches(polls_until_ended=0))
+        tasks = [AgentTask(name="ok", prompt="fine"), AgentTask(name="bad", prompt="FAIL me")]
+
+        results = asyncio.run(BatchBackend(pool, FAST_POLL).execute(tasks))
+
+        assert results["ok"].success
+        assert not results["bad"].success
+        assert "invalid_request_error" in results["bad"].error
+
+    def test_timeout_cancels_batch(self):
+        batches = FakeBatches(polls_until_ended=10_000)
+        pool = make_pool(PoolConfig(pool_size=1), batches=batches)
+        config = BatchBackendConfig(poll_interval_s=0.001, max_wait_s=0.01)
+
+        results = asyncio.run(BatchBackend(pool, config).execute([AgentTask(name="a", prompt="p")]))
+
+        assert not results["a"].success
+        assert batches.cancelled == ["msgbatch_001"]
+
+    def test_cancelled_run_cancels_batch(self):
+        batches = FakeBatches(polls_until_ended=10_000)
+        pool = make_pool(PoolConfig(pool_size=1), batches=batches)
+
+        async def scenario():
+            run = asyncio.ensure_future(BatchBackend(pool, FAST_POLL).execute([AgentTask(name="a", prompt="p")]))
+            while not batches.polls.get("msgbatch_001"):
+                await asyncio.sleep(0.001)
+            run.cancel()
+            try:
+                await run
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        assert asyncio.run(scenario())
+        assert batches.cancelled == ["msgbatch_001"]
+
+
+class TestSchedulerBatchBackend:
+    """Test WaveScheduler routing BATCHED strategy through the batch backend."""
+
+    def test_batched_strategy_uses_message_batches(self):
+        batches = FakeBatches(polls_until_ended=0)
+        pool = make_pool(PoolConfig(pool_size=1), batches=batches)
+        pool._batch_backend = BatchBackend(pool, FAST_POLL)
+        config = WaveConfig(strategy=ExecutionStrategy.BATCHED, backend="batch")
+        scheduler = WaveScheduler(pool, config)
+
+        tasks = [
+            AgentTask(name="a", prompt="a"),
+            AgentTask(name="b", prompt="b"),
+            AgentTask(name="c", prompt="c", depends_on=["a"]),
+        ]
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert all(r.success for r in results.values())
+        assert len(batches.submitted) == 2
+        assert pool.clients[0].messages.calls == []
@@ -0,0 +1,171 @@
+"""
+Unit tests for budget module (pre-flight cost/token governor) and rate loading.
+"""
+
+import asyncio
+
+import pytest
+
+from src.specify_cli import agent_pool
+from src.specify_cli.agent_pool import (
+    AgentResult,
+    AgentTask,
+    ModelTier,
+    PoolConfig,
+    calculate_cost,
+    load_model_rates,
+)
+from src.specify_cli.budget import BudgetExceededError, BudgetGovernor
+
+from .fakes import make_pool
+
+
+def make_task(name="a", model=ModelTier.OPUS.value, max_tokens=1000):
+    return AgentTask(name=name, prompt="x" * 4000, model=model, max_tokens=max_tokens)
+
+
+def make_result(name="a", cost=0.01, tokens_in=100, tokens_out=50):
+    return AgentResult(
+        name=name, output="ok", success=True, duration_ms=1, model_used="m",
+        model_tier="opus", tokens_in=tokens_in, tokens_out=tokens_out, cost=cost,
+    )
+
+
+class TestBudgetGovernor:
+    """Test estimation, reservation, downgrades and refusal."""
+
+    def test_estimate_is_worst_case(self):
+        governor = BudgetGovernor(max_cost=10.0)
+        tokens, cost = governor.estimate(make_task())
+        assert tokens == 2000
+        assert cost == calculate_cost("opus", 1000, 1000)
+
+    def test_estimate_prices_cached_prefix_as_cache_write(self):
+        task = AgentTask(
+            name="a", prompt="x" * 400, prompt_prefix="p" * 4000, system_prompt="s" * 400,
+            model=ModelTier.SONNET.value, max_tokens=1000,
+        )
+        tokens_in = agent_pool.estimate_input_tokens(task.full_prompt) + 100
+
+        _, plain = BudgetGovernor(max_cost=10.0).estimate(task)
+        tokens, cost = BudgetGovernor(max_cost=10.0, prompt_caching=True).estimate(task)
+
+        assert tokens == tokens_in + 1000
+        assert cost == calculate_cost("sonnet", tokens_in - 1100, 1000, cache_write_tokens=1100)
+        assert cost > plain
+
+    def test_settle_without_result_books_input_estimate(self):
+        governor = BudgetGovernor(max_cost=10.0)
+
+        reservation = asyncio.run(governor.reserve(make_task()))
+        governor.settle(reservation, None)
+
+        assert governor.reserved_cost == 0
+        assert governor.spent_cost == calculate_cost("opus", 1000, 0)
+        assert governor.spent_tokens == 1000
+
+    def test_settle_books_actual_spend(self):
+        governor = BudgetGovernor(max_cost=10.0)
+        task = make_task()
+
+        reservation = asyncio.run(governor.reserve(task))
+        assert reservation.task is task
+        assert governor.reserved_cost == reservation.cost
+
+        governor.settle(reservation, make_result(cost=0.02))
+        assert governor.reserved_cost == 0
+        assert governor.spent_cost == 0.02
+        assert governor.spent_tokens == 150
+
+    def test_downgrades_when_tier_does_not_fit(self):
+        opus_cost = calculate_cost("opus", 1000, 1000)
+        governor = BudgetGovernor(max_cost=opus_cost * 0.9, downgrade_below=0.0)
+
+        reservation = asyncio.run(governor.reserve(make_task()))
+
+        assert reservation.task.model == ModelTier.SONNET.value
+        assert reservation.downgraded_from == ModelTier.OPUS.value
+        assert reservation.task.metadata["downgraded_from"] == ModelTier.OPUS.value
+        assert governor.downgraded == 1
+
+    def test_downgrades_when_budget_low(self):
+        governor = BudgetGovernor(max_cost=1.0, downgrade_below=0.5)
+        governor.spent_cost = 0.6
+
+        reservation = asyncio.run(governor.reserve(make_task()))
+        assert reservation.task.model == ModelTier.SONNET.value
+
+    def test_refuses_when_nothing_in_flight(self):
+        governor = BudgetGovernor(max_tokens=500)
+        with pytest.raises(BudgetExceededError, match="Budget exceeded"):
+            asyncio.run(governor.reserve(make_task()))
+        assert governor.refused == 1
+
+    def test_try_reserve_counts_refusal_on_request(self):
+        governor = BudgetGovernor(max_tokens=500)
+        assert governor.try_reserve(make_task()) is None
+        assert governor.refused == 0
+        assert governor.try_reserve(make_task(), count_refusal=True) is None
+        assert governor.refused == 1
+
+    def test_queues_until_in_flight_work_settles(self):
+        governor = BudgetGovernor(max_tokens=3000, downgrade_below=0.0)
+
+        async def scenario():
+            first = await governor.reserve(make_task("first"))
+            waiting = asyncio.create_task(governor.reserve(make_task("second")))
+            await asyncio.sleep(0)
+            assert not waiting.done()
+            governor.settle(first, make_result(tokens_in=500, tokens_out=200))
+            return await asyncio.wait_for(waiting, timeout=1)
+
+        reservation = asyncio.run(scenario())
+        assert reservation.task.name == "second"
+        assert governor.queued == 1
+
+
+class TestPoolBudget:
+    """Test budget enforcement in DistributedAgentPool."""
+
+    def test_refused_tasks_fail_without_api_call(self):
+        pool = make_pool(PoolConfig(pool_size=1, max_tokens=100))
+        result = asyncio.run(pool.execute_wave([make_task()]))["a"]
+
+        assert not result.success
+        assert "Budget exceeded" in result.error
+        assert pool.clients[0].messages.calls == []
+        assert pool.get_statistics()["budget"]["refused"] == 1
+
+    def test_spend_is_settled_from_results(self):
+        pool = make_pool(PoolConfig(pool_size=2, max_cost=5.0), tokens_in=100, tokens_out=50)
+        tasks = [make_task(f"t{i}", model=ModelTier.HAIKU.value) for i in range(3)]
+
+        results = asyncio.run(pool.execute_wave(tasks))
+
+        stats = pool.get_statistics()["budget"]
+        assert all(r.success for r in results.values())
+        assert stats["spent_cost"] == pytest.approx(sum(r.cost for r in results.values()))
+        assert stats["reserved_cost"] == pytest.approx(0)
+
+
+class TestLoadModelRates:
+    """Test loading pricing overrides from a file."""
+
+    def test_partial_override(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            agent_pool, "MODEL_RATES", {k: dict(v) for k, v in agent_pool.MODEL_RATES.items()}
+        )
+        path = tmp_path / "rates.yaml"
+        path.write_text("opus:\n  output: 100.0\n", encoding="utf-8")
+
+        load_model_rates(path)
+
+        assert agent_pool.MODEL_RATES["opus"]["output"] == 100.0
+        assert agent_pool.MODEL_RATES["opus"]["input"] == 15.0
+        assert calculate_cost("opus", 0, 1_000_000) == 100.0
+
+    def test_rejects_non_numeric(self, tmp_path):
+        path = tmp_path / "rates.json"
+        path.write_text('{"opus": {"input": "cheap"}}', encoding="utf-8")
+        with pytest.raises(ValueError, match="numeric"):
+            load_model_rates(path)
@@ -0,0 +1,132 @@
+"""
+Unit tests for concurrency module (adaptive AIMD concurrency control).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.specify_cli.agent_pool import wait_retry_after
+from src.specify_cli.concurrency import (
+    AdaptiveConcurrencyController,
+    ConcurrencyLimiter,
+    parse_retry_after,
+)
+
+
+def make_error(headers):
+    """Build an object shaped like anthropic.APIStatusError."""
+    return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+class TestConcurrencyLimiter:
+    """Test the mutable-limit limiter."""
+
+    def test_respects_limit(self):
+        limiter = ConcurrencyLimiter(2)
+        peak = 0
+
+        async def worker():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_use)
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            await asyncio.gather(*(worker() for _ in range(6)))
+
+        asyncio.run(scenario())
+        assert peak == 2
+        assert limiter.in_use == 0
+
+    def test_raising_limit_wakes_waiters(self):
+        limiter = ConcurrencyLimiter(1)
+
+        async def scenario():
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+            limiter.limit = 2
+            await asyncio.wait_for(waiter, timeout=1)
+            assert limiter.in_use == 2
+
+        asyncio.run(scenario())
+
+
+class TestAdaptiveController:
+    """Test AIMD behaviour."""
+
+    def test_additive_increase_on_healthy_success(self):
+        limiter = ConcurrencyLimiter(2)
+        controller = AdaptiveConcurrencyController(limiter, min_limit=1, max_limit=8)
+
+        for _ in range(10):
+            controller.on_success(latency_ms=1000, tokens_out=100)
+
+        assert limiter.limit > 2
+        assert controller.increases >= 1
+
+    def test_no_increase_when_latency_inflates(self):
+        limiter = ConcurrencyLimiter(4)
+        controller = AdaptiveConcurrencyController(limiter, max_limit=8)
+        controller.on_success(latency_ms=100, tokens_out=100)
+        limit_before = limiter.limit
+
+        for _ in range(10):
+            controller.on_success(latency_ms=10_000, tokens_out=100)
+
+        assert limiter.limit == limit_before
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        clock_now = [0.0]
+        limiter = ConcurrencyLimiter(16)
+        controller = AdaptiveConcurrencyController(
+            limiter, max_limit=32, cooldown_s=1.0, clock=lambda: clock_now[0]
+        )
+
+        controller.on_overload()
+        controller.on_overload()  # Same burst, ignored
+        assert limiter.limit == 8
+
+        clock_now[0] = 2.0
+        controller.on_overload()
+        assert limiter.limit == 4
+        assert controller.decreases == 2
+        assert controller.overloads == 3
+
+    def test_never_below_min_limit(self):
+        clock_now = [0.0]
+        limiter = ConcurrencyLimiter(2)
+        controller = AdaptiveConcurrencyController(
+            limiter, min_limit=2, cooldown_s=0.0, clock=lambda: clock_now[0]
+        )
+        for i in range(5):
+            clock_now[0] = float(i)
+            controller.on_overload()
+        assert limiter.limit == 2
+
+
+class TestRetryAfter:
+    """Test retry-after header handling."""
+
+    def test_parse_seconds(self):
+        assert parse_retry_after(make_error({"retry-after": "7"})) == 7.0
+
+    def test_parse_milliseconds_preferred(self):
+        error = make_error({"retry-after-ms": "1500", "retry-after": "7"})
+        assert parse_retry_after(error) == 1.5
+
+    def test_missing_header(self):
+        assert parse_retry_after(make_error({})) is None
+        assert parse_retry_after(ValueError("no response")) is None
+
+    def test_wait_uses_header_then_fallback(self):
+        wait = wait_retry_after(lambda state: 42.0, max_wait=30.0)
+
+        def state_for(error):
+            outcome = SimpleNamespace(exception=lambda: error)
+            return SimpleNamespace(outcome=outcome)
+
+        assert wait(state_for(make_error({"retry-after": "3"}))) == 3.0
+        assert wait(state_for(make_error({"retry-after": "120"}))) == 30.0
+        assert wait(state_for(make_error({}))) == 42.0
@@ -0,0 +1,99 @@
+"""
+Unit tests for dag module (dependency graph ordering and diagnostics).
+"""
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentTask
+from src.specify_cli.batch_aggregator import BatchAggregator, BatchConfig
+from src.specify_cli.dag import CycleError, DependencyGraph, UnknownDependencyError
+from src.specify_cli.template_compiler import TemplateCompiler
+from src.specify_cli.wave_scheduler import Wave, WaveConfig, WaveScheduler
+
+
+class TestDependencyGraph:
+    """Test ordering, levels and error reporting."""
+
+    def test_topological_order_is_stable(self):
+        graph = DependencyGraph({"c": ["a", "b"], "a": [], "b": ["a"], "d": None})
+        assert graph.topological_order() == ["a", "d", "b", "c"]
+
+    def test_levels_are_longest_path(self):
+        graph = DependencyGraph({"a": [], "b": ["a"], "c": ["a", "b"], "d": []})
+        assert graph.levels() == {"a": 0, "b": 1, "c": 2, "d": 0}
+
+    def test_ancestors_are_transitive(self):
+        graph = DependencyGraph({"a": [], "b": ["a"], "c": ["b"], "d": []})
+        assert graph.ancestors("c") == {"a", "b"}
+        assert graph.ancestors("d") == set()
+
+    def test_string_dependency_is_one_name(self):
+        graph = DependencyGraph({"setup": [], "build": "setup"})
+        assert graph.dependencies["build"] == ["setup"]
+
+    def test_unknown_dependency_raises(self):
+        with pytest.raises(UnknownDependencyError, match="'missing'") as info:
+            DependencyGraph({"a": ["missing"]})
+        assert info.value.node == "a"
+        assert info.value.missing == ["missing"]
+
+    def test_unknown_dependency_can_be_ignored(self):
+        graph = DependencyGraph({"a": ["missing"], "b": ["a"]}, on_unknown="ignore")
+        assert graph.unknown == {"a": ["missing"]}
+        assert graph.levels() == {"a": 0, "b": 1}
+
+    def test_cycle_path_is_reported(self):
+        graph = DependencyGraph({"ok": [], "a": ["b"], "b": ["c"], "c": ["a"], "tail": ["a"]})
+        with pytest.raises(CycleError) as info:
+            graph.topological_order()
+        assert info.value.cycle == ["a", "b", "c", "a"]
+        assert "a -> b -> c -> a" in str(info.value)
+
+    def test_self_dependency_is_a_cycle(self):
+        with pytest.raises(CycleError) as info:
+            DependencyGraph({"a": ["a"]}).levels()
+        assert info.value.cycle == ["a", "a"]
+
+    def test_long_chain_is_linear(self):
+        graph = DependencyGraph({f"n{i}": [f"n{i - 1}"] if i else [] for i in range(20000)})
+        assert graph.levels()["n19999"] == 19999
+
+
+class TestConsumers:
+    """Test the scheduler, aggregator and compiler share the diagnostics."""
+
+    def test_build_waves_reports_unknown_dependency(self):
+        tasks = [AgentTask(name="a", prompt="", depends_on=["typo"])]
+        with pytest.raises(UnknownDependencyError, match="typo"):
+            WaveScheduler(None).build_waves(tasks)
+
+    def test_build_waves_reports_cycle(self):
+        tasks = [
+            AgentTask(name="a", prompt="", depends_on=["b"]),
+            AgentTask(name="b", prompt="", depends_on=["a"]),
+        ]
+        with pytest.raises(ValueError, match="Circular dependency detected: a -> b -> a"):
+            WaveScheduler(None).build_waves(tasks)
+
+    def test_build_waves_carries_over_beyond_max_parallel(self):
+        tasks = [AgentTask(name=f"t{i}", prompt="") for i in range(3)]
+        tasks.append(AgentTask(name="after", prompt="", depends_on=["t0"]))
+        waves = WaveScheduler(None, WaveConfig(max_parallel=2)).build_waves(tasks)
+        assert [[t.name for t in w.tasks] for w in waves] == [["t0", "t1"], ["t2", "after"]]
+
+    def test_aggregator_rejects_cycle(self):
+        tasks = [
+            AgentTask(name="a", prompt="", depends_on=["b"]),
+            AgentTask(name="b", prompt="", depends_on=["a"]),
+        ]
+        aggregator = BatchAggregator(BatchConfig(enabled=True))
+        with pytest.raises(CycleError):
+            aggregator.aggregate([Wave(index=0, tasks=tasks)])
+
+    def test_compiler_wave_assignments(self, tmp_path):
+        compiler = TemplateCompiler(tmp_path, tmp_path, tmp_path)
+        subagents = [
+            {"role": "writer", "depends_on": ["reader", "undefined-role"]},
+            {"role": "reader", "depends_on": []},
+        ]
+        assert compiler._compute_wave_assignments(subagents) == {"writer": 1, "reader": 0}
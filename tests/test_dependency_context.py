@@ -0,0 +1,181 @@
+"""
+Unit tests for upstream output injection into dependent task prompts.
+"""
+
+import asyncio
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentTask, PoolConfig
+from src.specify_cli.dependency_context import (
+    ContextEdge,
+    allocate_budget,
+    build_dependency_context,
+    extract_section,
+    parse_context_edges,
+    summarize,
+    truncate_to_tokens,
+)
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig, WaveScheduler
+
+from .fakes import make_pool
+
+
+ANALYSIS = """# Analysis
+
+The service needs a token store.
+It is read-heavy.
+
+More detail that a summary drops.
+
+## Interfaces
+
+TokenStore.get(key) -> Token
+TokenStore.put(token)
+
+### Errors
+
+KeyError when missing.
+
+## Risks
+
+Clock skew.
+"""
+
+
+class TestContextEdges:
+    """Test parsing of context_from specs."""
+
+    def test_forms(self):
+        edges = parse_context_edges({
+            "a": None,
+            "b": "summary",
+            "c": "section:Interfaces",
+            "d": {"section": "Risks", "max_tokens": 50},
+        })
+        assert [(e.source, e.mode, e.section, e.max_tokens) for e in edges] == [
+            ("a", "full", None, None),
+            ("b", "summary", None, None),
+            ("c", "section", "Interfaces", None),
+            ("d", "section", "Risks", 50),
+        ]
+        assert [e.mode for e in parse_context_edges(["a", "b"])] == ["full", "full"]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match="Unknown context mode"):
+            ContextEdge.from_spec("a", "everything")
+        with pytest.raises(ValueError, match="needs a heading"):
+            ContextEdge.from_spec("a", "section")
+
+
+class TestSelection:
+    """Test full/summary/section selection and truncation."""
+
+    def test_extract_section_includes_subsections(self):
+        section = extract_section(ANALYSIS, "## interfaces")
+        assert section.startswith("## Interfaces")
+        assert "KeyError" in section
+        assert "Clock skew" not in section
+        assert extract_section(ANALYSIS, "Missing") is None
+
+    def test_summary_keeps_headings_and_first_paragraphs(self):
+        summary = summarize(ANALYSIS)
+        assert "It is read-heavy." in summary
+        assert "More detail" not in summary
+        assert "## Risks" in summary and "Clock skew." in summary
+
+    def test_truncation_is_deterministic_and_bounded(self):
+        text = "\n".join(f"line {i}" for i in range(200))
+        clipped, truncated = truncate_to_tokens(text, 50)
+        assert truncated
+        assert len(clipped) <= 50 * 4
+        assert clipped.endswith("[... truncated]")
+        assert truncate_to_tokens(text, 50) == (clipped, True)
+        assert truncate_to_tokens("short", 50) == ("short", False)
+
+    def test_water_filling(self):
+        assert allocate_budget([100, 10, 500], 300) == [100, 10, 190]
+        assert allocate_budget([400, 400], 300) == [150, 150]
+        assert sum(allocate_budget([7, 900, 900, 3], 1000)) <= 1000
+
+    def test_budget_and_report(self):
+        edges = parse_context_edges({"big": "full", "small": "full", "gone": "summary"})
+        outputs = {"big": "x" * 4000, "small": "tiny output"}
+
+        context, report = build_dependency_context(edges, outputs, budget_tokens=300)
+
+        assert report["gone"] == {"mode": "summary", "missing": True, "tokens": 0}
+        assert report["small"]["truncated"] is False
+        assert report["big"]["truncated"] is True
+        assert report["big"]["source_tokens"] == 1000
+        assert sum(entry["tokens"] for entry in report.values()) <= 300
+        assert context.index('name="big"') < context.index('name="small"')
+
+
+class TestInjection:
+    """Test dispatch-time injection in WaveScheduler."""
+
+    def tasks(self, spec="section:Interfaces"):
+        return [
+            AgentTask(name="analyzer", prompt="analyze"),
+            AgentTask(
+                name="builder", prompt="build it", depends_on=["analyzer"],
+                context_from={"analyzer": spec},
+            ),
+        ]
+
+    def prompts(self, pool):
+        return {
+            call["messages"][0]["content"]: call
+            for client in pool.clients for call in client.messages.calls
+        }
+
+    @pytest.mark.parametrize("strategy", list(ExecutionStrategy))
+    def test_upstream_section_is_injected(self, strategy):
+        pool = make_pool(PoolConfig(pool_size=2), text=ANALYSIS)
+        scheduler = WaveScheduler(pool, WaveConfig(strategy=strategy))
+
+        results = asyncio.run(scheduler.execute_all(self.tasks()))
+
+        builder_prompt = [p for p in self.prompts(pool) if p.endswith("build it")][0]
+        assert builder_prompt.startswith('<dependency_output name="analyzer" mode="section">\n## Interfaces')
+        assert "Clock skew" not in builder_prompt
+        injected = results["builder"].metadata["dependency_context"]["analyzer"]
+        assert injected["tokens"] > 0 and injected["truncated"] is False
+        assert results["builder"].metadata["dependency_context_tokens"] == injected["tokens"]
+        assert "dependency_context" not in results["analyzer"].metadata
+
+    def test_task_budget_is_enforced(self):
+        pool = make_pool(text=ANALYSIS)
+        tasks = self.tasks(spec="full")
+        tasks[1].context_budget_tokens = 20
+        scheduler = WaveScheduler(pool, WaveConfig(strategy=ExecutionStrategy.SEQUENTIAL))
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        injected = results["builder"].metadata["dependency_context"]["analyzer"]
+        assert injected["truncated"] is True
+        assert injected["tokens"] <= 20
+
+    def test_source_must_be_upstream(self):
+        tasks = [
+            AgentTask(name="root", prompt="root"),
+            AgentTask(name="mid", prompt="mid", depends_on=["root"]),
+            AgentTask(name="leaf", prompt="leaf", depends_on=["mid"], context_from=["root"]),
+            AgentTask(name="early", prompt="early", context_from=["leaf"]),
+        ]
+        scheduler = WaveScheduler(None, WaveConfig(strategy=ExecutionStrategy.OVERLAPPED))
+
+        with pytest.raises(ValueError, match=r"'early': context_from sources must be upstream.*'leaf'"):
+            scheduler.build_waves(tasks)
+
+        # Transitive dependencies are valid sources
+        assert len(scheduler.build_waves(tasks[:3])) == 3
+
+    def test_tasks_without_context_are_unchanged(self):
+        pool = make_pool(text=ANALYSIS)
+        tasks = self.tasks()
+        tasks[1].context_from = {}
+        asyncio.run(WaveScheduler(pool).execute_all(tasks))
+
+        assert "build it" in self.prompts(pool)
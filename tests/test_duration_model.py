@@ -0,0 +1,74 @@
+"""
+Unit tests for duration_model module (task duration history and estimates).
+"""
+
+from src.specify_cli.agent_pool import AgentResult, AgentTask, ModelTier
+from src.specify_cli.duration_model import DurationModel
+
+
+def make_result(duration_ms, success=True, cached=False, tier="sonnet"):
+    return AgentResult(
+        name="a", output="ok", success=success, duration_ms=duration_ms,
+        model_used="m", model_tier=tier, tokens_in=10, tokens_out=5, cost=0.0, cached=cached,
+    )
+
+
+class TestDurationModel:
+    """Test estimates, history updates and persistence."""
+
+    def test_static_estimate_scales_with_tier_and_tokens(self):
+        model = DurationModel()
+        opus = AgentTask(name="o", prompt="", model=ModelTier.OPUS.value, max_tokens=2000)
+        haiku = AgentTask(name="h", prompt="", model=ModelTier.HAIKU.value, max_tokens=2000)
+        short = AgentTask(name="s", prompt="", model=ModelTier.OPUS.value, max_tokens=200)
+
+        assert model.estimate_ms(opus) > model.estimate_ms(haiku)
+        assert model.estimate_ms(opus) > model.estimate_ms(short)
+
+    def test_history_overrides_static_estimate(self):
+        model = DurationModel(smoothing=0.5)
+        task = AgentTask(name="a", prompt="", role_group="REVIEW")
+
+        model.record(task, make_result(1000))
+        assert model.estimate_ms(task) == 1000
+        model.record(task, make_result(3000))
+        assert model.estimate_ms(task) == 2000
+        assert model.history["REVIEW/sonnet"]["samples"] == 2
+
+    def test_failed_and_cached_results_are_ignored(self):
+        model = DurationModel()
+        task = AgentTask(name="a", prompt="")
+        model.record(task, make_result(5, success=False))
+        model.record(task, make_result(0, cached=True))
+        assert model.history == {}
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "history" / "durations.json"
+        model = DurationModel()
+        model.record(AgentTask(name="a", prompt=""), make_result(1234))
+        model.save(path)
+
+        assert DurationModel.load(path).history == model.history
+
+    def test_missing_or_corrupt_file_loads_empty(self, tmp_path):
+        assert DurationModel.load(tmp_path / "missing.json").history == {}
+        bad = tmp_path / "bad.json"
+        bad.write_text("{not json", encoding="utf-8")
+        assert DurationModel.load(bad).history == {}
+
+    def test_spread_and_tokens_are_tracked(self, tmp_path):
+        model = DurationModel(smoothing=0.5)
+        task = AgentTask(name="a", prompt="x" * 400, max_tokens=1000)
+
+        assert model.stddev_ms(task) is None
+        assert model.estimate_tokens(task) == (100, 500)
+
+        model.record(task, make_result(1000))
+        assert model.stddev_ms(task) is None
+        model.record(task, make_result(3000))
+        assert model.stddev_ms(task) == 1000
+        assert model.estimate_tokens(task) == (10, 5)
+
+        path = tmp_path / "durations.json"
+        model.save(path)
+        assert DurationModel.load(path).stddev_ms(task) == 1000
@@ -0,0 +1,102 @@
+"""
+Unit tests for hedged requests in DistributedAgentPool and critical-path marking.
+"""
+
+import asyncio
+
+from src.specify_cli.agent_pool import AgentTask, PoolConfig
+from src.specify_cli.wave_scheduler import WaveScheduler
+
+from .fakes import make_pool
+
+
+def hedging_pool(**client_kwargs):
+    pool = make_pool(
+        PoolConfig(pool_size=4, hedging=True, hedge_min_samples=3, hedge_critical_only=True),
+        **client_kwargs,
+    )
+    # Seed latency history: p90 for sonnet is 20ms
+    pool._latency_samples["sonnet"].extend([10, 15, 20])
+    return pool
+
+
+def critical_task(name="a"):
+    return AgentTask(name=name, prompt="p", metadata={"critical_path": True})
+
+
+class TestHedgedRequests:
+    """Test duplicate dispatch, winner selection and overhead accounting."""
+
+    def test_no_hedge_before_enough_samples(self):
+        pool = make_pool(PoolConfig(pool_size=2, hedging=True, hedge_min_samples=3))
+        assert pool.hedge_delay_ms("sonnet") is None
+
+    def test_straggler_is_hedged_and_hedge_wins(self):
+        pool = hedging_pool(delays=[0.5, 0.01])
+        result = asyncio.run(pool.execute_task(critical_task()))
+
+        stats = pool.get_statistics()["hedging"]
+        assert result.success
+        assert stats["launched"] == 1
+        assert stats["won"] == 1
+        assert len(pool.clients[0].messages.calls) == 2
+        assert result.duration_ms < 400
+
+    def test_fast_primary_is_not_hedged(self):
+        pool = hedging_pool(delays=[0.001])
+        asyncio.run(pool.execute_task(critical_task()))
+        assert pool.get_statistics()["hedging"]["launched"] == 0
+
+    def test_non_critical_tasks_are_not_hedged(self):
+        pool = hedging_pool(delays=[0.1])
+        asyncio.run(pool.execute_task(AgentTask(name="a", prompt="p")))
+        assert pool.get_statistics()["hedging"]["launched"] == 0
+
+    def test_primary_wins_and_hedge_is_cancelled(self):
+        pool = hedging_pool(delays=[0.04, 0.5])
+        result = asyncio.run(pool.execute_task(critical_task()))
+
+        stats = pool.get_statistics()
+        assert result.success
+        assert stats["hedging"]["launched"] == 1
+        assert stats["hedging"]["won"] == 0
+        assert stats["hedging"]["extra_cost"] == 0.0
+        assert stats["total_requests"] == 1
+
+    def test_overhead_is_booked_separately_and_charged_to_budget(self):
+        pool = make_pool(PoolConfig(pool_size=1, hedging=True, max_cost=10.0))
+        loser = asyncio.run(pool.execute_task(AgentTask(name="a", prompt="p")))
+
+        pool._record_hedge_overhead(loser)
+
+        stats = pool.get_statistics()
+        assert stats["hedging"]["extra_cost"] == loser.cost
+        assert stats["budget"]["spent_cost"] == 2 * loser.cost
+
+
+class TestCriticalPath:
+    """Test longest-chain marking in build_waves."""
+
+    def test_longest_chain_is_marked(self):
+        tasks = [
+            AgentTask(name="a", prompt="", max_tokens=100),
+            AgentTask(name="b", prompt="", max_tokens=5000),
+            AgentTask(name="c", prompt="", max_tokens=100, depends_on=["a", "b"]),
+            AgentTask(name="d", prompt="", max_tokens=100),
+        ]
+        scheduler = WaveScheduler(None)
+        scheduler.build_waves(tasks)
+
+        assert scheduler.critical_path == ["b", "c"]
+        # The caller's tasks stay unflagged; dispatched copies carry the flag
+        assert all("critical_path" not in t.metadata for t in tasks)
+        prepared = {t.name: t for t in scheduler._prepare_tasks(tasks)}
+        assert prepared["b"].metadata["critical_path"] is True
+        assert "critical_path" not in prepared["a"].metadata
+
+        # A later plan with other durations flags only its own path
+        tasks[0].max_tokens = 20_000
+        scheduler.build_waves(tasks)
+        prepared = {t.name: t for t in scheduler._prepare_tasks(tasks)}
+        assert scheduler.critical_path == ["a", "c"]
+        assert "critical_path" not in prepared["b"].metadata
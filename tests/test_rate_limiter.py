@@ -0,0 +1,125 @@
+"""
+Unit tests for rate_limiter module and its use in DistributedAgentPool.
+"""
+
+import asyncio
+
+from src.specify_cli.agent_pool import AgentTask, DistributedAgentPool, PoolConfig
+from src.specify_cli.rate_limiter import RateLimiter, TokenBucket
+
+from .fakes import FakeClient
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """Test refill and debt behaviour of a single bucket."""
+
+    def test_starts_full_and_refills(self):
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=60, refill_per_second=1.0, clock=clock)
+        assert bucket.level == 60
+
+        bucket.consume(60)
+        assert bucket.time_until(10) == 10.0
+
+        clock.now = 5.0
+        assert bucket.level == 5.0
+
+    def test_refill_capped_at_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=1.0, clock=clock)
+        bucket.consume(5)
+        clock.now = 100.0
+        assert bucket.level == 10
+
+    def test_consume_can_go_into_debt(self):
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=1.0, clock=clock)
+        bucket.consume(15)
+        assert bucket.level == -5
+        assert bucket.time_until(1) == 6.0
+
+
+class TestRateLimiter:
+    """Test admission, refunds and statistics."""
+
+    def test_disabled_limiter_admits_immediately(self):
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+        reserved = asyncio.run(limiter.acquire(5000))
+        assert reserved == 5000
+        assert limiter.enabled is False
+
+    def test_request_bucket_throttles_after_burst(self):
+        limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=None)
+        bucket = limiter.request_bucket
+        asyncio.run(limiter.acquire(1))
+        asyncio.run(limiter.acquire(1))
+        # Both burst requests admitted; next one must wait ~30s for refill
+        assert bucket.time_until(1) > 29
+
+    def test_settle_refunds_unused_tokens(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=1000, clock=clock)
+        reserved = asyncio.run(limiter.acquire(800))
+        assert limiter.token_bucket.level == 200
+
+        limiter.settle(reserved, actual_tokens=300)
+        assert limiter.token_bucket.level == 700
+        assert limiter.get_statistics()["tokens_refunded"] == 500
+
+    def test_settle_debits_overrun(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=1000, clock=clock)
+        reserved = asyncio.run(limiter.acquire(100))
+        limiter.settle(reserved, actual_tokens=400)
+        assert limiter.token_bucket.level == 600
+
+    def test_oversized_request_clamped_to_capacity(self):
+        limiter = RateLimiter(tokens_per_minute=1000)
+        reserved = asyncio.run(limiter.acquire(50_000))
+        assert reserved == 1000
+
+    def test_waiters_are_throttled_and_counted(self):
+        # 600 TPM = 10 tokens/s; second acquire must wait ~0.1s
+        limiter = RateLimiter(tokens_per_minute=600)
+
+        async def scenario():
+            await limiter.acquire(600)
+            await limiter.acquire(1)
+
+        asyncio.run(scenario())
+        stats = limiter.get_statistics()
+        assert stats["acquisitions"] == 2
+        assert stats["throttled"] == 1
+        assert stats["max_wait_ms"] >= 50
+        assert stats["queue_depth"] == 0
+
+
+class TestPoolRateLimiting:
+    """Test that DistributedAgentPool admits calls through the limiter."""
+
+    def test_pool_settles_with_real_usage(self):
+        pool = DistributedAgentPool(
+            config=PoolConfig(pool_size=2, requests_per_minute=100, tokens_per_minute=100_000)
+        )
+        pool.clients = [FakeClient(tokens_in=100, tokens_out=50) for _ in range(2)]
+
+        task = AgentTask(name="a", prompt="x" * 400, max_tokens=1000)
+        assert task.estimate_tokens() == 1100
+
+        results = asyncio.run(pool.execute_wave([task]))
+        assert results["a"].success
+
+        stats = pool.get_statistics()["rate_limiter"]
+        assert stats["acquisitions"] == 1
+        assert stats["tokens_reserved"] == 1100
+        assert stats["tokens_refunded"] == 950
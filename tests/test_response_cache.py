@@ -0,0 +1,148 @@
+"""
+Unit tests for response_cache module and its use in DistributedAgentPool.
+"""
+
+import asyncio
+
+from src.specify_cli.agent_pool import AgentTask, ModelTier, PoolConfig
+from src.specify_cli.response_cache import ResponseCache
+
+from .fakes import FakeClient, make_pool
+
+
+def make_cached_pool(cache_dir, refresh=False, **config):
+    """Create a cache-enabled pool whose clients are replaced with fakes."""
+    config = PoolConfig(
+        pool_size=1,
+        response_cache=True,
+        cache_dir=str(cache_dir),
+        cache_refresh=refresh,
+        **config,
+    )
+    return make_pool(config, text="answer", tokens_in=100, tokens_out=50)
+
+
+class TestResponseCache:
+    """Test keying, expiry and eviction."""
+
+    def test_key_is_order_independent(self):
+        a = ResponseCache.key_for({"model": "m", "max_tokens": 10})
+        b = ResponseCache.key_for({"max_tokens": 10, "model": "m"})
+        c = ResponseCache.key_for({"max_tokens": 11, "model": "m"})
+        assert a == b
+        assert a != c
+
+    def test_roundtrip_and_ttl(self, tmp_path):
+        now = [1000.0]
+        cache = ResponseCache(tmp_path, ttl_s=60, clock=lambda: now[0])
+        cache.put("k", {"output": "x"})
+        assert cache.get("k") == {"output": "x"}
+
+        now[0] += 61
+        assert cache.get("k") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_lru_eviction_by_entry_count(self, tmp_path):
+        now = [0.0]
+        cache = ResponseCache(tmp_path, max_entries=2, clock=lambda: now[0])
+        for key in ("a", "b"):
+            now[0] += 1
+            cache.put(key, {"output": key})
+        now[0] += 1
+        cache.get("a")  # "b" is now least recently used
+        now[0] += 1
+        cache.put("c", {"output": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.evictions == 1
+
+    def test_eviction_by_size(self, tmp_path):
+        now = [0.0]
+        cache = ResponseCache(tmp_path, max_bytes=250, clock=lambda: now[0])
+        for key in ("a", "b", "c"):
+            now[0] += 1
+            cache.put(key, {"output": key * 100})
+
+        stats = cache.get_statistics()
+        assert stats["bytes"] <= 250
+        assert cache.get("c") is not None
+        assert cache.get("a") is None
+
+    def test_refresh_skips_reads_but_writes(self, tmp_path):
+        ResponseCache(tmp_path).put("k", {"output": "old"})
+        cache = ResponseCache(tmp_path, refresh=True)
+        assert cache.get("k") is None
+        cache.put("k", {"output": "new"})
+        assert ResponseCache(tmp_path).get("k") == {"output": "new"}
+
+
+class TestPoolResponseCache:
+    """Test that the pool serves repeated requests from the cache."""
+
+    def test_second_run_is_cached_and_free(self, tmp_path):
+        task = AgentTask(name="a", prompt="p")
+
+        first = make_cached_pool(tmp_path)
+        result = asyncio.run(first.execute_wave([task]))["a"]
+        assert not result.cached
+        assert result.cost > 0
+
+        second = make_cached_pool(tmp_path)
+        result = asyncio.run(second.execute_wave([task]))["a"]
+        assert result.cached
+        assert result.output == "answer"
+        assert result.cost == 0.0
+        assert second.clients[0].messages.calls == []
+
+        stats = second.get_statistics()
+        assert stats["total_requests"] == 0
+        assert stats["response_cache"]["cached_results"] == 1
+        assert stats["response_cache"]["saved_tokens"] == 150
+
+    def test_downgraded_task_is_cached_on_rerun(self, tmp_path):
+        task = AgentTask(name="a", prompt="p", model=ModelTier.OPUS.value)
+        # Opus does not fit the budget; sonnet does
+        budget = {"max_cost": 0.2, "budget_downgrade_below": 0.0}
+
+        first = make_cached_pool(tmp_path, **budget)
+        result = asyncio.run(first.execute_wave([task]))["a"]
+        assert not result.cached
+        assert first.clients[0].messages.calls[0]["model"] == ModelTier.SONNET.value
+
+        second = make_cached_pool(tmp_path, **budget)
+        result = asyncio.run(second.execute_wave([task]))["a"]
+        assert result.cached
+        assert second.clients[0].messages.calls == []
+        assert second.get_statistics()["budget"]["reserved_cost"] == 0
+
+    def test_changed_request_misses(self, tmp_path):
+        asyncio.run(make_cached_pool(tmp_path).execute_wave([AgentTask(name="a", prompt="p")]))
+
+        pool = make_cached_pool(tmp_path)
+        task = AgentTask(name="a", prompt="p", temperature=0.2)
+        result = asyncio.run(pool.execute_wave([task]))["a"]
+        assert not result.cached
+
+    def test_refresh_calls_api(self, tmp_path):
+        task = AgentTask(name="a", prompt="p")
+        asyncio.run(make_cached_pool(tmp_path).execute_wave([task]))
+
+        pool = make_cached_pool(tmp_path, refresh=True)
+        result = asyncio.run(pool.execute_wave([task]))["a"]
+        assert not result.cached
+        assert len(pool.clients[0].messages.calls) == 1
+
+    def test_failures_are_not_cached(self, tmp_path):
+        pool = make_cached_pool(tmp_path)
+        pool.clients = [FakeClient(errors=[ValueError("boom")])]
+        result = asyncio.run(pool.execute_wave([AgentTask(name="a", prompt="p")]))["a"]
+        assert not result.success
+        assert pool.response_cache.get_statistics()["entries"] == 0
+
+    def test_statistics_readable_after_close(self, tmp_path):
+        pool = make_cached_pool(tmp_path)
+        asyncio.run(pool.execute_wave([AgentTask(name="a", prompt="p")]))
+        asyncio.run(pool.close())
+        assert pool.get_statistics()["response_cache"]["entries"] == 1
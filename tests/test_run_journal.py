@@ -0,0 +1,136 @@
+"""
+Unit tests for the run journal and WaveScheduler checkpoint/resume.
+"""
+
+import asyncio
+import dataclasses
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentResult, AgentTask, ResultStatus
+from src.specify_cli.run_journal import RunJournal, task_fingerprint
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig, WaveScheduler
+
+from .fakes import make_pool
+
+
+def make_result(name, success=True, **kwargs):
+    return AgentResult(
+        name=name, output=f"{name} output", success=success, duration_ms=10,
+        model_used="m", model_tier="sonnet", tokens_in=1, tokens_out=2, cost=0.5, **kwargs,
+    )
+
+
+def pipeline():
+    # a -> b -> c, plus an independent d
+    return [
+        AgentTask(name="a", prompt="a"),
+        AgentTask(name="b", prompt="b", depends_on=["a"]),
+        AgentTask(name="c", prompt="c", depends_on=["b"]),
+        AgentTask(name="d", prompt="d"),
+    ]
+
+
+class TestRunJournal:
+    """Test journal storage."""
+
+    def test_create_and_open(self, tmp_path):
+        journal = RunJournal.create(tmp_path, meta={"command": "implement", "feature": "001"})
+
+        reopened = RunJournal.open(journal.run_id, tmp_path)
+        assert reopened.path == journal.path
+        assert reopened.meta["feature"] == "001"
+
+        with pytest.raises(FileNotFoundError):
+            RunJournal.open("missing", tmp_path)
+
+    def test_round_trip_keeps_latest_entry(self, tmp_path):
+        journal = RunJournal.create(tmp_path, run_id="run")
+        journal.record("fp", make_result("a", success=False, error="boom"))
+        journal.record("fp", make_result("a"))
+
+        fingerprint, result = journal.load()["a"]
+        assert fingerprint == "fp"
+        assert result.success and result.status is ResultStatus.SUCCESS
+        assert result.cost == 0.5
+
+    def test_truncated_line_is_ignored(self, tmp_path):
+        journal = RunJournal.create(tmp_path, run_id="run")
+        journal.record("fp", make_result("a"))
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"task": "b", "fingerp')
+
+        assert list(journal.load()) == ["a"]
+
+    def test_only_unchanged_successes_are_reused(self, tmp_path):
+        journal = RunJournal.create(tmp_path, run_id="run")
+        journal.record("fp-a", make_result("a"))
+        journal.record("fp-b", make_result("b", success=False))
+        journal.record("old", make_result("c"))
+
+        reusable = journal.successful_results({"a": "fp-a", "b": "fp-b", "c": "new"})
+        assert list(reusable) == ["a"]
+
+    def test_fingerprint_tracks_definition_not_scheduling(self):
+        task = AgentTask(name="a", prompt="a", depends_on=["x", "y"])
+        assert task_fingerprint(task) == task_fingerprint(
+            dataclasses.replace(task, priority=1, timeout_ms=100, depends_on=["y", "x"])
+        )
+        assert task_fingerprint(task) != task_fingerprint(dataclasses.replace(task, prompt="b"))
+
+
+class TestResume:
+    """Test skipping journalled tasks in WaveScheduler."""
+
+    @pytest.mark.parametrize("strategy", list(ExecutionStrategy))
+    def test_resume_runs_only_remaining_frontier(self, tmp_path, strategy):
+        journal = RunJournal.create(tmp_path, run_id="run")
+
+        # First run is cut short while "b" is in flight
+        config = WaveConfig(strategy=strategy, fail_fast=False, timeout_total_ms=300)
+        pool = make_pool(delays=[0.0, 0.0, 5.0])
+        first = asyncio.run(WaveScheduler(pool, config, journal=journal).execute_all(pipeline()))
+        assert {n for n, r in first.items() if r.success} == {"a", "d"}
+
+        # Resume: "a" and "d" are restored, only "b" and "c" execute
+        pool = make_pool()
+        config = WaveConfig(strategy=strategy, fail_fast=False)
+        scheduler = WaveScheduler(pool, config, journal=RunJournal.open("run", tmp_path))
+        results = asyncio.run(scheduler.execute_all(pipeline()))
+
+        assert sorted(scheduler.restored) == ["a", "d"]
+        assert all(r.success for r in results.values())
+        assert sum(len(c.messages.calls) for c in pool.clients) == 2
+        # Restored results do not count as new duration samples
+        assert scheduler.durations.history["DEFAULT/sonnet"]["samples"] == 2
+
+    def test_changed_task_is_rerun(self, tmp_path):
+        journal = RunJournal.create(tmp_path, run_id="run")
+        asyncio.run(WaveScheduler(make_pool(), journal=journal).execute_all(pipeline()))
+
+        tasks = pipeline()
+        tasks[3].prompt = "d, reworded"
+        pool = make_pool()
+        scheduler = WaveScheduler(pool, journal=RunJournal.open("run", tmp_path))
+        asyncio.run(scheduler.execute_all(tasks))
+
+        assert sorted(scheduler.restored) == ["a", "b", "c"]
+        assert sum(len(c.messages.calls) for c in pool.clients) == 1
+
+    def test_every_result_is_journalled(self, tmp_path):
+        journal = RunJournal.create(tmp_path, run_id="run")
+        scheduler = WaveScheduler(make_pool(), journal=journal)
+        asyncio.run(scheduler.execute_all(pipeline()))
+
+        assert sorted(journal.load()) == ["a", "b", "c", "d"]
+
+    def test_plan_shows_remaining_frontier(self, tmp_path):
+        journal = RunJournal.create(tmp_path, run_id="run")
+        tasks = pipeline()
+        journal.record(task_fingerprint(tasks[0]), make_result("a"))
+
+        scheduler = WaveScheduler(None, journal=journal)
+        pending = scheduler.restore(tasks)
+        waves = scheduler.build_waves(pending, satisfied=set(scheduler.restored))
+
+        assert [[t.name for t in w.tasks] for w in waves] == [["b", "d"], ["c"]]
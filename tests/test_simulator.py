@@ -0,0 +1,120 @@
+"""
+Unit tests for the discrete-event execution simulator.
+"""
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentTask
+from src.specify_cli.duration_model import DurationModel
+from src.specify_cli.simulator import ExecutionSimulator, SimulationResult
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig
+
+
+def history(mean_ms, var_ms=0.0, tokens_in=100.0, tokens_out=50.0):
+    return DurationModel({
+        "DEFAULT/sonnet": {
+            "mean_ms": mean_ms, "samples": 10, "var_ms": var_ms,
+            "tokens_in": tokens_in, "tokens_out": tokens_out,
+        },
+    })
+
+
+def diamond():
+    # a -> (b, c, d) -> e
+    return [
+        AgentTask(name="a", prompt="a"),
+        AgentTask(name="b", prompt="b", depends_on=["a"]),
+        AgentTask(name="c", prompt="c", depends_on=["a"]),
+        AgentTask(name="d", prompt="d", depends_on=["a"]),
+        AgentTask(name="e", prompt="e", depends_on=["b", "c", "d"]),
+    ]
+
+
+def unlimited(durations, config=None):
+    return ExecutionSimulator(config, durations, requests_per_minute=0, tokens_per_minute=0)
+
+
+class TestSimulate:
+    """Test predictions of single strategies."""
+
+    def test_expected_durations_give_exact_makespan(self):
+        simulator = unlimited(history(1000))
+
+        wide = simulator.simulate(diamond(), ExecutionStrategy.SEQUENTIAL, pool_size=4)
+        narrow = simulator.simulate(diamond(), ExecutionStrategy.SEQUENTIAL, pool_size=1)
+
+        assert wide.makespan_ms == wide.makespan_p90_ms == 3000
+        assert wide.peak_concurrency == 3
+        assert narrow.makespan_ms == 5000
+        assert narrow.utilisation == 1.0
+
+    def test_aggressive_is_never_slower_than_sequential(self):
+        tasks = diamond() + [AgentTask(name="f", prompt="f", depends_on=["b"])]
+        simulator = unlimited(history(1000, var_ms=250_000))
+
+        for pool_size in (1, 2, 4):
+            sequential = simulator.simulate(tasks, ExecutionStrategy.SEQUENTIAL, pool_size)
+            aggressive = simulator.simulate(tasks, ExecutionStrategy.AGGRESSIVE, pool_size)
+            assert aggressive.makespan_ms <= sequential.makespan_ms
+            assert aggressive.peak_concurrency <= pool_size
+
+    def test_sampled_runs_are_reproducible(self):
+        simulator = unlimited(history(1000, var_ms=250_000))
+
+        first = simulator.simulate(diamond(), ExecutionStrategy.OVERLAPPED, 2, runs=50, seed=7)
+        again = simulator.simulate(diamond(), ExecutionStrategy.OVERLAPPED, 2, runs=50, seed=7)
+
+        assert first == again
+        assert first.makespan_p90_ms >= first.makespan_ms * 0.9
+
+    def test_request_limit_throttles(self):
+        tasks = [AgentTask(name=f"t{i}", prompt="x") for i in range(6)]
+        simulator = ExecutionSimulator(durations=history(1000), requests_per_minute=2, tokens_per_minute=0)
+
+        result = simulator.simulate(tasks, ExecutionStrategy.AGGRESSIVE, pool_size=6)
+
+        assert result.throttled_ms > 0
+        # Two requests per minute: the sixth starts two minutes in
+        assert result.makespan_ms == pytest.approx(121_000)
+        # The initial burst plus refill puts three starts in one window
+        assert result.peak_requests_per_minute == 3
+        assert result.rate_limit_pressure == 1.5
+
+    def test_tokens_and_cost_come_from_history(self):
+        simulator = unlimited(history(1000, tokens_in=1000, tokens_out=500))
+        result = simulator.simulate(diamond(), ExecutionStrategy.SEQUENTIAL, 2)
+
+        assert (result.tokens_in, result.tokens_out) == (5000, 2500)
+        assert result.cost > 0
+
+        batch = unlimited(history(1000, tokens_in=1000, tokens_out=500), WaveConfig(backend="batch"))
+        assert batch.simulate(diamond(), ExecutionStrategy.BATCHED, 2).cost < result.cost
+
+    def test_unknown_dependency_raises(self):
+        with pytest.raises(ValueError):
+            unlimited(history(1000)).simulate(
+                [AgentTask(name="a", prompt="a", depends_on=["ghost"])],
+                ExecutionStrategy.SEQUENTIAL, 1,
+            )
+
+
+class TestCompare:
+    """Test comparison across strategies and pool sizes."""
+
+    def test_every_combination_is_simulated(self):
+        results = unlimited(history(1000)).compare(diamond(), pool_sizes=(1, 3))
+
+        assert len(results) == len(ExecutionStrategy) * 2
+        assert {(r.strategy, r.pool_size) for r in results} == {
+            (s.value, p) for s in ExecutionStrategy for p in (1, 3)
+        }
+
+    def test_best_prefers_fastest_then_cheapest_then_smallest(self):
+        def result(p90, cost, pool_size):
+            return SimulationResult("s", pool_size, 1, p90, p90, 1, 1.0, cost, 0, 0, 0, 0, 0.0, 0.0)
+
+        fast = result(1000, 2.0, 8)
+        assert ExecutionSimulator.best([result(2000, 1.0, 1), fast]) is fast
+        assert ExecutionSimulator.best([fast, result(1000, 1.0, 8)]).cost == 1.0
+        assert ExecutionSimulator.best([fast, result(1000, 2.0, 4)]).pool_size == 4
+        assert ExecutionSimulator.best([]) is None
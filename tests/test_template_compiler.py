@@ -0,0 +1,249 @@
+"""
+Unit tests for incremental template compilation.
+"""
+
+import json
+import os
+import threading
+
+from src.specify_cli.template_compiler import MANIFEST_FILE, IncludeResolver, TemplateCompiler
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def template(body):
+    return f"---\ndescription: test\n---\n{body}\n"
+
+
+def make_compiler(tmp_path):
+    root = tmp_path / "templates"
+    write(root / "shared" / "leaf.md", "leaf v1")
+    write(root / "shared" / "middle.md", "middle {{include: shared/leaf.md}}")
+    write(root / "commands" / "plan.md", template("plan {{include: shared/middle.md}}"))
+    write(root / "commands" / "tasks.md", template("tasks {{include: shared/other.md}}"))
+    return TemplateCompiler(root / "commands", root / "shared", tmp_path / "compiled")
+
+
+def by_command(results):
+    return {r.command: r for r in results}
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+class TestIncrementalCompilation:
+    """Test manifest-based rebuilds and write skipping."""
+
+    def test_unchanged_templates_are_not_recompiled(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        first = by_command(compiler.compile_all())
+        assert all(r.success and r.written and not r.up_to_date for r in first.values())
+        assert (tmp_path / "compiled" / MANIFEST_FILE).exists()
+
+        again = by_command(make_compiler(tmp_path).compile_all())
+
+        assert all(r.up_to_date and not r.written for r in again.values())
+        assert again["plan"].source_hash == first["plan"].source_hash
+        assert again["plan"].includes_resolved == ["shared/middle.md", "shared/leaf.md"]
+
+    def test_transitive_include_change_rebuilds_dependents_only(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        compiler.compile_all()
+
+        write(tmp_path / "templates" / "shared" / "leaf.md", "leaf v2")
+        results = by_command(compiler.compile_all())
+
+        assert not results["plan"].up_to_date and results["plan"].written
+        assert results["tasks"].up_to_date
+        output = json.loads(results["plan"].output_file.read_text())
+        assert "leaf v2" in output["prompt"]["user_template"]
+
+    def test_touched_file_with_same_content_is_not_rebuilt(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        compiler.compile_all()
+
+        bump_mtime(tmp_path / "templates" / "shared" / "leaf.md")
+
+        assert all(r.up_to_date for r in compiler.compile_all())
+
+    def test_missing_include_appearing_triggers_rebuild(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        first = by_command(compiler.compile_all())
+        assert "INCLUDE NOT FOUND" in json.loads(first["tasks"].output_file.read_text())["prompt"]["user_template"]
+
+        write(tmp_path / "templates" / "shared" / "other.md", "other")
+        results = by_command(compiler.compile_all())
+
+        assert not results["tasks"].up_to_date
+        assert results["plan"].up_to_date
+
+    def test_forced_rebuild_skips_identical_writes(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        compiler.compile_all()
+        output = tmp_path / "compiled" / "plan.json"
+        before = output.stat().st_mtime_ns
+
+        results = compiler.compile_all(force=True)
+
+        assert all(not r.up_to_date and not r.written for r in results)
+        assert output.stat().st_mtime_ns == before
+
+    def test_deleted_template_output_is_removed(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        compiler.compile_all()
+
+        (tmp_path / "templates" / "commands" / "tasks.md").unlink()
+        results = compiler.compile_all()
+
+        assert [r.command for r in results] == ["plan"]
+        assert not (tmp_path / "compiled" / "tasks.json").exists()
+
+    def test_failures_are_remembered_until_the_template_changes(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        broken = write(tmp_path / "templates" / "commands" / "broken.md", "no frontmatter")
+        assert not by_command(compiler.compile_all())["broken"].success
+
+        cached = by_command(compiler.compile_all())["broken"]
+        assert cached.up_to_date and not cached.success
+        assert cached.error == "No valid YAML frontmatter found"
+
+        write(broken, template("fixed"))
+        assert by_command(compiler.compile_all())["broken"].success
+
+
+class TestWatch:
+    """Test polling-based watch mode."""
+
+    def test_change_triggers_recompile(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        stop = threading.Event()
+        builds = []
+        rebuilt = threading.Event()
+
+        def on_compile(results):
+            builds.append({r.command for r in results if not r.up_to_date})
+            if len(builds) == 2:
+                rebuilt.set()
+
+        watcher = threading.Thread(
+            target=compiler.watch,
+            kwargs={"on_compile": on_compile, "interval_s": 0.02, "stop": stop},
+        )
+        watcher.start()
+        try:
+            while not builds:
+                stop.wait(0.01)
+            write(tmp_path / "templates" / "shared" / "leaf.md", "leaf v2 (edited)")
+            assert rebuilt.wait(5)
+        finally:
+            stop.set()
+            watcher.join(5)
+
+        assert builds == [{"plan", "tasks"}, {"plan"}]
+
+
+class TestParallelCompilation:
+    """Test compilation in a process pool."""
+
+    def outputs(self, tmp_path):
+        outputs = {}
+        for path in sorted((tmp_path / "compiled").glob("*.json")):
+            if path.name != MANIFEST_FILE:
+                data = json.loads(path.read_text())
+                data["meta"].pop("compiled_at")
+                outputs[path.name] = data
+        return outputs
+
+    def test_outputs_do_not_depend_on_worker_count(self, tmp_path):
+        for i in range(4):
+            write(tmp_path / "templates" / "commands" / f"extra{i}.md",
+                  template(f"extra {i} {{{{include: shared/leaf.md}}}}"))
+        serial = make_compiler(tmp_path).compile_all()
+        expected = self.outputs(tmp_path)
+
+        parallel = make_compiler(tmp_path).compile_all(force=True, jobs=3)
+
+        assert [r.command for r in parallel] == [r.command for r in serial]
+        assert [r.source_hash for r in parallel] == [r.source_hash for r in serial]
+        assert [r.includes_resolved for r in parallel] == [r.includes_resolved for r in serial]
+        assert self.outputs(tmp_path) == expected
+
+    def test_parallel_results_are_recorded_in_manifest(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        compiler.compile_all(jobs=2)
+
+        write(tmp_path / "templates" / "shared" / "leaf.md", "leaf v2")
+        reloaded = TemplateCompiler(compiler.templates_dir, compiler.shared_dir, compiler.output_dir)
+        results = by_command(reloaded.compile_all(jobs=2))
+
+        assert not results["plan"].up_to_date
+        assert results["tasks"].up_to_date
+        assert "leaf v2" in json.loads(results["plan"].output_file.read_text())["prompt"]["user_template"]
+
+
+class TestFragmentCache:
+    """Test reuse of include fragments within a build."""
+
+    def resolver(self, tmp_path):
+        shared = tmp_path / "shared"
+        write(shared / "c.md", "---\ntitle: c\n---\nC")
+        write(shared / "a.md", "A[{{include: shared/c.md}}]")
+        write(shared / "b.md", "B[{{include: shared/c.md}}]")
+        return IncludeResolver(shared)
+
+    def resolve(self, resolver, tmp_path, body):
+        source = write(tmp_path / "commands" / "cmd.md", body)
+        return resolver.resolve(body, source)
+
+    def test_diamond_include_is_still_circular(self, tmp_path):
+        resolver = self.resolver(tmp_path)
+        diamond = "{{include: shared/a.md}} {{include: shared/b.md}}"
+
+        first = self.resolve(resolver, tmp_path, diamond)
+        only_b = self.resolve(resolver, tmp_path, "{{include: shared/b.md}}")
+        again = self.resolve(resolver, tmp_path, diamond)
+
+        assert first == (
+            "A[C] B[<!-- CIRCULAR INCLUDE: shared/c.md -->]",
+            ["shared/a.md", "shared/c.md", "shared/b.md"],
+        )
+        assert only_b == ("B[C]", ["shared/b.md", "shared/c.md"])
+        assert again == first
+
+    def test_each_file_is_read_once_per_build(self, tmp_path):
+        resolver = self.resolver(tmp_path)
+
+        for _ in range(3):
+            self.resolve(resolver, tmp_path, "{{include: shared/a.md}} {{include: shared/b.md}}")
+
+        # Later builds look up a and b only: a's expansion already contains c
+        assert resolver.fragments.misses == 3
+        assert resolver.fragments.hits == 4
+        assert resolver.dependencies == [tmp_path / "shared" / name for name in ("a.md", "c.md", "b.md")]
+
+    def test_changed_file_is_read_again(self, tmp_path):
+        resolver = self.resolver(tmp_path)
+        self.resolve(resolver, tmp_path, "{{include: shared/c.md}}")
+
+        write(tmp_path / "shared" / "c.md", "C version two")
+
+        assert self.resolve(resolver, tmp_path, "{{include: shared/c.md}}")[0] == "C version two"
+
+    def test_hit_counters_in_results(self, tmp_path):
+        compiler = make_compiler(tmp_path)
+        write(tmp_path / "templates" / "commands" / "review.md", template("review {{include: shared/middle.md}}"))
+
+        results = by_command(compiler.compile_all())
+
+        # plan reads middle and leaf; hashing them is not counted again
+        assert (results["plan"].fragment_misses, results["plan"].fragment_hits) == (2, 0)
+        # review reuses middle's expansion, which already contains leaf
+        assert (results["review"].fragment_misses, results["review"].fragment_hits) == (0, 1)
+        assert results["review"].fragment_hit_rate == 1.0
+        assert all(r.fragment_hits == 0 for r in compiler.compile_all())
@@ -11,6 +11,9 @@ from src.specify_cli.template_parser import (
     MODEL_MAP,
     MODEL_TIERS,
     TIER_TO_MODEL,
+    load_feature_artifacts,
+    parse_subagents_from_template,
+    parse_template_config,
     read_max_model_from_constitution,
     resolve_model,
 )
@@ -327,3 +330,90 @@ class TestIntegration:
             # No cap applied
             opus_result = resolve_model(None, "opus", max_model)
             assert opus_result == "claude-opus-4-5-20251101"  # unchanged
+
+
+class TestContextFrom:
+    """Test context_from / context_budget subagent keys."""
+
+    TEMPLATE = """---
+claude_code:
+  orchestration:
+    context_budget: 1500
+  subagents:
+    - role: analyzer
+      prompt: analyze
+    - role: builder
+      depends_on: [analyzer]
+      context_from:
+        {source}: "section:Interfaces"
+      context_budget: 800
+      prompt: build
+---
+"""
+
+    def write(self, tmpdir, source="analyzer"):
+        path = Path(tmpdir) / "cmd.md"
+        path.write_text(self.TEMPLATE.replace("{source}", source))
+        return path
+
+    def test_keys_are_parsed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = self.write(tmpdir)
+            builder = parse_subagents_from_template(path, "001")[1]
+            assert builder.context_from == {"analyzer": "section:Interfaces"}
+            assert builder.context_budget_tokens == 800
+            assert parse_template_config(path).wave_config.context_budget_tokens == 1500
+
+    def test_source_must_be_a_dependency(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = self.write(tmpdir, source="reviewer")
+            with pytest.raises(ValueError, match="depends_on"):
+                parse_subagents_from_template(path, "001")
+
+
+class TestFeatureArtifacts:
+    """Test artifact loading and where artifacts end up in prompts."""
+
+    TEMPLATE = """---
+claude_code:
+  subagents:
+    - role: analyzer
+      prompt: analyze
+---
+"""
+
+    def write_project(self, tmpdir):
+        root = Path(tmpdir)
+        (root / "specs" / "001").mkdir(parents=True)
+        (root / "specs" / "001" / "spec.md").write_text("# Spec\nUsers log in.")
+        (root / "memory").mkdir()
+        (root / "memory" / "constitution.md").write_text("# Constitution")
+        template = root / "cmd.md"
+        template.write_text(self.TEMPLATE)
+        return root, template
+
+    def test_missing_artifacts_are_left_out(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root, _ = self.write_project(tmpdir)
+            artifacts = load_feature_artifacts(root, "001")
+            assert artifacts == {"spec.md": "# Spec\nUsers log in.", "constitution.md": "# Constitution"}
+
+    def test_artifacts_are_inlined_by_default(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root, template = self.write_project(tmpdir)
+            artifacts = load_feature_artifacts(root, "001")
+            task = parse_subagents_from_template(template, "001", artifacts=artifacts)[0]
+            assert task.prompt_prefix is None
+            assert task.prompt.startswith("Feature: 001\n\nanalyze")
+            assert "Users log in." in task.prompt
+
+    def test_cached_prefix_carries_artifacts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root, template = self.write_project(tmpdir)
+            artifacts = load_feature_artifacts(root, "001")
+            task = parse_subagents_from_template(
+                template, "001", artifacts=artifacts, cache_shared_prefix=True,
+            )[0]
+            assert task.prompt == "analyze"
+            assert '<artifact name="spec.md">' in task.prompt_prefix
+            assert "# Constitution" in task.prompt_prefix
@@ -0,0 +1,139 @@
+"""
+Unit tests for task/run deadlines and fail-fast cancellation.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentResult, AgentTask, PoolConfig, ResultStatus
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig, WaveScheduler
+
+from .fakes import make_pool
+
+
+def failing_pool(pool_size=2, delays=None):
+    # The first request to finish raises; max_retries=1 disables retries
+    pool = make_pool(
+        PoolConfig(pool_size=pool_size, max_retries=1),
+        delays=delays, errors=[ValueError("boom")],
+    )
+    return pool
+
+
+class TestResultStatus:
+    """Test status derivation."""
+
+    def test_status_follows_success(self):
+        ok = AgentResult(name="a", output="", success=True, duration_ms=0, model_used="m",
+                         model_tier="sonnet", tokens_in=0, tokens_out=0, cost=0.0)
+        failed = AgentResult(name="a", output="", success=False, duration_ms=0, model_used="m",
+                             model_tier="sonnet", tokens_in=0, tokens_out=0, cost=0.0)
+        assert ok.status == ResultStatus.SUCCESS
+        assert failed.status == ResultStatus.FAILED
+
+
+class TestTaskDeadline:
+    """Test per-task deadlines in DistributedAgentPool."""
+
+    def test_hung_request_times_out(self):
+        pool = make_pool(PoolConfig(pool_size=1), delay=5.0)
+        task = AgentTask(name="hung", prompt="p", timeout_ms=50)
+
+        start = time.monotonic()
+        result = asyncio.run(pool.execute_task(task))
+
+        assert result.status == ResultStatus.TIMEOUT
+        assert not result.success
+        assert time.monotonic() - start < 1.0
+        assert 0 < pool.clients[0].messages.calls[0]["timeout"] <= 0.05
+
+    def test_timed_out_task_releases_its_slot(self):
+        pool = make_pool(PoolConfig(pool_size=1), delays=[5.0])
+        tasks = [
+            AgentTask(name="hung", prompt="hung", timeout_ms=50),
+            AgentTask(name="next", prompt="next"),
+        ]
+
+        results = asyncio.run(pool.execute_wave(tasks))
+
+        assert results["hung"].status == ResultStatus.TIMEOUT
+        assert results["next"].success
+        assert pool.default_lane.limiter.in_use == 0
+        assert pool.default_lane.rate_limiter.get_statistics() is not None
+
+    def test_scheduler_applies_default_timeout(self):
+        pool = make_pool(PoolConfig(pool_size=1), delay=5.0)
+        scheduler = WaveScheduler(pool, WaveConfig(timeout_per_task_ms=50, fail_fast=False))
+        tasks = [AgentTask(name="a", prompt="a"), AgentTask(name="b", prompt="b", timeout_ms=80)]
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert all(r.status == ResultStatus.TIMEOUT for r in results.values())
+        # The default is applied to copies, not the caller's tasks
+        assert tasks[0].timeout_ms is None
+        assert tasks[1].timeout_ms == 80
+
+
+class TestRunDeadline:
+    """Test timeout_total_ms cancelling the whole run."""
+
+    @pytest.mark.parametrize("strategy", list(ExecutionStrategy))
+    def test_unfinished_tasks_time_out(self, strategy):
+        pool = make_pool(PoolConfig(pool_size=2), delays=[0.0, 5.0, 5.0])
+        config = WaveConfig(strategy=strategy, timeout_total_ms=100, fail_fast=False)
+        scheduler = WaveScheduler(pool, config)
+        tasks = [
+            AgentTask(name="quick", prompt="quick"),
+            AgentTask(name="slow", prompt="slow"),
+            AgentTask(name="after", prompt="after", depends_on=["quick"]),
+        ]
+
+        start = time.monotonic()
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert time.monotonic() - start < 1.0
+        assert results["quick"].success
+        assert results["slow"].status == ResultStatus.TIMEOUT
+        assert results["after"].status == ResultStatus.TIMEOUT
+        assert pool.in_flight == 0
+
+    def test_fail_fast_raises_on_deadline(self):
+        pool = make_pool(PoolConfig(pool_size=1), delay=5.0)
+        scheduler = WaveScheduler(pool, WaveConfig(timeout_total_ms=50))
+
+        with pytest.raises(RuntimeError, match="deadline"):
+            asyncio.run(scheduler.execute_all([AgentTask(name="a", prompt="a")]))
+        assert scheduler.completed["a"].status == ResultStatus.TIMEOUT
+
+
+class TestFailFastCancellation:
+    """Test that fail-fast stops in-flight work instead of waiting for it."""
+
+    def test_execute_wave_cancels_siblings(self):
+        pool = failing_pool(delays=[5.0, 0.0])
+        tasks = [AgentTask(name="slow", prompt="slow"), AgentTask(name="bad", prompt="bad")]
+
+        start = time.monotonic()
+        results = asyncio.run(pool.execute_wave(tasks, fail_fast=True))
+
+        assert time.monotonic() - start < 1.0
+        assert results["bad"].status == ResultStatus.FAILED
+        assert results["slow"].status == ResultStatus.CANCELLED
+        assert pool.in_flight == 0
+
+    @pytest.mark.parametrize("strategy", [
+        ExecutionStrategy.SEQUENTIAL, ExecutionStrategy.OVERLAPPED, ExecutionStrategy.AGGRESSIVE,
+    ])
+    def test_strategies_cancel_in_flight(self, strategy):
+        pool = failing_pool(delays=[5.0, 0.0])
+        scheduler = WaveScheduler(pool, WaveConfig(strategy=strategy, fail_fast=True))
+        tasks = [AgentTask(name="slow", prompt="slow"), AgentTask(name="bad", prompt="bad")]
+
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="bad"):
+            asyncio.run(scheduler.execute_all(tasks))
+
+        assert time.monotonic() - start < 1.0
+        assert scheduler.completed["slow"].status == ResultStatus.CANCELLED
@@ -0,0 +1,189 @@
+"""
+Unit tests for span tracing, metrics export and their wiring into the
+pool and scheduler.
+"""
+
+import asyncio
+import json
+
+import anthropic
+import httpx
+
+from src.specify_cli.agent_pool import AgentTask, PoolConfig
+from src.specify_cli.tracing import Tracer
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig, WaveScheduler
+
+from .fakes import make_pool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def traced_run(strategy=ExecutionStrategy.SEQUENTIAL, pool_config=None, **client_kwargs):
+    tracer = Tracer()
+    pool = make_pool(pool_config, **client_kwargs)
+    pool.tracer = tracer
+    scheduler = WaveScheduler(pool, WaveConfig(strategy=strategy), tracer=tracer)
+    tasks = [
+        AgentTask(name="a", prompt="a"),
+        AgentTask(name="b", prompt="b"),
+        AgentTask(name="c", prompt="c", depends_on=["a"]),
+    ]
+    asyncio.run(scheduler.execute_all(tasks))
+    return tracer, scheduler
+
+
+def parent_names(tracer):
+    by_id = {s.span_id: s for s in tracer.spans}
+    return {
+        (s.attributes.get("task", s.name), s.name): by_id[s.parent_id].name if s.parent_id else None
+        for s in tracer.spans
+    }
+
+
+class TestTracer:
+    """Test span recording and export formats."""
+
+    def test_spans_nest_across_asyncio_tasks(self):
+        clock = FakeClock()
+        tracer = Tracer(clock=clock)
+
+        async def child(name):
+            with tracer.span(name, "task", task=name):
+                await asyncio.sleep(0)
+
+        async def main():
+            with tracer.span("run", "run"):
+                await asyncio.gather(child("x"), child("y"))
+                clock.now = 2.0
+
+        asyncio.run(main())
+
+        run, x, y = tracer.spans
+        assert x.parent_id == y.parent_id == run.span_id
+        assert run.duration_s == 2.0
+
+    def test_exception_is_recorded(self):
+        tracer = Tracer()
+        try:
+            with tracer.span("boom"):
+                raise ValueError("x")
+        except ValueError:
+            pass
+        assert tracer.spans[0].attributes["error"] == "ValueError"
+        assert tracer.spans[0].end_s is not None
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("run", "run") as span:
+            span.attributes["x"] = 1
+        tracer.increment("specify_tasks_total")
+        tracer.observe("specify_task_duration_seconds", 1.0)
+
+        assert tracer.spans == []
+        assert tracer.to_prometheus() == ""
+
+    def test_prometheus_text_format(self):
+        tracer = Tracer()
+        tracer.increment("specify_tasks_total", status="success", tier="sonnet")
+        tracer.increment("specify_tasks_total", status="success", tier="sonnet")
+        tracer.observe("specify_task_duration_seconds", 0.2, tier='so"n')
+        tracer.observe("specify_task_duration_seconds", 7.0, tier='so"n')
+
+        lines = tracer.to_prometheus().splitlines()
+
+        assert "# TYPE specify_tasks_total counter" in lines
+        assert 'specify_tasks_total{status="success",tier="sonnet"} 2' in lines
+        assert "# TYPE specify_task_duration_seconds histogram" in lines
+        assert 'specify_task_duration_seconds_bucket{tier="so\\"n",le="0.25"} 1' in lines
+        assert 'specify_task_duration_seconds_bucket{tier="so\\"n",le="10"} 2' in lines
+        assert 'specify_task_duration_seconds_bucket{tier="so\\"n",le="+Inf"} 2' in lines
+        assert 'specify_task_duration_seconds_sum{tier="so\\"n"} 7.2' in lines
+
+    def test_chrome_trace_puts_overlapping_tasks_on_separate_tracks(self):
+        clock = FakeClock()
+        tracer = Tracer(clock=clock)
+        tracer.record_span("task", "task", 0.0, 2.0, task="a")
+        tracer.record_span("task", "task", 1.0, 3.0, task="b")
+        tracer.record_span("task", "task", 2.0, 4.0, task="c")
+
+        events = [e for e in tracer.to_chrome_trace()["traceEvents"] if e["ph"] == "X"]
+
+        tids = {e["name"]: e["tid"] for e in events}
+        assert tids["a"] != tids["b"]
+        assert tids["c"] == tids["a"]
+        assert events[1]["ts"] == 1_000_000 and events[1]["dur"] == 2_000_000
+
+
+class TestInstrumentation:
+    """Test spans and metrics recorded by the pool and scheduler."""
+
+    def test_run_wave_task_attempt_hierarchy(self):
+        tracer, _ = traced_run()
+        parents = parent_names(tracer)
+
+        assert parents[("run", "run")] is None
+        assert parents[("wave 1", "wave 1")] == "run"
+        assert parents[("a", "task")] == "wave 1"
+        assert parents[("c", "task")] == "wave 2"
+        assert {name for name, _ in tracer.breakdown().items()} >= {
+            "run", "wave 1", "wave 2", "task", "slot_wait", "rate_limit_wait", "api_attempt",
+        }
+        attempts = [s for s in tracer.spans if s.name == "api_attempt"]
+        assert all(s.attributes["outcome"] == "success" for s in attempts)
+        assert all(s.attributes["tokens_per_s"] > 0 for s in attempts if s.duration_s > 0)
+
+        assert tracer.counter_value("specify_tasks_total", status="success", tier="sonnet") == 3
+        assert tracer.counter_value("specify_tokens_total", direction="out", tier="sonnet") == 150
+        assert "specify_run_duration_seconds" in tracer.to_prometheus()
+
+    def test_retries_and_backoff_are_traced(self):
+        error = anthropic.APIConnectionError(request=httpx.Request("POST", "https://api.anthropic.com"))
+        config = PoolConfig(pool_size=2, backoff_base=0.001, backoff_max=0.01)
+        tracer, _ = traced_run(pool_config=config, errors=[error])
+
+        assert tracer.counter_value("specify_retries_total") == 1
+        assert tracer.counter_value("specify_api_attempts_total", tier="sonnet", outcome="APIConnectionError") == 1
+        backoff = [s for s in tracer.spans if s.name == "backoff"]
+        assert len(backoff) == 1
+        assert parent_names(tracer)[("backoff", "backoff")] == "task"
+        assert tracer.counter_value("specify_backoff_seconds_total") > 0
+
+    def test_dataflow_records_queue_wait(self):
+        tracer, _ = traced_run(ExecutionStrategy.AGGRESSIVE)
+
+        assert "specify_queue_wait_seconds_count 3" in tracer.to_prometheus()
+        assert not any(s.category == "wave" for s in tracer.spans)
+
+    def test_batches_become_spans(self):
+        tracer, _ = traced_run(ExecutionStrategy.BATCHED)
+        assert any(s.name == "batch 1" and s.category == "wave" for s in tracer.spans)
+
+    def test_trace_files(self, tmp_path):
+        tracer, _ = traced_run(ExecutionStrategy.OVERLAPPED, delay=0.01)
+
+        trace = json.loads(tracer.write_chrome_trace(tmp_path / "t" / "run.json").read_text())
+        prom = tracer.write_prometheus(tmp_path / "t" / "run.prom").read_text()
+
+        names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+        assert {"scheduler", "waves 1", "slot 1", "slot 2"} <= names
+        assert "# TYPE specify_api_attempt_seconds histogram" in prom
+
+
+class TestReport:
+    """Test that the report uses wall time."""
+
+    def test_report_duration_is_wall_time(self):
+        pool = make_pool(PoolConfig(pool_size=4), delay=0.05)
+        scheduler = WaveScheduler(pool, WaveConfig(strategy=ExecutionStrategy.SEQUENTIAL, max_parallel=4))
+        asyncio.run(scheduler.execute_all([AgentTask(name=f"t{i}", prompt="p") for i in range(4)]))
+
+        report = scheduler.generate_report()
+        busy_ms = sum(r.duration_ms for r in report.results.values())
+        assert report.total_duration_ms == scheduler.metrics.makespan_ms
+        assert report.total_duration_ms < busy_ms
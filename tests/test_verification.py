@@ -0,0 +1,185 @@
+"""
+Unit tests for the bounded, memoising TDD verification executor.
+"""
+
+import asyncio
+import sys
+
+from src.specify_cli import verification
+from src.specify_cli.agent_pool import AgentResult, AgentTask
+from src.specify_cli.verification import TestFrameworkDetector, VerificationExecutor, tree_hash
+from src.specify_cli.wave_scheduler import TddVerificationConfig, WaveConfig, WaveScheduler
+
+
+class ScriptDetector(TestFrameworkDetector):
+    """Runs test files as plain Python scripts; exit code 1 means red."""
+
+    FRAMEWORKS = {
+        "python": {
+            "detect": ["pyproject.toml"],
+            "command": [sys.executable, "{test_file}"],
+            "fail_exit_codes": [1],
+        },
+    }
+
+    detections = 0
+
+    @classmethod
+    def detect(cls, project_root):
+        cls.detections += 1
+        return super().detect(project_root)
+
+
+# Test scripts log each run next to (not inside) the project tree
+RED = "import sys, time\ntime.sleep({sleep})\nopen('../runs.log', 'a').write('x')\nsys.exit(1)\n"
+GREEN = "open('../runs.log', 'a').write('x')\n"
+
+
+def make_project(tmp_path, tests=None):
+    project = tmp_path / "project"
+    (project / "tests").mkdir(parents=True)
+    (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+    (project / "src.py").write_text("VALUE = 1\n")
+    for name, body in (tests or {"test_a.py": RED.format(sleep=0)}).items():
+        (project / name).write_text(body)
+    return project
+
+
+def runs(project):
+    log = project.parent / "runs.log"
+    return len(log.read_text()) if log.exists() else 0
+
+
+def executor(**kwargs):
+    ScriptDetector.detections = 0
+    return VerificationExecutor(detector=ScriptDetector, **kwargs)
+
+
+class TestVerificationExecutor:
+    """Test detection caching, memoisation and the worker limit."""
+
+    def test_red_and_green(self, tmp_path):
+        project = make_project(tmp_path, {"test_red.py": RED.format(sleep=0), "test_green.py": GREEN})
+        verifier = executor()
+
+        red = asyncio.run(verifier.verify("test_red.py", project))
+        green = asyncio.run(verifier.verify("test_green.py", project))
+
+        assert red.test_ran and red.test_failed and red.exit_code == 1
+        assert green.test_ran and not green.test_failed
+
+    def test_unchanged_test_and_tree_is_memoised(self, tmp_path):
+        project = make_project(tmp_path)
+        verifier = executor()
+
+        first = asyncio.run(verifier.verify("test_a.py", project))
+        again = asyncio.run(verifier.verify("test_a.py", project))
+
+        assert not first.cached and again.cached
+        assert again.test_failed and again.duration_ms == 0
+        assert runs(project) == 1
+        assert ScriptDetector.detections == 1
+        assert verifier.get_statistics()["cache_hits"] == 1
+
+    def test_changes_invalidate_the_memo(self, tmp_path):
+        project = make_project(tmp_path)
+        verifier = executor()
+        asyncio.run(verifier.verify("test_a.py", project))
+
+        (project / "src.py").write_text("VALUE = 2  # implementation changed\n")
+        verifier.invalidate_tree()
+        asyncio.run(verifier.verify("test_a.py", project))
+        (project / "test_a.py").write_text(RED.format(sleep=0) + "# test changed\n")
+        asyncio.run(verifier.verify("test_a.py", project))
+
+        assert runs(project) == 3
+
+    def test_tree_is_walked_once_until_invalidated(self, tmp_path, monkeypatch):
+        project = make_project(tmp_path, {"test_a.py": RED.format(sleep=0), "test_b.py": GREEN})
+        walks = []
+        monkeypatch.setattr(verification, "tree_hash", lambda root: walks.append(root) or "h")
+        verifier = executor()
+
+        async def main():
+            return await asyncio.gather(*(verifier.verify(name, project) for name in ("test_a.py", "test_b.py")))
+
+        asyncio.run(main())
+        asyncio.run(verifier.verify("test_a.py", project))
+        assert len(walks) == 1
+
+        verifier.invalidate_tree(project)
+        asyncio.run(verifier.verify("test_a.py", project))
+        assert len(walks) == 2
+
+    def test_test_by_products_do_not_change_tree_hash(self, tmp_path):
+        project = make_project(tmp_path)
+        before = tree_hash(project)
+        (project / "__pycache__").mkdir()
+        (project / "__pycache__" / "x.pyc").write_bytes(b"\0")
+        (project / ".coverage").write_text("")
+
+        assert tree_hash(project) == before
+
+    def test_concurrent_processes_are_capped(self, tmp_path):
+        tests = {f"test_{i}.py": RED.format(sleep=0.2) for i in range(5)}
+        project = make_project(tmp_path, tests)
+        verifier = executor(max_workers=2)
+
+        async def main():
+            return await asyncio.gather(*(verifier.verify(name, project) for name in tests))
+
+        results = asyncio.run(main())
+
+        assert all(r.test_failed for r in results)
+        assert verifier.peak_running == 2
+        assert verifier.runs == 5
+
+    def test_identical_concurrent_verifications_share_one_run(self, tmp_path):
+        project = make_project(tmp_path, {"test_a.py": RED.format(sleep=0.2)})
+        verifier = executor()
+
+        async def main():
+            return await asyncio.gather(*(verifier.verify("test_a.py", project) for _ in range(3)))
+
+        results = asyncio.run(main())
+
+        assert runs(project) == 1
+        assert [r.cached for r in results] == [False, True, True]
+
+    def test_timeouts_are_not_memoised(self, tmp_path):
+        project = make_project(tmp_path, {"test_a.py": RED.format(sleep=5)})
+        verifier = executor()
+
+        first = asyncio.run(verifier.verify("test_a.py", project, timeout_ms=100))
+
+        assert first.error == "TIMEOUT"
+        assert verifier.get_statistics()["memoized_results"] == 0
+
+    def test_no_framework(self, tmp_path):
+        result = asyncio.run(executor().verify("test_a.py", tmp_path))
+        assert result.error == "NO_TEST_FRAMEWORK" and not result.test_ran
+
+
+class TestSchedulerVerification:
+    """Test that WaveScheduler verifies through its executor."""
+
+    def test_tdd_red_uses_executor(self, tmp_path):
+        project = make_project(tmp_path, {"tests/test_auth.py": RED.format(sleep=0)})
+        feature_dir = project / "specs"
+
+        config = WaveConfig(tdd_config=TddVerificationConfig(max_workers=1))
+        scheduler = WaveScheduler(None, config, feature_dir=feature_dir)
+        scheduler.verifier.detector = ScriptDetector
+        assert scheduler.verifier.max_workers == 1
+
+        task = AgentTask(name="write-test-auth", prompt="Create tests/test_auth.py")
+        result = AgentResult(
+            name=task.name, output="Created test file: tests/test_auth.py", success=True, duration_ms=1,
+            model_used="m", model_tier="sonnet", tokens_in=0, tokens_out=0, cost=0.0,
+        )
+        first = asyncio.run(scheduler._verify_tdd_red(task, result))
+        again = asyncio.run(scheduler._verify_tdd_red(task, result))
+
+        assert first.test_failed and not first.cached
+        assert again.cached
+        assert runs(project) == 1
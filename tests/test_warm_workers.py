@@ -0,0 +1,121 @@
+"""
+Unit tests for warm pytest workers.
+"""
+
+import asyncio
+import sys
+
+from src.specify_cli.verification import VerificationExecutor
+from src.specify_cli.warm_workers import WarmWorkerPool
+
+
+CHECK = "from calc import VALUE\n\ndef test_value():\n    assert VALUE == 2\n"
+SLOW = "import time\n\ndef test_slow():\n    time.sleep(30)\n"
+
+
+def make_project(tmp_path, value=1):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+    (project / "calc.py").write_text(f"VALUE = {value}\n")
+    (project / "test_calc.py").write_text(CHECK)
+    return project
+
+
+def executor(**kwargs):
+    return VerificationExecutor(memoize=False, warm=True, warm_python=sys.executable, **kwargs)
+
+
+async def verify_all(verifier, project, *test_files, timeout_ms=30000):
+    try:
+        return [await verifier.verify(f, project, timeout_ms=timeout_ms) for f in test_files]
+    finally:
+        await verifier.close()
+
+
+class TestWarmWorkers:
+    """Test warm runs, reuse, reloading and fallbacks."""
+
+    def test_red_and_green_in_one_worker(self, tmp_path):
+        project = make_project(tmp_path)
+        (project / "test_ok.py").write_text("def test_ok():\n    assert True\n")
+        verifier = executor()
+
+        red, green = asyncio.run(verify_all(verifier, project, "test_calc.py", "test_ok.py"))
+
+        assert red.test_ran and red.test_failed and red.exit_code == 1
+        assert "assert 1 == 2" in red.stdout
+        assert green.test_ran and not green.test_failed and green.exit_code == 0
+        stats = verifier.get_statistics()
+        assert stats["warm_runs"] == 2
+        assert stats["warm_workers"]["started"] == 1
+
+    def test_implementation_changes_are_picked_up(self, tmp_path):
+        project = make_project(tmp_path)
+        verifier = executor()
+
+        async def scenario():
+            try:
+                before = await verifier.verify("test_calc.py", project)
+                (project / "calc.py").write_text("VALUE = 2  # fixed\n")
+                after = await verifier.verify("test_calc.py", project)
+                return before, after
+            finally:
+                await verifier.close()
+
+        before, after = asyncio.run(scenario())
+
+        assert before.test_failed
+        assert not after.test_failed and after.exit_code == 0
+        assert verifier.get_statistics()["warm_workers"]["started"] == 1
+
+    def test_timeout_replaces_worker(self, tmp_path):
+        project = make_project(tmp_path, value=2)
+        (project / "test_slow.py").write_text(SLOW)
+        verifier = executor()
+        listed = []
+
+        async def scenario():
+            try:
+                slow = await verifier.verify("test_slow.py", project, timeout_ms=5000)
+                listed.append(len(verifier._warm_pool._workers))
+                ok = await verifier.verify("test_calc.py", project)
+                listed.append(len(verifier._warm_pool._workers))
+                return slow, ok
+            finally:
+                await verifier.close()
+
+        slow, ok = asyncio.run(scenario())
+
+        assert slow.error == "TIMEOUT" and not slow.test_failed
+        assert ok.test_ran and not ok.test_failed
+        assert verifier.get_statistics()["warm_workers"]["started"] == 2
+        # The killed worker is dropped from the pool
+        assert listed == [0, 1]
+
+    def test_missing_interpreter_falls_back_to_cold_command(self, tmp_path):
+        project = make_project(tmp_path)
+        verifier = VerificationExecutor(memoize=False, warm=True, warm_python=str(tmp_path / "nope"))
+
+        result, = asyncio.run(verify_all(verifier, project, "test_calc.py"))
+
+        stats = verifier.get_statistics()
+        assert stats["warm_runs"] == 0
+        assert str(project.resolve()) in stats["warm_workers"]["unavailable"]
+        assert result.test_ran or result.error == "FileNotFoundError"
+
+    def test_pool_closes_workers(self, tmp_path):
+        project = make_project(tmp_path)
+        pool = WarmWorkerPool(python=sys.executable)
+
+        async def scenario():
+            result = await pool.run(["test_calc.py"], project, "test_calc.py", 30000, [1])
+            alive = pool.get_statistics()["alive"]
+            await pool.close()
+            return result, alive
+
+        result, alive = asyncio.run(scenario())
+
+        assert result.test_failed
+        assert alive == 1
+        assert pool.get_statistics()["alive"] == 0
@@ -0,0 +1,206 @@
+"""
+Unit tests for WaveScheduler dataflow (AGGRESSIVE) execution and run metrics.
+"""
+
+import asyncio
+
+import pytest
+
+from src.specify_cli.agent_pool import AgentTask, PoolConfig
+from src.specify_cli.duration_model import DurationModel
+from src.specify_cli.wave_scheduler import ExecutionStrategy, WaveConfig, WaveScheduler
+
+from .fakes import FakeClient, make_pool
+
+
+def make_scheduler(strategy, delays, max_parallel=4, fail_fast=True, **client_kwargs):
+    pool = make_pool(PoolConfig(pool_size=max_parallel), delays=delays, **client_kwargs)
+    config = WaveConfig(strategy=strategy, max_parallel=max_parallel, fail_fast=fail_fast)
+    return WaveScheduler(pool, config)
+
+
+def chain_tasks():
+    # "slow" and "fast" are independent; "next" only needs "fast"
+    return [
+        AgentTask(name="slow", prompt="slow"),
+        AgentTask(name="fast", prompt="fast"),
+        AgentTask(name="next", prompt="next", depends_on=["fast"]),
+    ]
+
+
+class TestDataflowExecution:
+    """Test per-task dispatch in ExecutionStrategy.AGGRESSIVE."""
+
+    def test_dependent_starts_without_waiting_for_wave(self):
+        scheduler = make_scheduler(ExecutionStrategy.AGGRESSIVE, delays=[0.2, 0.01, 0.01])
+        order = []
+        scheduler.on_task_complete(lambda name, result: order.append(name))
+
+        results = asyncio.run(scheduler.execute_all(chain_tasks()))
+
+        assert all(r.success for r in results.values())
+        assert order == ["fast", "next", "slow"]
+        assert scheduler.metrics.strategy == "aggressive"
+        assert scheduler.metrics.max_in_flight == 2
+
+    def test_wave_strategy_waits_for_wave(self):
+        scheduler = make_scheduler(ExecutionStrategy.SEQUENTIAL, delays=[0.2, 0.01, 0.01])
+        order = []
+        scheduler.on_task_complete(lambda name, result: order.append(name))
+
+        asyncio.run(scheduler.execute_all(chain_tasks()))
+
+        assert order.index("next") > order.index("slow")
+
+    def test_respects_max_parallel(self):
+        scheduler = make_scheduler(ExecutionStrategy.AGGRESSIVE, delays=[], max_parallel=2)
+        tasks = [AgentTask(name=f"t{i}", prompt=f"t{i}") for i in range(6)]
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert len(results) == 6
+        assert scheduler.metrics.max_in_flight == 2
+
+    def test_waves_are_reported_complete(self):
+        scheduler = make_scheduler(ExecutionStrategy.AGGRESSIVE, delays=[])
+        finished = []
+        scheduler.on_wave_complete(lambda wave: finished.append(wave.index))
+
+        asyncio.run(scheduler.execute_all(chain_tasks()))
+
+        assert sorted(finished) == [0, 1]
+        assert all(wave.finished for wave in scheduler.waves)
+
+    def test_dependents_of_failed_task_are_skipped(self):
+        scheduler = make_scheduler(
+            ExecutionStrategy.AGGRESSIVE, delays=[0.05, 0.0], fail_fast=False,
+        )
+        scheduler.pool.clients = [FakeClient(delays=[0.05, 0.0], errors=[ValueError("boom")])]
+        tasks = [
+            AgentTask(name="ok", prompt="ok"),
+            AgentTask(name="bad", prompt="bad"),
+            AgentTask(name="child", prompt="child", depends_on=["bad"]),
+        ]
+        scheduler.pool.config.max_retries = 1
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert results["ok"].success
+        assert not results["bad"].success
+        assert "Skipped" in results["child"].error
+        assert len(scheduler.pool.clients[0].messages.calls) == 2
+
+    def test_independent_tasks_run_after_failure(self):
+        scheduler = make_scheduler(
+            ExecutionStrategy.AGGRESSIVE, delays=[], max_parallel=1, fail_fast=False,
+        )
+        scheduler.pool.clients = [FakeClient(errors=[ValueError("boom")])]
+        scheduler.pool.config.max_retries = 1
+        tasks = [
+            AgentTask(name="a", prompt="a"),
+            AgentTask(name="b", prompt="b"),
+            AgentTask(name="c", prompt="c"),
+        ]
+
+        results = asyncio.run(scheduler.execute_all(tasks))
+
+        assert set(results) == {"a", "b", "c"}
+        assert not results["a"].success
+        assert results["b"].success and results["c"].success
+
+    def test_fail_fast_raises(self):
+        scheduler = make_scheduler(ExecutionStrategy.AGGRESSIVE, delays=[])
+        scheduler.pool.clients = [FakeClient(errors=[ValueError("boom")])]
+        scheduler.pool.config.max_retries = 1
+        tasks = [
+            AgentTask(name="bad", prompt="bad"),
+            AgentTask(name="child", prompt="child", depends_on=["bad"]),
+        ]
+
+        with pytest.raises(RuntimeError, match="bad"):
+            asyncio.run(scheduler.execute_all(tasks))
+        assert "child" not in scheduler.completed
+
+
+class TestExecutionMetrics:
+    """Test utilisation and makespan reporting."""
+
+    def test_dataflow_beats_waves_on_makespan(self):
+        makespans = {}
+        for strategy in (ExecutionStrategy.SEQUENTIAL, ExecutionStrategy.AGGRESSIVE):
+            # "next" is as slow as "slow", so wave barriers double the makespan
+            scheduler = make_scheduler(strategy, delays=[0.1, 0.01, 0.1])
+            asyncio.run(scheduler.execute_all(chain_tasks()))
+            makespans[strategy] = scheduler.metrics
+
+        waves = makespans[ExecutionStrategy.SEQUENTIAL]
+        dataflow = makespans[ExecutionStrategy.AGGRESSIVE]
+        assert dataflow.makespan_ms < waves.makespan_ms
+        assert dataflow.utilisation > waves.utilisation
+        assert dataflow.idle_slot_seconds < waves.idle_slot_seconds
+
+    def test_report_includes_metrics(self):
+        scheduler = make_scheduler(ExecutionStrategy.AGGRESSIVE, delays=[])
+        asyncio.run(scheduler.execute_all(chain_tasks()))
+
+        report = scheduler.generate_report()
+        assert report.metrics is scheduler.metrics
+        assert "Utilisation" in report.summary()
+
+
+class TestCriticalPathPriority:
+    """Test bottom-level ordering and makespan prediction."""
+
+    def tasks(self):
+        # chain-1 -> chain-2 -> chain-3 is the long pole; leaves are independent
+        tasks = [AgentTask(name=f"leaf-{i}", prompt="", max_tokens=1000) for i in range(3)]
+        tasks.append(AgentTask(name="chain-1", prompt="", max_tokens=1000))
+        tasks.append(AgentTask(name="chain-2", prompt="", max_tokens=1000, depends_on=["chain-1"]))
+        tasks.append(AgentTask(name="chain-3", prompt="", max_tokens=1000, depends_on=["chain-2"]))
+        return tasks
+
+    def test_static_priority_schedules_chain_late(self):
+        scheduler = WaveScheduler(None, WaveConfig(max_parallel=2))
+        waves = scheduler.build_waves(self.tasks())
+        assert "chain-1" not in [t.name for t in waves[0].tasks]
+
+    def test_chain_head_dispatched_first(self):
+        scheduler = WaveScheduler(None, WaveConfig(max_parallel=2, critical_path_priority=True))
+        waves = scheduler.build_waves(self.tasks())
+
+        assert waves[0].tasks[0].name == "chain-1"
+        assert scheduler.critical_path == ["chain-1", "chain-2", "chain-3"]
+        assert scheduler.bottom_levels["chain-1"] == pytest.approx(3 * scheduler.bottom_levels["chain-3"])
+
+    def test_priority_still_dominates(self):
+        tasks = self.tasks()
+        tasks[0].priority = 1
+        scheduler = WaveScheduler(None, WaveConfig(max_parallel=2, critical_path_priority=True))
+        waves = scheduler.build_waves(tasks)
+        assert [t.name for t in waves[0].tasks] == ["leaf-0", "chain-1"]
+
+    def test_predicted_makespan(self):
+        unit = DurationModel.static_estimate_ms(AgentTask(name="x", prompt="", max_tokens=1000))
+        config = WaveConfig(
+            max_parallel=2, critical_path_priority=True, strategy=ExecutionStrategy.AGGRESSIVE,
+        )
+        scheduler = WaveScheduler(None, config)
+        scheduler.build_waves(self.tasks())
+
+        # Chain runs back to back on one slot, leaves share the other
+        assert scheduler.predict_makespan_ms() == pytest.approx(3 * unit)
+
+        scheduler.config.critical_path_priority = False
+        scheduler.build_waves(self.tasks())
+        assert scheduler.predict_makespan_ms() > 3 * unit
+
+    def test_plan_lists_critical_path(self):
+        scheduler = WaveScheduler(None, WaveConfig(critical_path_priority=True))
+        plan = scheduler.get_execution_plan(self.tasks())
+        assert "Critical path: chain-1 -> chain-2 -> chain-3" in plan
+        assert "Predicted makespan" in plan
+
+    def test_execution_records_durations(self):
+        scheduler = make_scheduler(ExecutionStrategy.AGGRESSIVE, delays=[])
+        asyncio.run(scheduler.execute_all(chain_tasks()))
+        assert scheduler.durations.history["DEFAULT/sonnet"]["samples"] == 3